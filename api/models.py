@@ -1,10 +1,85 @@
 from pydantic import BaseModel
-from typing import Any
+from typing import Any, Literal, Optional
 
 
 class PipelineRequest(BaseModel):
     transcript: str  # raw text
+    extraction_mode: Optional[Literal["chained", "fused"]] = None  # defaults to Config.EXTRACTION_MODE
 
 
 class PipelineResponse(BaseModel):
     clustered_items: dict[str, Any]
+    trace_id: Optional[str] = None  # id of the run's trace, when tracing is enabled (None otherwise)
+
+
+class PipelineBatchRequest(BaseModel):
+    transcripts: dict[str, str]  # raw text by caller-chosen transcript id
+    extraction_mode: Optional[Literal["chained", "fused"]] = None
+
+
+class PipelineBatchItem(BaseModel):
+    status: str  # succeeded or failed
+    result: Optional[dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+class PipelineBatchResponse(BaseModel):
+    results: dict[str, PipelineBatchItem]
+    trace_id: Optional[str] = None
+
+
+class JobSubmitResponse(BaseModel):
+    job_id: str
+    status: str
+
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    status: str  # queued, running, succeeded or failed
+    progress: dict[str, dict[str, Any]]  # per-stage status and counts
+    result: Optional[dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    trace_id: Optional[str] = None
+
+
+class SessionCreateRequest(BaseModel):
+    transcript_format: Optional[str] = None  # detected from the first utterances when omitted
+    extraction_mode: Optional[Literal["chained", "fused"]] = None
+
+
+class SessionAppendRequest(BaseModel):
+    text: str  # the new utterances, in the session's transcript format
+
+
+class SessionSegment(BaseModel):
+    segment_id: int
+    topic_summary: str
+    first_chunk_id: int
+    last_chunk_id: int
+    final: bool  # final segments are never re-clustered or re-analyzed
+    action_analysis: Optional[dict[str, Any]] = None
+    action: Optional[dict[str, Any]] = None
+
+
+class SessionUpdateResponse(BaseModel):
+    session_id: str
+    new_chunks: int
+    reclustered_chunks: int
+    reanalyzed_segments: int
+    replaced_from_segment_id: int  # `segments` replace the previous segments from this id on
+    segments: list[SessionSegment]
+
+
+class SessionStatusResponse(BaseModel):
+    session_id: str
+    status: str  # open or closed
+    transcript_format: Optional[str] = None
+    chunks: int
+    updates: int
+    segments: list[SessionSegment]
+    summary: dict[str, Any]  # same shape as the pipeline's clustered_items
+    created_at: float
+    updated_at: float
@@ -0,0 +1,26 @@
+import os, sys
+from fastapi import APIRouter, HTTPException, Request
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from api.models import PipelineRequest, JobSubmitResponse, JobStatusResponse
+from src.services.job_service import JobQueueFullError
+
+router = APIRouter()
+
+@router.post("/jobs", response_model=JobSubmitResponse, status_code=202)
+async def submit_job(request: PipelineRequest, http_request: Request):
+    if not getattr(http_request.app.state, "ready", False):
+        raise HTTPException(status_code=503, detail="Pipeline is warming up, retry shortly.")
+    try:
+        job = http_request.app.state.job_manager.submit(request.transcript, request.extraction_mode)
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return {"job_id": job.id, "status": job.status}
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job(job_id: str, http_request: Request):
+    job = http_request.app.state.job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found or expired.")
+    return job.to_dict()
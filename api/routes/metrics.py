@@ -0,0 +1,13 @@
+import os, sys
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.utils.metrics import get_metrics_registry
+
+router = APIRouter()
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus scrape endpoint: LLM call, stage timing, cache and fallback metrics."""
+    return PlainTextResponse(get_metrics_registry().render(), media_type="text/plain; version=0.0.4")
@@ -1,16 +1,80 @@
 import os, sys
-from fastapi import APIRouter, HTTPException
+import json
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
-from api.models import PipelineRequest, PipelineResponse
-from src.services.pipeline_service import run_pipeline
+from api.models import PipelineRequest, PipelineResponse, PipelineBatchRequest, PipelineBatchResponse
+from src.services.pipeline_service import arun_pipeline, arun_pipeline_batch, astream_pipeline
+from src.utils.tracing import exported_trace_id, span
 
 router = APIRouter()
 
 @router.post("/pipeline", response_model=PipelineResponse)
-def process_pipeline(request: PipelineRequest):
+async def process_pipeline(request: PipelineRequest, http_request: Request):
+    if not getattr(http_request.app.state, "ready", False):
+        raise HTTPException(status_code=503, detail="Pipeline is warming up, retry shortly.")
     try:
-        results = run_pipeline(request.transcript)
-        return {"clustered_items": results}
+        with span("POST /pipeline") as request_span:
+            results = await arun_pipeline(
+                request.transcript,
+                extraction_mode=request.extraction_mode,
+                resources=http_request.app.state.pipeline_resources
+            )
+        return {"clustered_items": results, "trace_id": exported_trace_id(request_span)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/pipeline/batch", response_model=PipelineBatchResponse)
+async def process_pipeline_batch(request: PipelineBatchRequest, http_request: Request):
+    if not getattr(http_request.app.state, "ready", False):
+        raise HTTPException(status_code=503, detail="Pipeline is warming up, retry shortly.")
+    try:
+        with span("POST /pipeline/batch") as request_span:
+            results = await arun_pipeline_batch(
+                request.transcripts,
+                extraction_mode=request.extraction_mode,
+                resources=http_request.app.state.pipeline_resources
+            )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"results": results, "trace_id": exported_trace_id(request_span)}
+
+
+@router.post("/pipeline/stream")
+async def stream_pipeline(request: PipelineRequest, http_request: Request):
+    """
+    Streams pipeline events as they happen: NDJSON by default, Server-Sent Events
+    when the client sends `Accept: text/event-stream`. The last event is the summary,
+    or an error event if the run failed midway.
+    """
+    if not getattr(http_request.app.state, "ready", False):
+        raise HTTPException(status_code=503, detail="Pipeline is warming up, retry shortly.")
+    use_sse = "text/event-stream" in http_request.headers.get("accept", "")
+
+    def encode(event: dict) -> str:
+        if use_sse:
+            return f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+        return json.dumps(event) + "\n"
+
+    async def event_stream():
+        events = astream_pipeline(
+            request.transcript,
+            extraction_mode=request.extraction_mode,
+            resources=http_request.app.state.pipeline_resources
+        )
+        try:
+            async for event in events:
+                # Stop paying for LLM calls nobody will read
+                if await http_request.is_disconnected():
+                    break
+                yield encode(event)
+        except Exception as e:
+            yield encode({"event": "error", "detail": str(e)})
+        finally:
+            # Cancels the filtering and extraction calls still in flight
+            await events.aclose()
+
+    media_type = "text/event-stream" if use_sse else "application/x-ndjson"
+    return StreamingResponse(event_stream(), media_type=media_type)
@@ -0,0 +1,53 @@
+import os, sys
+from fastapi import APIRouter, HTTPException, Request
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from api.models import SessionCreateRequest, SessionAppendRequest, SessionUpdateResponse, SessionStatusResponse
+from src.services.session_service import LiveSession, SessionClosedError, SessionLimitError
+
+router = APIRouter()
+
+
+def _get_session(session_id: str, http_request: Request) -> LiveSession:
+    session = http_request.app.state.session_manager.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Session {session_id} not found or expired.")
+    return session
+
+
+@router.post("/sessions", response_model=SessionStatusResponse, status_code=201)
+async def create_session(request: SessionCreateRequest, http_request: Request):
+    if not getattr(http_request.app.state, "ready", False):
+        raise HTTPException(status_code=503, detail="Pipeline is warming up, retry shortly.")
+    try:
+        session = http_request.app.state.session_manager.create(request.transcript_format, request.extraction_mode)
+    except SessionLimitError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return session.to_dict()
+
+
+@router.post("/sessions/{session_id}/utterances", response_model=SessionUpdateResponse)
+async def append_utterances(session_id: str, request: SessionAppendRequest, http_request: Request):
+    session = _get_session(session_id, http_request)
+    try:
+        return await session.append(request.text)
+    except SessionClosedError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/sessions/{session_id}", response_model=SessionStatusResponse)
+async def get_session(session_id: str, http_request: Request):
+    return _get_session(session_id, http_request).to_dict()
+
+
+@router.post("/sessions/{session_id}/close", response_model=SessionStatusResponse)
+async def close_session(session_id: str, http_request: Request):
+    session = _get_session(session_id, http_request)
+    await session.close()
+    return session.to_dict()
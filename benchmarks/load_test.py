@@ -0,0 +1,271 @@
+import json
+import math
+import platform
+import random
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any
+import os, sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
+
+from api.models import PipelineRequest, PipelineResponse
+from benchmarks.pipeline_benchmark import git_commit
+from benchmarks.transcript_generator import generate_transcript
+from src.services.pipeline_service import run_pipeline
+from config import get_config
+import paths
+
+
+LOAD_TEST_MODES = ("async", "threadpool", "jobs")
+# Utterance count -> share of the traffic: mostly short meetings, with a tail of long ones
+DEFAULT_SIZE_MIX = {20: 0.3, 60: 0.4, 200: 0.25, 1000: 0.05}
+THREADPOOL_ROUTE = "/loadtest/pipeline/threadpool"
+
+
+def _use_fake_model(model_config: dict[str, Any]) -> None:
+    """Points the app at the fake model, so the load test measures serving rather than a provider."""
+    config_class = type(get_config())
+    config_class.MODEL_TYPE = "fake"
+    config_class.LLM_CACHE_ENABLED = False
+    config_class.DEBUG_MODE = False
+    config_class.FAKE_LATENCY_MS = model_config.get("latency_ms", config_class.FAKE_LATENCY_MS)
+    config_class.FAKE_LATENCY_JITTER_MS = model_config.get("latency_jitter_ms", config_class.FAKE_LATENCY_JITTER_MS)
+    config_class.FAKE_LATENCY_DISTRIBUTION = model_config.get("latency_distribution", config_class.FAKE_LATENCY_DISTRIBUTION)
+    config_class.FAKE_ERROR_RATE = model_config.get("error_rate", config_class.FAKE_ERROR_RATE)
+
+
+def _add_threadpool_route(app: FastAPI) -> None:
+    """
+    Serves the synchronous run_pipeline from a plain `def` route, which FastAPI runs in its worker
+    threadpool: one blocked thread per in-flight request, as the app did before the async route.
+    """
+    if any(getattr(route, "path", None) == THREADPOOL_ROUTE for route in app.routes):
+        return
+
+    def process_pipeline_threadpool(request: PipelineRequest, http_request: Request):
+        if not getattr(http_request.app.state, "ready", False):
+            raise HTTPException(status_code=503, detail="Pipeline is warming up, retry shortly.")
+        try:
+            results = run_pipeline(
+                request.transcript,
+                extraction_mode=request.extraction_mode,
+                resources=http_request.app.state.pipeline_resources
+            )
+            return {"clustered_items": results}
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    app.add_api_route(THREADPOOL_ROUTE, process_pipeline_threadpool, methods=["POST"], response_model=PipelineResponse)
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _request(method: str, url: str, payload: dict = None, timeout: float = 300) -> tuple[int, dict]:
+    """Sends a JSON request and returns the status code and decoded body, including for error statuses."""
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    request = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"}, method=method)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, json.loads(response.read() or b"{}")
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or b"{}")
+
+
+class InProcessServer:
+    """Runs the FastAPI app with uvicorn on a background thread of this process, until stopped."""
+
+    def __init__(self, app: FastAPI, startup_timeout: float = 60):
+        self.port = _free_port()
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self.startup_timeout = startup_timeout
+        self._server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning"))
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    def __enter__(self) -> "InProcessServer":
+        self._thread.start()
+        deadline = time.monotonic() + self.startup_timeout
+        # Wait for the lifespan warm-up, traffic is only sent once /ready says so
+        while time.monotonic() < deadline:
+            try:
+                if _request("GET", f"{self.base_url}/ready", timeout=5)[0] == 200:
+                    return self
+            except OSError:
+                pass
+            time.sleep(0.1)
+        self._server.should_exit = True
+        raise RuntimeError(f"Server did not become ready within {self.startup_timeout}s.")
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.should_exit = True
+        self._thread.join()
+
+
+def _run_request(base_url: str, mode: str, transcript: str, timeout: float, poll_interval: float) -> None:
+    """Processes one transcript through the given serving mode, raising if it did not succeed."""
+    if mode == "async":
+        status, body = _request("POST", f"{base_url}/pipeline", {"transcript": transcript}, timeout)
+    elif mode == "threadpool":
+        status, body = _request("POST", f"{base_url}{THREADPOOL_ROUTE}", {"transcript": transcript}, timeout)
+    else:
+        status, body = _request("POST", f"{base_url}/jobs", {"transcript": transcript}, timeout)
+        if status != 202:
+            raise RuntimeError(f"HTTP {status}: {body.get('detail')}")
+        deadline = time.monotonic() + timeout
+        while True:
+            time.sleep(poll_interval)
+            status, body = _request("GET", f"{base_url}/jobs/{body['job_id']}", timeout=timeout)
+            if status != 200 or body["status"] in ("succeeded", "failed"):
+                break
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Job {body['job_id']} did not finish within {timeout}s.")
+        if status == 200 and body["status"] == "failed":
+            raise RuntimeError(f"Job failed: {body.get('error')}")
+    if status != 200:
+        raise RuntimeError(f"HTTP {status}: {body.get('detail')}")
+
+
+def _percentile(sorted_values: list[float], percentile: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(percentile / 100 * len(sorted_values)))
+    return round(sorted_values[rank - 1], 4)
+
+
+def build_workload(total_requests: int, size_mix: dict[int, float] = None, seed: int = 0) -> list[tuple[int, str]]:
+    """
+    Draws the (utterance count, transcript) of every request from the size mix.
+    Each request gets a distinct transcript, so a response cache would not flatter the results.
+    """
+    size_mix = size_mix or DEFAULT_SIZE_MIX
+    rng = random.Random(seed)
+    sizes = rng.choices(list(size_mix), weights=list(size_mix.values()), k=total_requests)
+    return [(size, generate_transcript(size, seed=seed * 1_000_000 + index)) for index, size in enumerate(sizes)]
+
+
+def run_load_test(base_url: str, mode: str, workload: list[tuple[int, str]], concurrency: int,
+                  timeout: float = 300, poll_interval: float = 0.05) -> dict[str, Any]:
+    """
+    Sends the workload with `concurrency` clients, each issuing its next request as soon as the previous
+    one completed (closed loop), and measures end-to-end latency: until the response for the synchronous
+    modes, until the job finished for the job queue.
+
+    Returns:
+        Throughput, latency percentiles (of successful requests), error rate and latency per transcript size
+    """
+    if mode not in LOAD_TEST_MODES:
+        raise ValueError(f"Unknown load test mode: {mode}. Available: {list(LOAD_TEST_MODES)}")
+
+    def send(request: tuple[int, str]) -> dict[str, Any]:
+        size, transcript = request
+        start = time.perf_counter()
+        try:
+            _run_request(base_url, mode, transcript, timeout, poll_interval)
+            return {"size": size, "latency_s": time.perf_counter() - start, "error": None}
+        except Exception as e:
+            return {"size": size, "latency_s": time.perf_counter() - start, "error": str(e)}
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(send, workload))
+    duration = time.perf_counter() - start
+
+    latencies = sorted(result["latency_s"] for result in results if result["error"] is None)
+    errors = [result["error"] for result in results if result["error"] is not None]
+    by_size = {}
+    for size in sorted({result["size"] for result in results}):
+        size_latencies = sorted(result["latency_s"] for result in results if result["size"] == size and result["error"] is None)
+        by_size[str(size)] = {
+            "requests": sum(1 for result in results if result["size"] == size),
+            "p50_s": _percentile(size_latencies, 50),
+            "p95_s": _percentile(size_latencies, 95)
+        }
+
+    return {
+        "mode": mode,
+        "concurrency": concurrency,
+        "requests": len(results),
+        "succeeded": len(latencies),
+        "errors": len(errors),
+        "error_rate": round(len(errors) / len(results), 4) if results else 0.0,
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(len(latencies) / duration, 3) if duration else None,
+        "latency_s": {
+            "mean": round(sum(latencies) / len(latencies), 4) if latencies else None,
+            "p50": _percentile(latencies, 50),
+            "p95": _percentile(latencies, 95),
+            "p99": _percentile(latencies, 99),
+            "max": round(latencies[-1], 4) if latencies else None
+        },
+        "by_size": by_size,
+        # A few distinct messages are enough to see what went wrong
+        "sample_errors": sorted(set(errors))[:5]
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load-test the FastAPI app in-process against the fake model.")
+    parser.add_argument("--modes", default=",".join(LOAD_TEST_MODES), help="Comma-separated serving modes to compare")
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated numbers of concurrent clients")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per mode and concurrency level")
+    parser.add_argument("--latency-ms", type=float, default=200, help="Mean simulated latency per LLM call")
+    parser.add_argument("--jitter-ms", type=float, default=50)
+    parser.add_argument("--latency-distribution", default="lognormal", choices=["constant", "uniform", "normal", "lognormal"])
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=300, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Results file, defaults to benchmarks/results/load_test_<timestamp>.json")
+    args = parser.parse_args()
+
+    model_config = {
+        "latency_ms": args.latency_ms,
+        "latency_jitter_ms": args.jitter_ms,
+        "latency_distribution": args.latency_distribution,
+        "error_rate": args.error_rate
+    }
+    _use_fake_model(model_config)
+    from fastapi_app import app
+    _add_threadpool_route(app)
+
+    workload = build_workload(args.requests, seed=args.seed)
+    runs = []
+    # One server per mode, so a mode never inherits another's queued jobs or busy threads
+    for mode in args.modes.split(","):
+        with InProcessServer(app) as server:
+            for concurrency in (int(level) for level in args.concurrency.split(",")):
+                print(f"[LoadTest] {mode}, {concurrency} concurrent clients, {len(workload)} requests...")
+                run = run_load_test(server.base_url, mode, workload, concurrency, args.timeout)
+                print(f"[LoadTest] {mode} x{concurrency}: {run['throughput_rps']} req/s, "
+                      f"p50 {run['latency_s']['p50']}, p95 {run['latency_s']['p95']}, p99 {run['latency_s']['p99']}, "
+                      f"error rate {run['error_rate']:.1%}")
+                runs.append(run)
+
+    results = {
+        "benchmark": "load_test",
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "seed": args.seed,
+        "model_config": model_config,
+        "size_mix": DEFAULT_SIZE_MIX,
+        "runs": runs
+    }
+    output = args.output or paths.BENCHMARK_RESULTS_DIR / f"load_test_{datetime.now():%Y%m%d_%H%M%S}.json"
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"[LoadTest] Results saved to {output}")
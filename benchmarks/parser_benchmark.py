@@ -0,0 +1,100 @@
+import json
+import platform
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any
+import os, sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.pipeline_benchmark import git_commit
+from benchmarks.transcript_generator import TRANSCRIPT_FORMATS, generate_transcript
+from src.services.chunking_service import ChunkingService
+from config import get_config
+import paths
+
+
+DEFAULT_SIZE_MB = 50
+
+
+def generate_sized_transcript(transcript_format: str, size_mb: float, seed: int = 0) -> str:
+    """Generates a synthetic transcript of about size_mb megabytes in the given format."""
+    sample = generate_transcript(1000, seed=seed, transcript_format=transcript_format)
+    bytes_per_utterance = len(sample.encode("utf-8")) / 1000
+    return generate_transcript(max(1, int(size_mb * 2 ** 20 / bytes_per_utterance)), seed=seed, transcript_format=transcript_format)
+
+
+def benchmark_parser(transcript_format: str, size_mb: float = DEFAULT_SIZE_MB, repeats: int = 3, seed: int = 0) -> dict[str, Any]:
+    """
+    Measures how fast ChunkingService parses a transcript of the given format into a ChunkStore,
+    from a string in memory and from a memory-mapped file, detection included (best of `repeats`).
+
+    Returns:
+        Size, chunks, and the best time and throughput (MB/s and chunks/s) of each source
+    """
+    config = get_config()
+    chunker = ChunkingService()
+    transcript = generate_sized_transcript(transcript_format, size_mb, seed)
+    size_bytes = len(transcript.encode("utf-8"))
+    options = {"start_marker": config.CHUNK_START_MARKER, "end_marker": config.CHUNK_END_MARKER}
+
+    with tempfile.NamedTemporaryFile("w", suffix=f".{transcript_format}", encoding="utf-8", delete=False) as f:
+        f.write(transcript)
+    try:
+        def parse_string():
+            return chunker.transcript_to_store(transcript, **options)
+
+        def parse_file():
+            with open(f.name, 'rb') as file:
+                return chunker.transcript_to_store(file, **options)
+
+        result = {"format": transcript_format, "size_mb": round(size_bytes / 2 ** 20, 2)}
+        for source, parse in (("string", parse_string), ("file", parse_file)):
+            best = None
+            for _ in range(repeats):
+                start = time.perf_counter()
+                store = parse()
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            result["chunks"] = len(store)
+            result[source] = {
+                "seconds": round(best, 4),
+                "mb_per_s": round(size_bytes / 2 ** 20 / best, 2),
+                "chunks_per_s": round(len(store) / best)
+            }
+        return result
+    finally:
+        os.unlink(f.name)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure the throughput of each transcript format parser on large synthetic files.")
+    parser.add_argument("--formats", default=",".join(TRANSCRIPT_FORMATS), help="Comma-separated transcript formats")
+    parser.add_argument("--size-mb", type=float, default=DEFAULT_SIZE_MB, help="Approximate size of each synthetic file")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per format and source, the best one is kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Results file, defaults to benchmarks/results/parsers_<timestamp>.json")
+    args = parser.parse_args()
+
+    runs = []
+    for transcript_format in args.formats.split(","):
+        run = benchmark_parser(transcript_format, args.size_mb, args.repeats, args.seed)
+        print(f"[ParserBenchmark] {transcript_format}: {run['size_mb']} MB, {run['chunks']} chunks, "
+              f"string {run['string']['mb_per_s']} MB/s, file {run['file']['mb_per_s']} MB/s")
+        runs.append(run)
+
+    results = {
+        "benchmark": "parsers",
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "seed": args.seed,
+        "runs": runs
+    }
+    output = args.output or paths.BENCHMARK_RESULTS_DIR / f"parsers_{datetime.now():%Y%m%d_%H%M%S}.json"
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"[ParserBenchmark] Results saved to {output}")
@@ -0,0 +1,241 @@
+import json
+import platform
+import subprocess
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any
+import os, sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.transcript_generator import generate_transcript
+from src.models.base_model import BaseAIModel
+from src.models.fake_model import FakeAIModel
+from src.services.pipeline_service import PipelineResources, build_prefilter, run_pipeline
+from src.utils.prompt_registry import get_prompt_registry
+from src.utils.token_utils import estimate_tokens
+from src.utils.tracing import Span, Tracer, get_tracer, set_tracer, span
+from config import get_config
+import paths
+
+
+DEFAULT_SIZES = (10, 100, 1000, 5000, 20000)
+STAGES = ("chunking", "compression", "clustering", "filtering", "extraction")
+
+
+class SpanCollector:
+    """Span exporter keeping every finished span in memory."""
+
+    def __init__(self):
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+
+class StageProfilingTracer(Tracer):
+    """
+    Tracer that also records, on each pipeline stage span, the peak memory allocated during the stage
+    (above what was allocated when it started). Stages of run_pipeline run one after the other,
+    so resetting the tracemalloc peak when a stage starts is enough to attribute it.
+    """
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        profile = name.startswith("stage.") and tracemalloc.is_tracing()
+        if profile:
+            tracemalloc.reset_peak()
+            start_bytes = tracemalloc.get_traced_memory()[0]
+        with super().span(name, **attributes) as current:
+            try:
+                yield current
+            finally:
+                if profile:
+                    current.set_attribute("peak_memory_bytes", tracemalloc.get_traced_memory()[1] - start_bytes)
+
+
+class TokenCountingModel(BaseAIModel):
+    """Wraps a model and traces each call with the estimated tokens of its prompt and response."""
+
+    def __init__(self, model: BaseAIModel):
+        super().__init__()
+        self.model = model
+
+    def process(self, input_text: str) -> str:
+        with span("benchmark.llm_call", prompt_tokens=estimate_tokens(input_text)) as call_span:
+            response = self.model.process(input_text)
+            call_span.set_attribute("response_tokens", estimate_tokens(response))
+            return response
+
+    async def aprocess(self, input_text: str) -> str:
+        with span("benchmark.llm_call", prompt_tokens=estimate_tokens(input_text)) as call_span:
+            response = await self.model.aprocess(input_text)
+            call_span.set_attribute("response_tokens", estimate_tokens(response))
+            return response
+
+    def get_info(self):
+        return self.model.get_info()
+
+    def invalidate(self, input_text: str) -> None:
+        self.model.invalidate(input_text)
+
+
+def _summarize_spans(spans: list[Span]) -> dict[str, dict[str, Any]]:
+    """
+    Aggregates the spans of one run per stage: wall time, peak memory, and the LLM calls
+    and estimated tokens of every call made under the stage span.
+    """
+    by_id = {recorded_span.span_id: recorded_span for recorded_span in spans}
+    stages: dict[str, dict[str, Any]] = {}
+
+    for recorded_span in spans:
+        if recorded_span.name.startswith("stage."):
+            stages[recorded_span.name[len("stage."):]] = {
+                "wall_time_s": round(recorded_span.duration_ms / 1000, 4),
+                "peak_memory_mb": round(recorded_span.attributes["peak_memory_bytes"] / 2 ** 20, 3) if "peak_memory_bytes" in recorded_span.attributes else None,
+                "llm_calls": 0,
+                "prompt_tokens": 0,
+                "response_tokens": 0
+            }
+
+    for recorded_span in spans:
+        if recorded_span.name != "benchmark.llm_call":
+            continue
+        ancestor = by_id.get(recorded_span.parent_id)
+        while ancestor is not None and not ancestor.name.startswith("stage."):
+            ancestor = by_id.get(ancestor.parent_id)
+        if ancestor is None:
+            continue
+        stage = stages[ancestor.name[len("stage."):]]
+        stage["llm_calls"] += 1
+        stage["prompt_tokens"] += recorded_span.attributes.get("prompt_tokens", 0)
+        stage["response_tokens"] += recorded_span.attributes.get("response_tokens", 0)
+
+    return {name: stages[name] for name in STAGES if name in stages}
+
+
+def run_benchmark(num_utterances: int, model_config: dict[str, Any] = None, seed: int = 0,
+                  profile_memory: bool = True) -> dict[str, Any]:
+    """
+    Runs run_pipeline once on a synthetic transcript of num_utterances, against the fake model.
+
+    Returns:
+        Transcript size, total wall time, LLM calls, tokens and peak memory, and the same figures per stage
+    """
+    config = get_config()
+    transcript = generate_transcript(num_utterances, seed=seed)
+    model = FakeAIModel({"seed": seed, **(model_config or {})})
+    resources = PipelineResources(TokenCountingModel(model), get_prompt_registry(), config.PROMPT_ENCODING, build_prefilter(config))
+
+    collector = SpanCollector()
+    previous_tracer = get_tracer()
+    set_tracer(StageProfilingTracer(collector))
+    if profile_memory:
+        tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        summary = run_pipeline(transcript, debug=False, resources=resources)
+        wall_time = time.perf_counter() - start
+    finally:
+        if profile_memory:
+            tracemalloc.stop()
+        set_tracer(previous_tracer)
+
+    stages = _summarize_spans(collector.spans)
+    peak_memory = [stage["peak_memory_mb"] for stage in stages.values() if stage["peak_memory_mb"] is not None]
+    return {
+        "utterances": num_utterances,
+        "transcript_bytes": len(transcript.encode("utf-8")),
+        "wall_time_s": round(wall_time, 4),
+        "llm_calls": sum(stage["llm_calls"] for stage in stages.values()),
+        "prompt_tokens": sum(stage["prompt_tokens"] for stage in stages.values()),
+        "response_tokens": sum(stage["response_tokens"] for stage in stages.values()),
+        "peak_memory_mb": max(peak_memory) if peak_memory else None,
+        "actions": summary.get("total_actions"),
+        "model_stats": model.get_stats(),
+        "stages": stages
+    }
+
+
+def git_commit() -> str:
+    """Short hash of the checked-out commit, to tell which code a result file was measured on."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=paths.BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def run_suite(sizes: tuple[int, ...] = DEFAULT_SIZES, model_config: dict[str, Any] = None, seed: int = 0,
+              profile_memory: bool = True) -> dict[str, Any]:
+    """
+    Benchmarks every transcript size and returns the runs with what is needed to compare them
+    across commits: commit, pipeline settings and fake model settings.
+    """
+    config = get_config()
+    runs = []
+    for num_utterances in sizes:
+        print(f"[Benchmark] {num_utterances} utterances...")
+        run = run_benchmark(num_utterances, model_config, seed, profile_memory)
+        print(f"[Benchmark] {num_utterances} utterances: {run['wall_time_s']:.2f}s, "
+              f"{run['llm_calls']} LLM calls, {run['prompt_tokens']} prompt tokens, peak {run['peak_memory_mb']} MB")
+        runs.append(run)
+
+    return {
+        "benchmark": "pipeline",
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "seed": seed,
+        "model_config": model_config or {},
+        "pipeline_config": {
+            "prompt_encoding": config.PROMPT_ENCODING,
+            "compression_enabled": config.COMPRESSION_ENABLED,
+            "clustering_mode": config.CLUSTERING_MODE,
+            "filtering_mode": config.FILTERING_MODE,
+            "prefilter_enabled": config.PREFILTER_ENABLED,
+            "extraction_mode": config.EXTRACTION_MODE,
+            "clustering_max_workers": config.CLUSTERING_MAX_WORKERS,
+            "filtering_max_workers": config.FILTERING_MAX_WORKERS,
+            "extraction_max_workers": config.EXTRACTION_MAX_WORKERS
+        },
+        "runs": runs
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark run_pipeline on synthetic transcripts against the fake model.")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="Comma-separated utterance counts")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Mean simulated latency per LLM call")
+    parser.add_argument("--jitter-ms", type=float, default=20)
+    parser.add_argument("--latency-distribution", default="uniform", choices=["constant", "uniform", "normal", "lognormal"])
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc, which slows large runs down")
+    parser.add_argument("--output", help="Results file, defaults to benchmarks/results/pipeline_<timestamp>.json")
+    args = parser.parse_args()
+
+    model_config = {
+        "latency_ms": args.latency_ms,
+        "latency_jitter_ms": args.jitter_ms,
+        "latency_distribution": args.latency_distribution,
+        "error_rate": args.error_rate,
+        # Keep simulated retries short, the benchmark measures the pipeline rather than the backoff
+        "base_delay": 0.05,
+        "max_delay": 0.5
+    }
+    results = run_suite(tuple(int(size) for size in args.sizes.split(",")), model_config, args.seed, not args.no_memory)
+
+    output = args.output or paths.BENCHMARK_RESULTS_DIR / f"pipeline_{datetime.now():%Y%m%d_%H%M%S}.json"
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"[Benchmark] Results saved to {output}")
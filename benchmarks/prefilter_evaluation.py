@@ -0,0 +1,156 @@
+import json
+import platform
+from datetime import datetime, timezone
+from typing import Any, Iterable, Optional
+import os, sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.pipeline_benchmark import git_commit
+from benchmarks.transcript_generator import generate_transcript
+from src.models.base_model import BaseAIModel
+from src.models.fake_model import FakeAIModel
+from src.services.chunking_service import ChunkingService
+from src.services.clustering_service import ClusteringService
+from src.services.filtering_service import FilteringService
+from src.services.prefilter_service import PrefilterService
+from src.utils.chunk_store import to_builtin
+from config import get_config
+import paths
+
+
+# (reject_threshold, accept_threshold) pairs compared by default, from cautious to aggressive
+DEFAULT_THRESHOLDS = ((0.05, 0.99), (0.1, 0.95), (0.15, 0.9), (0.25, 0.8))
+
+
+def load_labeled_segments(path: str) -> list[tuple[dict[str, Any], str]]:
+    """
+    Reads a labeled set: one JSON object per line with a ClusteringService segment
+    under "segment" and its reference verdict ("yes" or "no") under "label".
+    """
+    labeled = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if item.get("label") not in ("yes", "no") or not isinstance(item.get("segment"), dict):
+                raise ValueError(f"{path}:{line_number}: expected a segment and a yes/no label.")
+            labeled.append((item["segment"], item["label"]))
+    return labeled
+
+
+def save_labeled_segments(labeled: Iterable[tuple[dict[str, Any], str]], path: str) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        for segment, label in labeled:
+            f.write(json.dumps({"segment": to_builtin(segment), "label": label}) + "\n")
+
+
+def build_labeled_segments(num_utterances: int, model: Optional[BaseAIModel] = None,
+                           seed: int = 0) -> list[tuple[dict[str, Any], str]]:
+    """
+    Labels the segments of a synthetic transcript with the filtering LLM, without pre-filter:
+    the model's verdicts are the reference the pre-filter is compared to. Defaults to the fake model.
+    """
+    config = get_config()
+    model = model or FakeAIModel({"seed": seed})
+    chunks = ChunkingService().transcript_to_store(
+        generate_transcript(num_utterances, seed=seed),
+        start_marker=config.CHUNK_START_MARKER,
+        end_marker=config.CHUNK_END_MARKER
+    )
+    segments = ClusteringService().chunks_to_segments(chunks, model, max_workers=config.CLUSTERING_MAX_WORKERS)
+    analyzed_segments = FilteringService().filter_segments_for_actions(segments, model, max_workers=config.FILTERING_MAX_WORKERS)
+    return [
+        (to_builtin(segment), analyzed["action_analysis"]["action_segments_found"])
+        for segment, analyzed in zip(segments, analyzed_segments)
+    ]
+
+
+def evaluate(prefilter: PrefilterService, labeled: list[tuple[dict[str, Any], str]]) -> dict[str, Any]:
+    """
+    Compares the pre-filter's local decisions with the reference labels.
+
+    Returns:
+        The fraction of segments decided locally (the LLM calls saved), how many were accepted and rejected,
+        the agreement with the labels on the decided segments, and the disagreements by kind: false rejects
+        (actionable segments dropped before the model) are the costly ones, as their actions are lost
+    """
+    accepted = rejected = false_accepts = false_rejects = 0
+    for segment, label in labeled:
+        analysis = prefilter.decide(segment)
+        if analysis is None:
+            continue
+        if analysis["action_segments_found"] == "yes":
+            accepted += 1
+            false_accepts += label == "no"
+        else:
+            rejected += 1
+            false_rejects += label == "yes"
+
+    decided = accepted + rejected
+    return {
+        "reject_threshold": prefilter.reject_threshold,
+        "accept_threshold": prefilter.accept_threshold,
+        "segments": len(labeled),
+        "actionable_segments": sum(1 for _, label in labeled if label == "yes"),
+        "decided_locally": decided,
+        "decided_locally_fraction": round(decided / len(labeled), 4) if labeled else 0.0,
+        "accepted": accepted,
+        "rejected": rejected,
+        "agreement": round((decided - false_accepts - false_rejects) / decided, 4) if decided else None,
+        "false_accepts": false_accepts,
+        "false_rejects": false_rejects
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure how many segments the heuristic pre-filter decides without "
+                                                 "the LLM, and how often it agrees with the LLM's verdicts.")
+    parser.add_argument("--labeled", help="Labeled set (JSONL of {\"segment\", \"label\"}), defaults to a synthetic "
+                                          "transcript labeled by the fake model")
+    parser.add_argument("--utterances", type=int, default=2000, help="Size of the synthetic transcript")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save-labeled", help="Also write the synthetic labeled set to this JSONL file")
+    parser.add_argument("--thresholds", help="Comma-separated reject:accept pairs, e.g. 0.1:0.95,0.2:0.9")
+    parser.add_argument("--output", help="Results file, defaults to benchmarks/results/prefilter_<timestamp>.json")
+    args = parser.parse_args()
+
+    if args.labeled:
+        labeled = load_labeled_segments(args.labeled)
+        source = args.labeled
+    else:
+        labeled = build_labeled_segments(args.utterances, seed=args.seed)
+        source = f"synthetic ({args.utterances} utterances, fake model labels)"
+        if args.save_labeled:
+            save_labeled_segments(labeled, args.save_labeled)
+            print(f"[PrefilterEvaluation] Labeled set saved to {args.save_labeled}")
+
+    thresholds = DEFAULT_THRESHOLDS
+    if args.thresholds:
+        thresholds = [tuple(float(value) for value in pair.split(":")) for pair in args.thresholds.split(",")]
+
+    runs = []
+    for reject_threshold, accept_threshold in thresholds:
+        run = evaluate(PrefilterService(reject_threshold, accept_threshold), labeled)
+        print(f"[PrefilterEvaluation] reject <= {reject_threshold}, accept >= {accept_threshold}: "
+              f"{run['decided_locally_fraction']:.0%} of {run['segments']} segments decided locally, "
+              f"agreement {run['agreement']}, {run['false_rejects']} false rejects, {run['false_accepts']} false accepts")
+        runs.append(run)
+
+    results = {
+        "benchmark": "prefilter",
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "labeled_set": source,
+        "seed": args.seed,
+        "runs": runs
+    }
+    output = args.output or paths.BENCHMARK_RESULTS_DIR / f"prefilter_{datetime.now():%Y%m%d_%H%M%S}.json"
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"[PrefilterEvaluation] Results saved to {output}")
@@ -0,0 +1,220 @@
+import random
+import os, sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+ATTENDEES = [
+    ("Sarah Chen", "Product Manager"),
+    ("Marcus Rodriguez", "Engineering Lead"),
+    ("Lisa Park", "UX Designer"),
+    ("David Kim", "Data Scientist"),
+    ("Jennifer Wu", "QA Lead"),
+    ("Tom Becker", "Backend Engineer"),
+    ("Priya Nair", "Marketing Lead"),
+    ("Omar Haddad", "Support Manager"),
+]
+
+TOPICS = [
+    "the user dashboard redesign", "the search API latency", "the mobile release", "the onboarding flow",
+    "the billing migration", "the Q3 roadmap", "the customer churn analysis", "the accessibility audit",
+    "the data pipeline backfill", "the security review", "the pricing experiment", "the support ticket backlog",
+]
+DEADLINES = [
+    "by Friday", "by end of next week", "before the demo on Tuesday", "by tomorrow", "next week",
+    "by the end of the sprint", "before April 12th", "by EOD Thursday",
+]
+TASKS = [
+    "send the updated report", "fix the timeout in the export job", "schedule a review meeting",
+    "write up the findings", "investigate the error spike", "implement the new filter",
+    "document the API changes", "analyze last month's usage data", "set up the test environment",
+]
+
+# Utterance templates by kind, roughly in the proportions of a real meeting
+ACTION_TEMPLATES = [
+    "I'll {task} {deadline}.",
+    "{name}, can you {task} {deadline}?",
+    "We need to {task} {deadline}, this is urgent for {topic}.",
+    "Let's make sure someone can {task} {deadline}. I can take that one.",
+]
+DISCUSSION_TEMPLATES = [
+    "Moving on to {topic}. Where are we on that?",
+    "The latest numbers on {topic} look better than last month, around {percent}% improvement.",
+    "I talked to a few customers about {topic} and the feedback was mixed.",
+    "My concern with {topic} is the dependency on the other team's timeline.",
+    "We tried a different approach for {topic} and it reduced the error rate by {percent}%.",
+    "For {topic}, the main open question is still the scope of the first version.",
+]
+FILLER_TEMPLATES = ["Okay.", "Yeah, makes sense.", "Got it.", "Sounds good.", "Right.", "Um, sure."]
+
+
+def _timestamp(minutes: int) -> str:
+    """Formats minutes since midnight as the transcript's `H:MM AM` timestamp, wrapping at 24 hours."""
+    hours, minute = divmod(minutes % (24 * 60), 60)
+    suffix = "AM" if hours < 12 else "PM"
+    return f"{(hours % 12) or 12}:{minute:02d} {suffix}"
+
+
+def generate_utterances(num_utterances: int, num_speakers: int = 5, seed: int = 0) -> list[tuple[str, str, str]]:
+    """
+    Generates a synthetic meeting as (timestamp, speaker, text) tuples.
+
+    Topics change every 5 to 15 utterances, about 20% of the utterances are actions (commitments
+    with deadlines), 15% are short fillers and acknowledgements, and the rest is discussion.
+    The same arguments always produce the same meeting.
+    """
+    if not isinstance(num_utterances, int) or num_utterances <= 0:
+        raise ValueError("num_utterances must be a positive integer.")
+    if not 2 <= num_speakers <= len(ATTENDEES):
+        raise ValueError(f"num_speakers must be between 2 and {len(ATTENDEES)}.")
+
+    rng = random.Random(seed)
+    speakers = [name for name, _ in ATTENDEES[:num_speakers]]
+    utterances = []
+    minutes = 14 * 60  # meetings start at 2:00 PM
+    topic = rng.choice(TOPICS)
+    topic_left = rng.randint(5, 15)
+
+    for _ in range(num_utterances):
+        if topic_left == 0:
+            topic = rng.choice(TOPICS)
+            topic_left = rng.randint(5, 15)
+        topic_left -= 1
+
+        speaker = rng.choice(speakers)
+        kind = rng.random()
+        if kind < 0.2:
+            template = rng.choice(ACTION_TEMPLATES)
+        elif kind < 0.35:
+            template = rng.choice(FILLER_TEMPLATES)
+        else:
+            template = rng.choice(DISCUSSION_TEMPLATES)
+        text = template.format(
+            task=rng.choice(TASKS),
+            deadline=rng.choice(DEADLINES),
+            topic=topic,
+            percent=rng.randint(5, 60),
+            name=rng.choice([name for name in speakers if name != speaker]).split()[0]
+        )
+
+        utterances.append((_timestamp(minutes), speaker, text))
+        # Roughly two utterances per minute
+        minutes += rng.choice((0, 0, 1, 1, 1, 2))
+
+    return utterances
+
+
+def _caption_time(seconds: float, separator: str = ".") -> str:
+    seconds, milliseconds = divmod(int(round(seconds * 1000)), 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{separator}{milliseconds:03d}"
+
+
+def _timed(utterances: list[tuple[str, str, str]]) -> list[tuple[float, float, str, str]]:
+    """Gives each utterance a start and end offset in seconds, speaking at about 2.5 words per second."""
+    timed, offset = [], 0.0
+    for _, speaker, text in utterances:
+        duration = max(1.0, round(len(text.split()) / 2.5, 3))
+        timed.append((offset, offset + duration, speaker, text))
+        offset += duration + 0.5
+    return timed
+
+
+def _format_vtt(utterances: list[tuple[str, str, str]]) -> str:
+    """WebVTT with Teams-style `<v Speaker>` voice tags."""
+    cues = "\n\n".join(
+        f"{index}\n{_caption_time(start)} --> {_caption_time(end)}\n<v {speaker}>{text}</v>"
+        for index, (start, end, speaker, text) in enumerate(_timed(utterances), start=1)
+    )
+    return f"WEBVTT\n\n{cues}\n"
+
+
+def _format_srt(utterances: list[tuple[str, str, str]]) -> str:
+    """SubRip with Zoom-style `Speaker: text` cues."""
+    return "\n\n".join(
+        f"{index}\n{_caption_time(start, ',')} --> {_caption_time(end, ',')}\n{speaker}: {text}"
+        for index, (start, end, speaker, text) in enumerate(_timed(utterances), start=1)
+    ) + "\n"
+
+
+def _format_zoom(utterances: list[tuple[str, str, str]]) -> str:
+    """Zoom's saved live transcript, `[Speaker] HH:MM:SS` on the line before the text."""
+    meeting_start = 14 * 3600
+    return "\n".join(
+        f"[{speaker}] {_caption_time(meeting_start + start)[:8]}\n{text}"
+        for start, _, speaker, text in _timed(utterances)
+    ) + "\n"
+
+
+def _format_teams(utterances: list[tuple[str, str, str]]) -> str:
+    """Teams' transcript document as text: `Speaker   M:SS` then the text, turns separated by blank lines."""
+    lines = []
+    for start, _, speaker, text in _timed(utterances):
+        minutes, seconds = divmod(int(start), 60)
+        timestamp = f"{minutes // 60}:{minutes % 60:02d}:{seconds:02d}" if minutes >= 60 else f"{minutes}:{seconds:02d}"
+        lines.append(f"{speaker}   {timestamp}\n{text}")
+    return "\n\n".join(lines) + "\n"
+
+
+TRANSCRIPT_FORMATTERS = {
+    "vtt": _format_vtt,
+    "srt": _format_srt,
+    "zoom": _format_zoom,
+    "teams": _format_teams,
+}
+TRANSCRIPT_FORMATS = ("bracketed", *TRANSCRIPT_FORMATTERS)
+
+
+def generate_transcript(num_utterances: int, num_speakers: int = 5, seed: int = 0,
+                        transcript_format: str = "bracketed") -> str:
+    """
+    Generates a synthetic meeting transcript in the format of data/transcript.txt:
+    a header with the attendees, `[H:MM AM] Speaker: text` lines between the `TRANSCRIPT:`
+    and `[END TRANSCRIPT` markers, and a short metadata footer.
+
+    Other formats write the same meeting as a WebVTT, SRT, Zoom or Teams export (see TRANSCRIPT_FORMATS).
+    """
+    if transcript_format not in TRANSCRIPT_FORMATS:
+        raise ValueError(f"Unknown transcript format: {transcript_format}. Available: {list(TRANSCRIPT_FORMATS)}")
+    utterances = generate_utterances(num_utterances, num_speakers, seed)
+    if transcript_format != "bracketed":
+        return TRANSCRIPT_FORMATTERS[transcript_format](utterances)
+    attendees = "\n".join(f"- {name} ({role})" for name, role in ATTENDEES[:num_speakers])
+    lines = "\n\n".join(f"[{timestamp}] {speaker}: {text}" for timestamp, speaker, text in utterances)
+    end_time = utterances[-1][0]
+
+    return (
+        "MEETING TRANSCRIPT - SYNTHETIC DATA FOR BENCHMARKING\n\n"
+        "===========================================\n"
+        f"Synthetic Team Meeting - {num_utterances} utterances (seed {seed})\n"
+        f"2:00 PM - {end_time}\n"
+        "===========================================\n\n"
+        f"ATTENDEES:\n\n{attendees}\n\n"
+        f"TRANSCRIPT:\n\n{lines}\n\n"
+        f"[END TRANSCRIPT - {end_time}]\n\n"
+        "===========================================\n"
+        "MEETING SUMMARY METADATA:\n\n"
+        f"- Total Attendees: {num_speakers}\n"
+        f"- Utterances: {num_utterances}\n"
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate a synthetic meeting transcript.")
+    parser.add_argument("--utterances", type=int, default=100)
+    parser.add_argument("--speakers", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", default="bracketed", choices=TRANSCRIPT_FORMATS)
+    parser.add_argument("--output", help="File to write, prints to stdout when omitted")
+    args = parser.parse_args()
+
+    transcript = generate_transcript(args.utterances, args.speakers, args.seed, args.format)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(transcript)
+        print(f"Wrote {args.utterances} utterances ({len(transcript)} bytes) to {args.output}")
+    else:
+        print(transcript)
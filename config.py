@@ -5,20 +5,54 @@ class Config:
     """Configuration class for the pipeline."""
     # Fastapi server
     FASTAPI_API_URL = "http://127.0.0.1:8000/pipeline"
+    WARMUP_MODEL_CALL = True  # send a tiny prompt at startup before reporting ready
     
     # File handling
     MAX_FILENAME_LENGTH = 255
     DEFAULT_TRANSCRIPT_FILE = 'data/transcript.txt'
     
+    # Prompt templates (loaded once by the prompt registry)
+    PROMPT_AUTO_RELOAD = False  # re-read a template when its file mtime changes
+    
     # Chunking service
     CHUNK_START_MARKER = "TRANSCRIPT:"
     CHUNK_END_MARKER = "[END TRANSCRIPT"
+    TRANSCRIPT_FORMAT = "auto"  # "auto" detects it, or "bracketed", "vtt", "srt", "zoom", "teams"
     
     # AI Model configuration
     MODEL_TYPE = "gemini"
     MODEL_NAME = "gemini-2.0-flash"
     API_KEY_ENV_VAR = "GEMINI_API_KEY"
     
+    # Fake model (MODEL_TYPE = "fake"): offline canned responses with simulated latency, errors and rate limits
+    FAKE_LATENCY_DISTRIBUTION = "uniform"  # "constant", "uniform", "normal" or "lognormal"
+    FAKE_LATENCY_MS = 500  # mean latency per call
+    FAKE_LATENCY_JITTER_MS = 200  # half-range (uniform) or standard deviation (normal, lognormal)
+    FAKE_LATENCY_MS_PER_1K_TOKENS = 0  # extra latency per 1k estimated prompt tokens
+    FAKE_ERROR_RATE = 0.0  # fraction of calls failing with a transient (retried) error
+    FAKE_RATE_LIMIT_RPM = None  # calls beyond this many per minute get a 429, None disables
+    FAKE_MAX_CONCURRENT_REQUESTS = None  # calls beyond this many in flight get a 429, None disables
+    FAKE_CLUSTER_SIZE = 4  # consecutive chunks per fake clustering topic
+    FAKE_SEED = 0
+    
+    # LLM response cache (SQLite, defaults to paths.LLM_CACHE_DB)
+    LLM_CACHE_ENABLED = False
+    LLM_CACHE_PATH = None
+    LLM_CACHE_MAX_BYTES = 256 * 1024 * 1024
+    LLM_CACHE_TTL_SECONDS = None  # None keeps entries until evicted
+    
+    # Metrics (served on /metrics), prices are used for the estimated cost counter
+    METRICS_ENABLED = True
+    LLM_PROMPT_COST_PER_1K_TOKENS = 0.0001  # gemini-2.0-flash input price, USD
+    LLM_RESPONSE_COST_PER_1K_TOKENS = 0.0004  # gemini-2.0-flash output price, USD
+    
+    # Tracing (spans per run, stage, segment, extractor, LLM call and retry backoff)
+    TRACING_ENABLED = False
+    TRACING_EXPORTER = "jsonl"  # "jsonl" (one span per line) or "otlp" (OTLP/HTTP JSON collector)
+    TRACING_JSONL_PATH = None  # defaults to paths.TRACES_FILE
+    TRACING_OTLP_ENDPOINT = "http://localhost:4318/v1/traces"
+    TRACING_SERVICE_NAME = "transcript-pipeline"
+    
     # Retry configuration
     MAX_RETRIES = 5
     BASE_DELAY = 1.0
@@ -26,17 +60,93 @@ class Config:
     
     # Pipeline settings
     DEBUG_MODE = False
+    PROMPT_ENCODING = "json"  # "json" (indented JSON) or "compact" (one id|speaker|text line per utterance)
+    EXTRACTION_MODE = "chained"  # "chained" (one prompt per field) or "fused" (single prompt)
+    
+    # Compression before clustering (merge same-speaker turns, drop fillers, collapse acknowledgements)
+    COMPRESSION_ENABLED = False
+    
+    # Clustering settings
+    CLUSTERING_MODE = "single"  # "single" (whole transcript in one prompt) or "windowed" (overlapping windows in parallel)
+    CLUSTERING_WINDOW_TOKEN_BUDGET = 4000  # max estimated tokens of chunk data per window
+    CLUSTERING_WINDOW_OVERLAP = 4  # chunks repeated at the start of the next window
+    
+    # Filtering settings
+    FILTERING_MODE = "single"  # "single" (one prompt per segment) or "batched" (several segments per prompt)
+    FILTERING_BATCH_TOKEN_BUDGET = 6000  # max estimated tokens of segment data per batched prompt
+    
+    # Local heuristic pre-filter before the filtering prompt (segments it decides skip the LLM)
+    PREFILTER_ENABLED = False
+    PREFILTER_REJECT_THRESHOLD = 0.15  # score at or below which a segment is decided "no" locally
+    PREFILTER_ACCEPT_THRESHOLD = 0.9  # score at or above which a segment is decided "yes" locally
+    
+    # Background job queue
+    JOB_WORKERS = 4  # transcripts processed at once
+    JOB_QUEUE_SIZE = 100
+    JOB_RESULT_TTL_SECONDS = 3600
+    
+    # Live meeting sessions (utterances appended while the meeting goes on)
+    SESSION_OPEN_SEGMENTS = 1  # trailing segments re-clustered on each update, earlier ones are final
+    SESSION_MAX_OPEN_CHUNKS = 60  # an open segment this long is closed, which bounds the cost of an update
+    SESSION_MAX_SESSIONS = 100
+    SESSION_IDLE_TTL_SECONDS = 3600  # sessions without updates for this long are dropped
+    
+    # Multi-transcript batches
+    BATCH_MAX_TRANSCRIPTS = 50
+    BATCH_MAX_CONCURRENCY = 16  # max in-flight LLM calls across every transcript of a batch
+    
+    # Concurrency settings (max in-flight LLM calls per stage)
+    CLUSTERING_MAX_WORKERS = 4
+    FILTERING_MAX_WORKERS = 8
+    EXTRACTION_MAX_WORKERS = 8
     
     @classmethod
     def get_model_config(cls) -> dict:
         """Get the model configuration dictionary."""
-        return {
+        model_config = {
             "api_key": os.getenv(cls.API_KEY_ENV_VAR),
             "model": cls.MODEL_NAME,
             "max_retries": cls.MAX_RETRIES,
             "base_delay": cls.BASE_DELAY,
             "max_delay": cls.MAX_DELAY
         }
+        if cls.MODEL_TYPE == "fake":
+            model_config.update(cls.get_fake_model_config())
+        return model_config
+    
+    @classmethod
+    def get_fake_model_config(cls) -> dict:
+        """Get the simulation settings of the fake model."""
+        return {
+            "latency_distribution": cls.FAKE_LATENCY_DISTRIBUTION,
+            "latency_ms": cls.FAKE_LATENCY_MS,
+            "latency_jitter_ms": cls.FAKE_LATENCY_JITTER_MS,
+            "latency_ms_per_1k_tokens": cls.FAKE_LATENCY_MS_PER_1K_TOKENS,
+            "error_rate": cls.FAKE_ERROR_RATE,
+            "rate_limit_rpm": cls.FAKE_RATE_LIMIT_RPM,
+            "max_concurrent_requests": cls.FAKE_MAX_CONCURRENT_REQUESTS,
+            "cluster_size": cls.FAKE_CLUSTER_SIZE,
+            "seed": cls.FAKE_SEED
+        }
+    
+    @classmethod
+    def get_cache_config(cls) -> dict:
+        """Get the LLM response cache configuration dictionary."""
+        return {
+            "enabled": cls.LLM_CACHE_ENABLED,
+            "path": cls.LLM_CACHE_PATH,
+            "max_bytes": cls.LLM_CACHE_MAX_BYTES,
+            "ttl_seconds": cls.LLM_CACHE_TTL_SECONDS
+        }
+    
+    @classmethod
+    def get_metrics_config(cls) -> dict:
+        """Get the LLM call metrics configuration dictionary."""
+        return {
+            "enabled": cls.METRICS_ENABLED,
+            "prompt_cost_per_1k_tokens": cls.LLM_PROMPT_COST_PER_1K_TOKENS,
+            "response_cost_per_1k_tokens": cls.LLM_RESPONSE_COST_PER_1K_TOKENS
+        }
     
     @classmethod
     def is_valid_file_path(cls, input_string: str) -> bool:
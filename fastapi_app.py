@@ -1,18 +1,58 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from api.routes import pipeline
+from api.routes import health, jobs, metrics, pipeline, sessions
 import uvicorn
 from dotenv import load_dotenv
 import paths
 
 load_dotenv(paths.ENV_FILE)
 
+from config import get_config
+from src.services.pipeline_service import build_pipeline_resources, warm_up_pipeline_resources
+from src.services.job_service import JobManager
+from src.services.session_service import SessionManager
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Builds the shared model client and services once, warms them up, then flags the app as ready."""
+    config = get_config()
+    app.state.ready = False
+    app.state.pipeline_resources = await asyncio.to_thread(build_pipeline_resources, config)
+    await warm_up_pipeline_resources(app.state.pipeline_resources, config.WARMUP_MODEL_CALL)
+    app.state.job_manager = JobManager(
+        app.state.pipeline_resources,
+        max_workers=config.JOB_WORKERS,
+        max_queue_size=config.JOB_QUEUE_SIZE,
+        result_ttl_seconds=config.JOB_RESULT_TTL_SECONDS
+    )
+    await app.state.job_manager.start()
+    app.state.session_manager = SessionManager(
+        app.state.pipeline_resources,
+        max_sessions=config.SESSION_MAX_SESSIONS,
+        idle_ttl_seconds=config.SESSION_IDLE_TTL_SECONDS,
+        open_segments=config.SESSION_OPEN_SEGMENTS,
+        max_open_chunks=config.SESSION_MAX_OPEN_CHUNKS
+    )
+    app.state.ready = True
+    yield
+    app.state.ready = False
+    await app.state.job_manager.stop()
+
+
 app = FastAPI(
     title="Transcript Action Item Pipeline",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+app.include_router(health.router)
 app.include_router(pipeline.router)
+app.include_router(jobs.router)
+app.include_router(sessions.router)
+app.include_router(metrics.router)
 
 
 if __name__ == "__main__":
-    uvicorn.run("fastapi_app:app", host="127.0.0.1", port=8000, reload=True)
\ No newline at end of file
+    uvicorn.run("fastapi_app:app", host="127.0.0.1", port=8000, reload=True)
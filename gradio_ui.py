@@ -40,7 +40,7 @@ with gr.Blocks() as demo:
         )
     
     with gr.Tab("Upload File"):
-        file_input = gr.File(file_types=[".txt"], label="Upload transcript .txt file")
+        file_input = gr.File(file_types=[".txt", ".vtt", ".srt"], label="Upload transcript file (.txt, .vtt or .srt)")
     
     output = gr.JSON(label="Extracted Action Items")
     
@@ -6,10 +6,39 @@ BASE_DIR = Path(__file__).resolve().parent
 # .env file
 ENV_FILE = BASE_DIR / "config" / ".env"
 
+# LLM response cache
+LLM_CACHE_DB = BASE_DIR / "cache" / "llm_cache.sqlite3"
+
+# Trace spans (JSON lines exporter)
+TRACES_FILE = BASE_DIR / "logs" / "traces.jsonl"
+
+# Benchmark results (JSON, one file per run of a benchmark suite)
+BENCHMARK_RESULTS_DIR = BASE_DIR / "benchmarks" / "results"
+
 # Prompts directory
 CLUSTERING_SERVICE_PROMPT = BASE_DIR / "src"/ "prompts" / "clustering_service_prompt.txt"
+CLUSTERING_SERVICE_COMPACT_PROMPT = BASE_DIR / "src"/ "prompts" / "clustering_service_compact_prompt.txt"
 FILTERING_SERVICE_PROMPT = BASE_DIR / "src" / "prompts" / "filtering_service_prompt.txt"
+FILTERING_SERVICE_COMPACT_PROMPT = BASE_DIR / "src" / "prompts" / "filtering_service_compact_prompt.txt"
+FILTERING_SERVICE_BATCH_PROMPT = BASE_DIR / "src" / "prompts" / "filtering_service_batch_prompt.txt"
+FILTERING_SERVICE_BATCH_COMPACT_PROMPT = BASE_DIR / "src" / "prompts" / "filtering_service_batch_compact_prompt.txt"
 EXTRACTION_ASSIGNEES_PROMPT = BASE_DIR / "src"/ "prompts" / "extraction_assignees_prompt.txt"
 EXTRACTION_DEADLINES_PROMPT = BASE_DIR / "src"/ "prompts" / "extraction_deadlines_prompt.txt"
 EXTRACTION_PRIORITY_PROMPT = BASE_DIR / "src"/ "prompts" / "extraction_priority_prompt.txt"
-EXTRACTION_CATEGORY_PROMPT = BASE_DIR / "src"/ "prompts" / "extraction_category_prompt.txt"
\ No newline at end of file
+EXTRACTION_CATEGORY_PROMPT = BASE_DIR / "src"/ "prompts" / "extraction_category_prompt.txt"
+EXTRACTION_FUSED_PROMPT = BASE_DIR / "src"/ "prompts" / "extraction_fused_prompt.txt"
+
+# Prompt templates by registry name
+PROMPT_TEMPLATES = {
+    "clustering": CLUSTERING_SERVICE_PROMPT,
+    "clustering_compact": CLUSTERING_SERVICE_COMPACT_PROMPT,
+    "filtering": FILTERING_SERVICE_PROMPT,
+    "filtering_compact": FILTERING_SERVICE_COMPACT_PROMPT,
+    "filtering_batch": FILTERING_SERVICE_BATCH_PROMPT,
+    "filtering_batch_compact": FILTERING_SERVICE_BATCH_COMPACT_PROMPT,
+    "extraction_assignees": EXTRACTION_ASSIGNEES_PROMPT,
+    "extraction_deadlines": EXTRACTION_DEADLINES_PROMPT,
+    "extraction_priority": EXTRACTION_PRIORITY_PROMPT,
+    "extraction_category": EXTRACTION_CATEGORY_PROMPT,
+    "extraction_fused": EXTRACTION_FUSED_PROMPT,
+}
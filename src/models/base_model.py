@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Dict, Any
 
@@ -10,11 +11,23 @@ class BaseAIModel(ABC):
         """Main processing method - the core AI logic"""
         pass
     
+    async def aprocess(self, input_text: str) -> str:
+        """Async processing method - defaults to running process() in a worker thread"""
+        return await asyncio.to_thread(self.process, input_text)
+    
     @abstractmethod
     def get_info(self) -> Dict[str, str]:
         """Get model information"""
         pass
 
+    def get_decoding_params(self) -> Dict[str, Any]:
+        """Get the decoding parameters that influence the model output (used in cache keys)"""
+        return {}
+
+    def invalidate(self, input_text: str) -> None:
+        """Forget any stored response to this prompt, e.g. one that failed to parse (no-op without a cache)"""
+        pass
+
     def validate_input(self, input_text: Any) -> str:
         """Default validation: ensures input is a non-empty string."""
         if not isinstance(input_text, str):
@@ -0,0 +1,172 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+import os, sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.models.base_model import BaseAIModel
+from src.utils.metrics import LLM_CACHE_LOOKUPS
+import paths
+
+
+class CachedAIModel(BaseAIModel):
+    """
+    Wraps another model and stores its responses in a persistent, content-addressed SQLite cache.
+
+    Entries are keyed by (provider, model name, decoding params, prompt hash), evicted
+    least-recently-used first once the cache grows past max_bytes, and optionally expire after ttl_seconds.
+    Services invalidate() the responses they could not parse or validate, so a bad answer is not replayed.
+    """
+
+    def __init__(self, model: BaseAIModel, config: dict[str, Any] = None):
+        super().__init__(config)
+        self.model = model
+        self.cache_path = Path(self.config.get("path") or paths.LLM_CACHE_DB)
+        self.max_bytes = self.config.get("max_bytes", 256 * 1024 * 1024)
+        self.ttl_seconds = self.config.get("ttl_seconds")
+
+        if not isinstance(model, BaseAIModel):
+            raise TypeError("model must be a BaseAIModel instance.")
+        if not isinstance(self.max_bytes, int) or self.max_bytes <= 0:
+            raise ValueError("max_bytes must be a positive integer.")
+        if self.ttl_seconds is not None and not (isinstance(self.ttl_seconds, (int, float)) and self.ttl_seconds > 0):
+            raise ValueError("ttl_seconds must be a positive number or None.")
+
+        self.hits = 0
+        self.misses = 0
+        # A single connection shared by the worker threads of the pipeline, serialized by a lock
+        self._lock = threading.Lock()
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.cache_path), check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache (last_access)")
+        self._connection.commit()
+
+    def _cache_key(self, input_text: str) -> str:
+        info = self.model.get_info()
+        key_data = {
+            "provider": info.get("provider"),
+            "model": info.get("model"),
+            "params": self.model.get_decoding_params(),
+            "prompt_sha256": hashlib.sha256(input_text.encode("utf-8")).hexdigest()
+        }
+        return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _lookup(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                LLM_CACHE_LOOKUPS.inc(result="miss")
+                return None
+
+            response, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                self._connection.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._connection.commit()
+                self.misses += 1
+                LLM_CACHE_LOOKUPS.inc(result="miss")
+                return None
+
+            self._connection.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._connection.commit()
+            self.hits += 1
+            LLM_CACHE_LOOKUPS.inc(result="hit")
+            return response
+
+    def _store(self, key: str, response: str) -> None:
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, response, size, now, now)
+            )
+            self._evict()
+            self._connection.commit()
+
+    def _evict(self) -> None:
+        """Deletes least recently used entries until the cache fits in max_bytes. Caller holds the lock."""
+        total_size = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        if total_size <= self.max_bytes:
+            return
+
+        rows = self._connection.execute("SELECT key, size FROM llm_cache ORDER BY last_access ASC").fetchall()
+        stale_keys = []
+        for key, size in rows:
+            if total_size <= self.max_bytes:
+                break
+            stale_keys.append((key,))
+            total_size -= size
+        self._connection.executemany("DELETE FROM llm_cache WHERE key = ?", stale_keys)
+
+    def process(self, input_text: str) -> str:
+        key = self._cache_key(input_text)
+        cached_response = self._lookup(key)
+        if cached_response is not None:
+            return cached_response
+
+        response = self.model.process(input_text)
+        self._store(key, response)
+        return response
+
+    async def aprocess(self, input_text: str) -> str:
+        key = self._cache_key(input_text)
+        # SQLite access is blocking, keep it off the event loop
+        cached_response = await asyncio.to_thread(self._lookup, key)
+        if cached_response is not None:
+            return cached_response
+
+        response = await self.model.aprocess(input_text)
+        await asyncio.to_thread(self._store, key, response)
+        return response
+
+    def invalidate(self, input_text: str) -> None:
+        """Remove the cached response to this prompt, if any"""
+        key = self._cache_key(input_text)
+        with self._lock:
+            self._connection.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            self._connection.commit()
+        self.model.invalidate(input_text)
+
+    def get_info(self):
+        return {
+            **self.model.get_info(),
+            "cache": str(self.cache_path)
+        }
+
+    def get_decoding_params(self):
+        return self.model.get_decoding_params()
+
+    def get_cache_stats(self) -> dict[str, Any]:
+        """Get hit/miss counters and the current size of the cache"""
+        with self._lock:
+            entries, size_bytes = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "size_bytes": size_bytes
+        }
+
+    def clear(self) -> None:
+        """Remove every cached response"""
+        with self._lock:
+            self._connection.execute("DELETE FROM llm_cache")
+            self._connection.commit()
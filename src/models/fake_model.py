@@ -0,0 +1,382 @@
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import deque
+from string import Formatter
+from typing import Any, Optional
+import os, sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.models.base_model import BaseAIModel
+from src.utils.metrics import LLM_RETRIES
+from src.utils.prompt_registry import PromptRegistry, get_prompt_registry
+from src.utils.token_utils import estimate_tokens
+from src.utils.tracing import span
+
+
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "normal", "lognormal")
+
+COMMITMENT_PATTERN = re.compile(
+    r"\b(I'll|I will|I can|we'll|we will|will you|can you|could you|please|need to|needs to|should|let's|action item)\b",
+    re.IGNORECASE
+)
+DEADLINE_PATTERN = re.compile(
+    r"\b(?:(?:by|before|until|on)\s+(?:the\s+)?(?:end of (?:the )?(?:day|week|month|next week|sprint)|EOD|"
+    r"next \w+|tomorrow|today|tonight|monday|tuesday|wednesday|thursday|friday|"
+    r"(?:january|february|march|april|may|june|july|august|september|october|november|december) \d{1,2}(?:st|nd|rd|th)?)|"
+    r"next week|this week|tomorrow)\b",
+    re.IGNORECASE
+)
+URGENT_PATTERN = re.compile(r"\b(ASAP|urgent(?:ly)?|immediately|critical|right away|blocker)\b", re.IGNORECASE)
+
+# First matching category wins, following the conflict resolution order of the category prompt
+CATEGORY_KEYWORDS = (
+    ("Bug Fix", re.compile(r"\b(bug|fix|error|crash|broken|timing out|timeout|issue|regression)\b", re.IGNORECASE)),
+    ("Feature Development", re.compile(r"\b(build|implement|develop|feature|add|redesign|integrate)\b", re.IGNORECASE)),
+    ("Research", re.compile(r"\b(research|investigate|analy[sz]e|explore|evaluate|study)\b", re.IGNORECASE)),
+    ("Documentation", re.compile(r"\b(document|documentation|docs|write up|guide|wiki)\b", re.IGNORECASE)),
+    ("Meeting", re.compile(r"\b(schedule|meeting|invite|demo|sync|call)\b", re.IGNORECASE)),
+)
+
+
+class FakeTransientError(Exception):
+    """Simulated transient provider failure (e.g. Gemini ResourceExhausted), retried with backoff."""
+
+
+class FakeRateLimitError(FakeTransientError):
+    """Simulated 429 raised when the configured request rate or concurrency limit is exceeded."""
+
+
+class FakeAIModel(BaseAIModel):
+    """
+    Offline model returning deterministic, valid JSON for every pipeline prompt.
+
+    The prompt template is recognized through the prompt registry and its input data is read back
+    from the prompt, so clustering, filtering (single and batched, JSON or compact encoding) and each
+    extractor get a plausible answer computed from the transcript text with simple heuristics.
+    The same prompt always gets the same response.
+
+    Latency (constant, uniform, normal or lognormal, plus an optional per-token cost), transient error
+    rate and provider rate limits (requests per minute, concurrent requests) are configurable, and the
+    random draws are seeded, so concurrency, caching and retry behavior can be benchmarked
+    reproducibly without network access.
+    """
+
+    def __init__(self, config: dict[str, Any] = None, prompt_registry: PromptRegistry = None):
+        super().__init__(config)
+        self.model_name = self.config.get("model", "fake-llm")
+        self.max_retries = self.config.get("max_retries", 5)
+        self.base_delay = self.config.get("base_delay", 1.0)
+        self.max_delay = self.config.get("max_delay", 10.0)
+        self.latency_distribution = self.config.get("latency_distribution", "uniform")
+        self.latency_ms = self.config.get("latency_ms", 500)
+        self.latency_jitter_ms = self.config.get("latency_jitter_ms", 200)
+        self.latency_ms_per_1k_tokens = self.config.get("latency_ms_per_1k_tokens", 0)
+        self.error_rate = self.config.get("error_rate", 0.0)
+        self.rate_limit_rpm = self.config.get("rate_limit_rpm")
+        self.max_concurrent_requests = self.config.get("max_concurrent_requests")
+        self.cluster_size = self.config.get("cluster_size", 4)
+        self.seed = self.config.get("seed", 0)
+
+        if not isinstance(self.max_retries, int) or self.max_retries <= 0:
+            raise ValueError("max_retries must be a positive integer.")
+        if not (isinstance(self.base_delay, (int, float)) and self.base_delay >= 0):
+            raise ValueError("base_delay must be a non-negative number.")
+        if not (isinstance(self.max_delay, (int, float)) and self.max_delay >= self.base_delay):
+            raise ValueError("max_delay must be greater than or equal to base_delay.")
+        if self.latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {self.latency_distribution}. Available: {list(LATENCY_DISTRIBUTIONS)}")
+        if not (isinstance(self.latency_ms, (int, float)) and self.latency_ms >= 0):
+            raise ValueError("latency_ms must be a non-negative number.")
+        if not (isinstance(self.latency_jitter_ms, (int, float)) and self.latency_jitter_ms >= 0):
+            raise ValueError("latency_jitter_ms must be a non-negative number.")
+        if not (isinstance(self.error_rate, (int, float)) and 0 <= self.error_rate <= 1):
+            raise ValueError("error_rate must be between 0 and 1.")
+        if self.rate_limit_rpm is not None and not (isinstance(self.rate_limit_rpm, int) and self.rate_limit_rpm > 0):
+            raise ValueError("rate_limit_rpm must be a positive integer or None.")
+        if self.max_concurrent_requests is not None and not (isinstance(self.max_concurrent_requests, int) and self.max_concurrent_requests > 0):
+            raise ValueError("max_concurrent_requests must be a positive integer or None.")
+        if not isinstance(self.cluster_size, int) or self.cluster_size <= 0:
+            raise ValueError("cluster_size must be a positive integer.")
+
+        self._prompts = prompt_registry or get_prompt_registry()
+        # Latency, error and backoff draws; seeded so that a run can be replayed
+        self._random = random.Random(self.seed)
+        self._lock = threading.Lock()
+        self._request_times: deque = deque()
+        self._in_flight = 0
+        self.stats = {"calls": 0, "transient_errors": 0, "rate_limited": 0}
+
+    def _exponential_backoff(self, attempt: int) -> float:
+        delay = min(self.base_delay * (2 ** attempt), self.max_delay)
+        with self._lock:
+            return self._random.uniform(0, delay)
+
+    def _draw_latency(self, input_text: str) -> float:
+        """Draws the simulated latency of one call, in seconds."""
+        with self._lock:
+            if self.latency_distribution == "uniform":
+                latency_ms = self._random.uniform(self.latency_ms - self.latency_jitter_ms, self.latency_ms + self.latency_jitter_ms)
+            elif self.latency_distribution == "normal":
+                latency_ms = self._random.gauss(self.latency_ms, self.latency_jitter_ms)
+            elif self.latency_distribution == "lognormal" and self.latency_ms > 0:
+                # Long right tail with the configured mean, the jitter acting as the standard deviation
+                sigma_squared = math.log(1 + (self.latency_jitter_ms / self.latency_ms) ** 2)
+                mu = math.log(self.latency_ms) - sigma_squared / 2
+                latency_ms = self._random.lognormvariate(mu, math.sqrt(sigma_squared))
+            else:
+                latency_ms = self.latency_ms
+        latency_ms += self.latency_ms_per_1k_tokens * estimate_tokens(input_text) / 1000
+        return max(0.0, latency_ms) / 1000
+
+    def _admit(self) -> None:
+        """
+        Applies the simulated rate limits and error rate before a call, raising like a provider would.
+        """
+        with self._lock:
+            self.stats["calls"] += 1
+            now = time.monotonic()
+            if self.rate_limit_rpm is not None:
+                while self._request_times and now - self._request_times[0] >= 60:
+                    self._request_times.popleft()
+                if len(self._request_times) >= self.rate_limit_rpm:
+                    self.stats["rate_limited"] += 1
+                    raise FakeRateLimitError(f"429 Quota exceeded: more than {self.rate_limit_rpm} requests per minute (simulated)")
+            if self.max_concurrent_requests is not None and self._in_flight >= self.max_concurrent_requests:
+                self.stats["rate_limited"] += 1
+                raise FakeRateLimitError(f"429 Too many concurrent requests: limit is {self.max_concurrent_requests} (simulated)")
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.stats["transient_errors"] += 1
+                raise FakeTransientError("429 Resource has been exhausted (simulated)")
+            self._request_times.append(now)
+            self._in_flight += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def _call_model(self, input_text: str) -> str:
+        self._admit()
+        try:
+            time.sleep(self._draw_latency(input_text))
+            return self.respond(input_text)
+        finally:
+            self._release()
+
+    async def _acall_model(self, input_text: str) -> str:
+        self._admit()
+        try:
+            await asyncio.sleep(self._draw_latency(input_text))
+            return self.respond(input_text)
+        finally:
+            self._release()
+
+    def process(self, input_text: str) -> str:
+        for attempt in range(self.max_retries):
+            try:
+                with span("llm.call", provider="Fake", attempt=attempt + 1):
+                    return self._call_model(input_text)
+            except FakeTransientError as e:
+                delay = self._exponential_backoff(attempt)
+                print(f"[FakeModel][Retry {attempt+1}] Transient error: {e}. Retrying in {delay:.2f}s...")
+                LLM_RETRIES.inc(provider="Fake")
+                with span("retry_backoff", attempt=attempt + 1, delay_seconds=round(delay, 3)):
+                    time.sleep(delay)
+            except Exception as e:
+                print(f"[FakeModel] Fatal error: {e}")
+                break
+        raise RuntimeError("Fake API failed after max retries.")
+
+    async def aprocess(self, input_text: str) -> str:
+        for attempt in range(self.max_retries):
+            try:
+                with span("llm.call", provider="Fake", attempt=attempt + 1):
+                    return await self._acall_model(input_text)
+            except FakeTransientError as e:
+                delay = self._exponential_backoff(attempt)
+                print(f"[FakeModel][Retry {attempt+1}] Transient error: {e}. Retrying in {delay:.2f}s...")
+                LLM_RETRIES.inc(provider="Fake")
+                with span("retry_backoff", attempt=attempt + 1, delay_seconds=round(delay, 3)):
+                    await asyncio.sleep(delay)
+            except Exception as e:
+                print(f"[FakeModel] Fatal error: {e}")
+                break
+        raise RuntimeError("Fake API failed after max retries.")
+
+    def get_info(self):
+        return {
+            "provider": "Fake",
+            "model": self.model_name,
+            "description": "Deterministic offline model for benchmarks and local development"
+        }
+
+    def get_stats(self) -> dict[str, int]:
+        """Get the number of calls, simulated transient errors and rate-limited calls so far."""
+        with self._lock:
+            return dict(self.stats)
+
+    def _match_template(self, input_text: str) -> tuple[Optional[str], dict[str, str]]:
+        """
+        Finds the registry template the prompt was rendered from, and reads its placeholder values back.
+
+        Returns:
+            The template name (None when no template matches) and the value of each placeholder
+        """
+        best_name, best_values, best_literal_length = None, {}, -1
+        for name in self._prompts.names():
+            # literals[i] precedes fields[i], and literals[-1] follows the last field. Formatter.parse unescapes
+            # doubled braces (splitting the literal text there), so the literals are exactly what format() printed
+            fields, literals = [], [""]
+            for literal, field, _, _ in Formatter().parse(self._prompts.get(name)):
+                literals[-1] += literal
+                if field is not None:
+                    fields.append(field)
+                    literals.append("")
+            if not fields or not (input_text.startswith(literals[0]) and input_text.endswith(literals[-1])):
+                continue
+            position, end = len(literals[0]), len(input_text) - len(literals[-1])
+            if end < position:
+                continue
+
+            values = {}
+            for index, field in enumerate(fields):
+                found = end if index == len(fields) - 1 else input_text.find(literals[index + 1], position, end)
+                if found == -1:
+                    break
+                values[field] = input_text[position:found]
+                position = found + len(literals[index + 1])
+            else:
+                literal_length = sum(len(literal) for literal in literals)
+                if literal_length > best_literal_length:
+                    best_name, best_values, best_literal_length = name, values, literal_length
+        return best_name, best_values
+
+    def _parse_chunk_ids(self, input_data: str) -> list[Any]:
+        try:
+            return [chunk["id"] for chunk in json.loads(input_data)]
+        except (ValueError, TypeError, KeyError):
+            # Compact encoding: one id|speaker|text line per chunk
+            return [int(line.split("|", 1)[0]) for line in input_data.splitlines() if re.match(r"^\d+\|", line)]
+
+    def _parse_segments(self, input_data: str) -> list[dict[str, Any]]:
+        """
+        Reads segments back from a prompt, as {"segment_id", "utterances": [(speaker, text), ...]}.
+        """
+        try:
+            data = json.loads(input_data)
+            segments = data if isinstance(data, list) else [data]
+            return [
+                {
+                    "segment_id": segment.get("segment_id"),
+                    "utterances": [self._split_speaker(chunk.get("content", "")) for chunk in segment.get("chunks", [])]
+                }
+                for segment in segments
+            ]
+        except (ValueError, AttributeError):
+            segments = []
+            for block in re.split(r"(?m)^(?=segment_id: )", input_data):
+                if not block.startswith("segment_id: "):
+                    continue
+                segment_id = block.splitlines()[0][len("segment_id: "):].strip()
+                utterances = [
+                    tuple(line.split("|", 2)[1:])
+                    for line in block.splitlines() if re.match(r"^\d+\|[^|]*\|", line)
+                ]
+                segments.append({"segment_id": int(segment_id) if segment_id.isdigit() else segment_id, "utterances": utterances})
+            return segments
+
+    def _split_speaker(self, content: str) -> tuple[str, str]:
+        speaker, separator, text = content.partition(": ")
+        return (speaker, text) if separator else ("", content)
+
+    def _is_actionable(self, utterances: list[tuple[str, str]]) -> bool:
+        return any(COMMITMENT_PATTERN.search(text) for _, text in utterances)
+
+    def _assignees(self, utterances: list[tuple[str, str]]) -> dict[str, Any]:
+        assignees = []
+        for speaker, text in utterances:
+            if speaker and re.search(r"\b(I'll|I will|I can)\b", text) and speaker not in assignees:
+                assignees.append(speaker)
+        return {"assignees": assignees}
+
+    def _deadlines(self, utterances: list[tuple[str, str]]) -> dict[str, Any]:
+        text = " ".join(text for _, text in utterances)
+        deadlines = list(dict.fromkeys(match.group(0) for match in DEADLINE_PATTERN.finditer(text)))
+        urgent_flags = list(dict.fromkeys(match.group(0) for match in URGENT_PATTERN.finditer(text)))
+        return {"deadlines": deadlines, "urgent_flags": urgent_flags}
+
+    def _priority(self, utterances: list[tuple[str, str]], rng: random.Random) -> dict[str, Any]:
+        deadlines = self._deadlines(utterances)
+        if deadlines["urgent_flags"]:
+            priority = "High"
+        elif deadlines["deadlines"]:
+            priority = "Medium"
+        else:
+            priority = "Low"
+        return {"priority": priority, "confidence": rng.randint(60, 95), "reasoning": f"{priority} priority from the urgency and deadline signals."}
+
+    def _category(self, utterances: list[tuple[str, str]], rng: random.Random) -> dict[str, Any]:
+        text = " ".join(text for _, text in utterances)
+        category = next((name for name, pattern in CATEGORY_KEYWORDS if pattern.search(text)), "Other")
+        return {"category": category, "confidence": rng.randint(60, 95), "reasoning": f"Keywords indicate {category.lower()} work."}
+
+    def _verdict(self, segment: dict[str, Any], rng: random.Random) -> dict[str, Any]:
+        actionable = self._is_actionable(segment["utterances"])
+        return {
+            "action_segments_found": "yes" if actionable else "no",
+            "confidence_percentage": rng.randint(60, 95),
+            "explanation": "Commitment language found." if actionable else "No commitments or assignments."
+        }
+
+    def respond(self, input_text: str) -> str:
+        """
+        Builds the response to a prompt, without latency, errors or rate limits.
+        Prompts that match no template (e.g. the warm-up call) get a plain "ok".
+        """
+        name, values = self._match_template(input_text)
+        if name is None:
+            return "ok"
+        # Confidences and summaries vary per prompt, but a given prompt always gets the same answer
+        rng = random.Random(hashlib.sha256(input_text.encode("utf-8")).hexdigest())
+
+        if name.startswith("clustering"):
+            # Topics are blocks of cluster_size consecutive chunk ids, so overlapping windows agree on them
+            topics: dict[int, list] = {}
+            for chunk_id in self._parse_chunk_ids(values["input_data"]):
+                topics.setdefault(int(chunk_id) // self.cluster_size, []).append(chunk_id)
+            response = {"segments": [
+                {
+                    "segment_id": segment_id,
+                    "topic_summary": f"Discussion of chunks {chunk_ids[0]} to {chunk_ids[-1]}",
+                    "chunk_ids": chunk_ids
+                }
+                for segment_id, chunk_ids in enumerate(topics.values(), start=1)
+            ]}
+        elif name.startswith("filtering_batch"):
+            response = {"results": [
+                {"segment_id": segment["segment_id"], **self._verdict(segment, rng)}
+                for segment in self._parse_segments(values["input_data"])
+            ]}
+        elif name.startswith("filtering"):
+            segments = self._parse_segments(values["input_data"])
+            response = self._verdict(segments[0] if segments else {"utterances": []}, rng)
+        else:
+            segments = self._parse_segments(values["segment_data"])
+            utterances = segments[0]["utterances"] if segments else []
+            fields = {
+                "assignees": lambda: self._assignees(utterances),
+                "deadlines": lambda: self._deadlines(utterances),
+                "priority": lambda: self._priority(utterances, rng),
+                "category": lambda: self._category(utterances, rng)
+            }
+            if name == "extraction_fused":
+                response = {field: build() for field, build in fields.items()}
+            else:
+                response = fields[name[len("extraction_"):]]()
+
+        return f"```json\n{json.dumps(response, indent=2)}\n```"
@@ -1,5 +1,6 @@
 import google.generativeai as genai
 from google.api_core.exceptions import ResourceExhausted, InternalServerError, ServiceUnavailable
+import asyncio
 import random
 import time
 from typing import Any
@@ -7,6 +8,8 @@ import os, sys
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 from src.models.base_model import BaseAIModel
+from src.utils.metrics import LLM_RETRIES
+from src.utils.tracing import span
 
 
 # TODO:
@@ -47,11 +50,34 @@ class GeminiAIModel(BaseAIModel):
     def process(self, input_text):
         for attempt in range(self.max_retries):
             try:
-                return self._call_model(input_text)
+                with span("llm.call", provider="Google", attempt=attempt + 1):
+                    return self._call_model(input_text)
             except (ResourceExhausted, InternalServerError, ServiceUnavailable) as e:
                 delay = self._exponential_backoff(attempt)
                 print(f"[GeminiModel][Retry {attempt+1}] Transient error: {e}. Retrying in {delay:.2f}s...")
-                time.sleep(delay)
+                LLM_RETRIES.inc(provider="Google")
+                with span("retry_backoff", attempt=attempt + 1, delay_seconds=round(delay, 3)):
+                    time.sleep(delay)
+            except Exception as e:
+                print(f"[GeminiModel] Fatal error: {e}")
+                break
+        raise RuntimeError("Gemini API failed after max retries.")
+
+    async def _acall_model(self, input_text: str) -> str:
+        response = await self.model.generate_content_async(input_text)
+        return response.text.strip()
+
+    async def aprocess(self, input_text):
+        for attempt in range(self.max_retries):
+            try:
+                with span("llm.call", provider="Google", attempt=attempt + 1):
+                    return await self._acall_model(input_text)
+            except (ResourceExhausted, InternalServerError, ServiceUnavailable) as e:
+                delay = self._exponential_backoff(attempt)
+                print(f"[GeminiModel][Retry {attempt+1}] Transient error: {e}. Retrying in {delay:.2f}s...")
+                LLM_RETRIES.inc(provider="Google")
+                with span("retry_backoff", attempt=attempt + 1, delay_seconds=round(delay, 3)):
+                    await asyncio.sleep(delay)
             except Exception as e:
                 print(f"[GeminiModel] Fatal error: {e}")
                 break
@@ -0,0 +1,78 @@
+import time
+from typing import Any
+import os, sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.models.base_model import BaseAIModel
+from src.utils.token_utils import estimate_tokens
+from src.utils.metrics import (
+    LLM_CALLS, LLM_CALL_DURATION, LLM_PROMPT_CHARS, LLM_RESPONSE_CHARS,
+    LLM_PROMPT_TOKENS, LLM_RESPONSE_TOKENS, LLM_COST
+)
+
+
+class InstrumentedAIModel(BaseAIModel):
+    """
+    Wraps another model and records call counts, latency, prompt/response sizes, estimated tokens
+    and estimated cost for every call, labelled with the model name.
+
+    Token counts are estimates (see token_utils), so the cost is an estimate too.
+    """
+
+    def __init__(self, model: BaseAIModel, config: dict[str, Any] = None):
+        super().__init__(config)
+        if not isinstance(model, BaseAIModel):
+            raise TypeError("model must be a BaseAIModel instance.")
+        self.model = model
+        self.prompt_cost_per_1k_tokens = self.config.get("prompt_cost_per_1k_tokens", 0.0)
+        self.response_cost_per_1k_tokens = self.config.get("response_cost_per_1k_tokens", 0.0)
+        for name in ("prompt_cost_per_1k_tokens", "response_cost_per_1k_tokens"):
+            value = getattr(self, name)
+            if not (isinstance(value, (int, float)) and value >= 0):
+                raise ValueError(f"{name} must be a non-negative number.")
+        self.model_label = model.get_info().get("model", "unknown")
+
+    def _record(self, input_text: str, response: str, duration: float, status: str) -> None:
+        LLM_CALLS.inc(model=self.model_label, status=status)
+        LLM_CALL_DURATION.observe(duration, model=self.model_label)
+
+        prompt_tokens = estimate_tokens(input_text)
+        LLM_PROMPT_CHARS.inc(len(input_text), model=self.model_label)
+        LLM_PROMPT_TOKENS.inc(prompt_tokens, model=self.model_label)
+        cost = prompt_tokens / 1000 * self.prompt_cost_per_1k_tokens
+
+        if response is not None:
+            response_tokens = estimate_tokens(response)
+            LLM_RESPONSE_CHARS.inc(len(response), model=self.model_label)
+            LLM_RESPONSE_TOKENS.inc(response_tokens, model=self.model_label)
+            cost += response_tokens / 1000 * self.response_cost_per_1k_tokens
+        LLM_COST.inc(cost, model=self.model_label)
+
+    def process(self, input_text: str) -> str:
+        start = time.perf_counter()
+        try:
+            response = self.model.process(input_text)
+        except Exception:
+            self._record(input_text, None, time.perf_counter() - start, "error")
+            raise
+        self._record(input_text, response, time.perf_counter() - start, "success")
+        return response
+
+    async def aprocess(self, input_text: str) -> str:
+        start = time.perf_counter()
+        try:
+            response = await self.model.aprocess(input_text)
+        except Exception:
+            self._record(input_text, None, time.perf_counter() - start, "error")
+            raise
+        self._record(input_text, response, time.perf_counter() - start, "success")
+        return response
+
+    def get_info(self):
+        return self.model.get_info()
+
+    def get_decoding_params(self) -> dict[str, Any]:
+        return self.model.get_decoding_params()
+
+    def invalidate(self, input_text: str) -> None:
+        self.model.invalidate(input_text)
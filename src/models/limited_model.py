@@ -0,0 +1,49 @@
+import asyncio
+import threading
+from typing import Any
+import os, sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.models.base_model import BaseAIModel
+
+
+class ConcurrencyLimitedAIModel(BaseAIModel):
+    """
+    Wraps another model and caps how many of its calls are in flight at once.
+
+    Every service holding this wrapper draws from the same limit, so pipelines sharing it form one
+    work queue: waiting calls are admitted first-come first-served as soon as a slot frees up.
+    """
+
+    def __init__(self, model: BaseAIModel, max_concurrency: int):
+        super().__init__(getattr(model, "config", None))
+        if not isinstance(model, BaseAIModel):
+            raise TypeError("model must be a BaseAIModel instance.")
+        if not isinstance(max_concurrency, int) or max_concurrency <= 0:
+            raise ValueError("max_concurrency must be a positive integer.")
+
+        self.model = model
+        self.max_concurrency = max_concurrency
+        # Sync callers (thread pools) and async callers (event loop) each get their own gate
+        self._thread_semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._async_semaphore = asyncio.Semaphore(max_concurrency)
+
+    def process(self, input_text: str) -> str:
+        with self._thread_semaphore:
+            return self.model.process(input_text)
+
+    async def aprocess(self, input_text: str) -> str:
+        async with self._async_semaphore:
+            return await self.model.aprocess(input_text)
+
+    def get_info(self):
+        return {
+            **self.model.get_info(),
+            "max_concurrency": str(self.max_concurrency)
+        }
+
+    def get_decoding_params(self) -> dict[str, Any]:
+        return self.model.get_decoding_params()
+
+    def invalidate(self, input_text: str) -> None:
+        self.model.invalidate(input_text)
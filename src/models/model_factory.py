@@ -6,6 +6,9 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.
 from src.models.base_model import BaseAIModel
 from src.models.gemini_model import GeminiAIModel
 from src.models.openai_model import OpenAIAIModel
+from src.models.fake_model import FakeAIModel
+from src.models.cached_model import CachedAIModel
+from src.models.instrumented_model import InstrumentedAIModel
 
 class AIModelFactory:
     """Factory to create AI models"""
@@ -13,16 +16,27 @@ class AIModelFactory:
     _models = {
         "gemini": GeminiAIModel,
         "openai": OpenAIAIModel,
+        "fake": FakeAIModel,  # deterministic offline model for benchmarks
     }
 
     @classmethod
-    def create_model(cls, model_type: str, config: dict[str, Any] = None) -> BaseAIModel:
-        """Create AI model instance"""
+    def create_model(cls, model_type: str, config: dict[str, Any] = None, cache_config: dict[str, Any] = None,
+                     metrics_config: dict[str, Any] = None) -> BaseAIModel:
+        """
+        Create AI model instance, instrumented with call metrics when metrics_config enables it,
+        and wrapped in a persistent response cache when cache_config enables it
+        """
         key = model_type.strip().lower()
         if key not in cls._models:
             raise ValueError(f"Unknown model type: {model_type}. Available: {list(cls._models.keys())}")
         
-        return cls._models[key](config)
+        model = cls._models[key](config)
+        # Instrument inside the cache, so call metrics only count real provider calls
+        if metrics_config and metrics_config.get("enabled"):
+            model = InstrumentedAIModel(model, metrics_config)
+        if cache_config and cache_config.get("enabled"):
+            model = CachedAIModel(model, cache_config)
+        return model
 
     @classmethod
     def get_available_models(cls) -> list:
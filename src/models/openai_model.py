@@ -1,5 +1,6 @@
 import openai
 from openai import OpenAIError, RateLimitError, APIError
+import asyncio
 import random
 import time
 from typing import Any
@@ -7,6 +8,8 @@ import os, sys
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 from src.models.base_model import BaseAIModel
+from src.utils.metrics import LLM_RETRIES
+from src.utils.tracing import span
 
 
 class OpenAIAIModel(BaseAIModel):
@@ -17,6 +20,7 @@ class OpenAIAIModel(BaseAIModel):
         self.max_retries = self.config.get("max_retries", 5)
         self.base_delay = self.config.get("base_delay", 1.0)
         self.max_delay = self.config.get("max_delay", 10.0)
+        self.temperature = self.config.get("temperature", 0.7)
 
         if not self.api_key or not isinstance(self.api_key, str):
             raise ValueError("Missing or invalid API key.")
@@ -28,8 +32,11 @@ class OpenAIAIModel(BaseAIModel):
             raise ValueError("base_delay must be a non-negative number.")
         if not (isinstance(self.max_delay, (int, float)) and self.max_delay > self.base_delay):
             raise ValueError("max_delay must be greater than base_delay.")
+        if not (isinstance(self.temperature, (int, float)) and 0 <= self.temperature <= 2):
+            raise ValueError("temperature must be a number between 0 and 2.")
 
         openai.api_key = self.api_key
+        self.async_client = openai.AsyncOpenAI(api_key=self.api_key)
 
     def _exponential_backoff(self, attempt: int) -> float:
         delay = min(self.base_delay * (2 ** attempt), self.max_delay)
@@ -40,18 +47,45 @@ class OpenAIAIModel(BaseAIModel):
         response = openai.chat.completions.create(
             model=self.model_name,
             messages=[{"role": "user", "content": input_text}],
-            temperature=0.7,
+            temperature=self.temperature,
         )
         return response.choices[0].message.content.strip()
 
     def process(self, input_text: str) -> str:
         for attempt in range(self.max_retries):
             try:
-                return self._call_model(input_text)
+                with span("llm.call", provider="OpenAI", attempt=attempt + 1):
+                    return self._call_model(input_text)
             except (RateLimitError, APIError, OpenAIError) as e:
                 delay = self._exponential_backoff(attempt)
                 print(f"[OpenAIModel][Retry {attempt+1}] Transient error: {e}. Retrying in {delay:.2f}s...")
-                time.sleep(delay)
+                LLM_RETRIES.inc(provider="OpenAI")
+                with span("retry_backoff", attempt=attempt + 1, delay_seconds=round(delay, 3)):
+                    time.sleep(delay)
+            except Exception as e:
+                print(f"[OpenAIModel] Fatal error: {e}")
+                break
+        raise RuntimeError("OpenAI API failed after max retries.")
+
+    async def _acall_model(self, input_text: str) -> str:
+        response = await self.async_client.chat.completions.create(
+            model=self.model_name,
+            messages=[{"role": "user", "content": input_text}],
+            temperature=self.temperature,
+        )
+        return response.choices[0].message.content.strip()
+
+    async def aprocess(self, input_text: str) -> str:
+        for attempt in range(self.max_retries):
+            try:
+                with span("llm.call", provider="OpenAI", attempt=attempt + 1):
+                    return await self._acall_model(input_text)
+            except (RateLimitError, APIError, OpenAIError) as e:
+                delay = self._exponential_backoff(attempt)
+                print(f"[OpenAIModel][Retry {attempt+1}] Transient error: {e}. Retrying in {delay:.2f}s...")
+                LLM_RETRIES.inc(provider="OpenAI")
+                with span("retry_backoff", attempt=attempt + 1, delay_seconds=round(delay, 3)):
+                    await asyncio.sleep(delay)
             except Exception as e:
                 print(f"[OpenAIModel] Fatal error: {e}")
                 break
@@ -64,6 +98,9 @@ class OpenAIAIModel(BaseAIModel):
             "description": "OpenAI model via Chat Completion API"
         }
 
+    def get_decoding_params(self):
+        return {"temperature": self.temperature}
+
 
 if __name__ == "__main__":
     from dotenv import load_dotenv
@@ -1,69 +1,286 @@
+import io
+import mmap
 import re
+from itertools import chain
+from typing import IO, Iterable, Iterator, Optional, Union
+import os, sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.utils.chunk_store import ChunkStore
+from src.services.transcript_parsers import TranscriptParserRegistry, Utterance
+
+# A transcript as text, as bytes or a memory map of its file (UTF-8), or as an open file object
+TranscriptSource = Union[str, bytes, bytearray, mmap.mmap, IO]
+
 
 class ChunkingService:
     def __init__(self):
-        self._pattern = r"\[\d{1,2}:\d{2} (?:AM|PM)\] ([^:]+):"
-        
-    def transcript_to_chunks(self, raw_text: str, start_marker=None, end_marker=None) -> list[dict]:
+        # Bracketed format: `[H:MM AM] Speaker:`, group 1 is the time and group 2 the speaker
+        self._pattern = r"\[(\d{1,2}:\d{2} (?:AM|PM))\] ([^:]+):"
+        self._text_regex = re.compile(self._pattern)
+        self._bytes_regex = re.compile(self._pattern.encode("ascii"))
+
+    def transcript_to_chunks(self, raw_text: TranscriptSource, start_marker=None, end_marker=None,
+                             transcript_format: Optional[str] = None) -> list[dict]:
         """
         Parse a transcript into structured chunks with metadata.
-        
+
         Args:
-            raw_text (str): The raw transcript text
+            raw_text: The raw transcript text (or any source accepted by iter_chunks)
             start_marker (str, optional): Marker to indicate where parsing should start
             end_marker (str, optional): Marker to indicate where parsing should end
-            
+            transcript_format (str, optional): Format name (see detect_format), detected when omitted
+
         Returns:
             list of dict: Each dict includes 'id', 'order', and 'context'
         """
-        if not (raw_text and isinstance(raw_text, str)):
+        return list(self.iter_chunks(raw_text, start_marker, end_marker, transcript_format))
+
+    def transcript_to_store(self, source: TranscriptSource, start_marker: Optional[str] = None,
+                            end_marker: Optional[str] = None, transcript_format: Optional[str] = None) -> ChunkStore:
+        """
+        Parses a transcript into a ChunkStore: the same chunks as transcript_to_chunks, with speaker
+        names interned and no per-chunk dict or content string kept in memory.
+        The store also keeps the start and end time of each chunk, when the format has them.
+
+        Raises:
+            ValueError: as iter_chunks
+        """
+        store = ChunkStore()
+        self.append_to_store(store, source, start_marker, end_marker, transcript_format)
+        return store
+
+    def append_to_store(self, store: ChunkStore, source: TranscriptSource, start_marker: Optional[str] = None,
+                        end_marker: Optional[str] = None, transcript_format: Optional[str] = None) -> range:
+        """
+        Parses more of a transcript (e.g. the latest utterances of a live meeting) into an existing store.
+        Only `source` is parsed, the chunks already in the store are left as they are.
+
+        Returns:
+            The ids of the new chunks
+        """
+        first_id = len(store)
+        for speaker, utterance, start, end in self._iter_utterances(source, start_marker, end_marker, transcript_format):
+            store.append(speaker, utterance, start, end)
+        return range(first_id, len(store))
+
+    def iter_chunks(self, source: TranscriptSource, start_marker: Optional[str] = None,
+                    end_marker: Optional[str] = None, transcript_format: Optional[str] = None) -> Iterator[dict]:
+        """
+        Yields the chunks of a transcript one at a time, in order.
+
+        The format is detected from the beginning of the transcript unless given: the bracketed
+        `[H:MM AM] Speaker:` format, or one of the TranscriptParserRegistry formats (WebVTT, SRT,
+        Zoom and Teams text exports). The markers only apply to the bracketed format, the other
+        formats are whole-file exports without a header to skip.
+
+        Strings, bytes and memory maps are scanned in place: the markers only bound the regex search
+        (no slicing of the transcript), and only the current utterance is copied out. Files backed by
+        a descriptor are memory-mapped, other file objects (e.g. a pipe or StringIO) are read line by line.
+        Memory therefore stays proportional to one utterance plus what the caller keeps.
+
+        Raises:
+            ValueError: on empty input, a non-string marker, a marker that is not found, or an unknown format
+        """
+        utterances = self._iter_utterances(source, start_marker, end_marker, transcript_format)
+        for index, (speaker, utterance, _, _) in enumerate(utterances):
+            yield {
+                "id": index,
+                "order": index,
+                "content": f"{speaker}: {utterance}"
+            }
+
+    def detect_format(self, head: str) -> str:
+        """Name of the format of a transcript, from its first TranscriptParserRegistry.HEAD_SIZE characters."""
+        return TranscriptParserRegistry.detect_format(head, self._text_regex)
+
+    def _iter_utterances(self, source: TranscriptSource, start_marker: Optional[str], end_marker: Optional[str],
+                         transcript_format: Optional[str] = None) -> Iterator[Utterance]:
+        """Yields the normalized utterances of a transcript, validating the input as iter_chunks."""
+        if start_marker and not isinstance(start_marker, str):
+            raise ValueError("Start marker must be a string.")
+        if end_marker and not isinstance(end_marker, str):
+            raise ValueError("End marker must be a string.")
+        if transcript_format is not None:
+            transcript_format = transcript_format.strip().lower()
+            if transcript_format != TranscriptParserRegistry.DEFAULT_FORMAT:
+                # Fail on an unknown format before reading anything
+                TranscriptParserRegistry.get_parser(transcript_format)
+
+        if isinstance(source, str):
+            if not source:
+                raise ValueError("Input text must be a non empty string.")
+            yield from self._iter_buffer_utterances(source, start_marker, end_marker, transcript_format)
+        elif isinstance(source, (bytes, bytearray, mmap.mmap)):
+            if not len(source):
+                raise ValueError("Input text must be a non empty string.")
+            yield from self._iter_buffer_utterances(source, start_marker, end_marker, transcript_format)
+        elif hasattr(source, "read"):
+            yield from self._iter_file_utterances(source, start_marker, end_marker, transcript_format)
+        else:
             raise ValueError("Input text must be a non empty string.")
 
+    def _normalize(self, speaker: str, utterance: str, start: Optional[float] = None,
+                   end: Optional[float] = None) -> Utterance:
+        return speaker.strip(), utterance.strip().replace('\n', ' '), start, end
+
+    def _clock_seconds(self, time: str) -> float:
+        """Seconds since midnight of a bracketed `H:MM AM` timestamp."""
+        clock, suffix = time.split(" ")
+        hours, minutes = clock.split(":")
+        return ((int(hours) % 12 + (12 if suffix == "PM" else 0)) * 60 + int(minutes)) * 60
+
+    def _iter_parsed_utterances(self, transcript_format: str, lines: Iterable) -> Iterator[Utterance]:
+        """Runs a registry parser over text or byte lines (bytes are decoded as UTF-8)."""
+        decoded = (line.decode("utf-8", errors="replace") if isinstance(line, bytes) else line for line in lines)
+        for speaker, utterance, start, end in TranscriptParserRegistry.get_parser(transcript_format).iter_utterances(decoded):
+            yield self._normalize(speaker, utterance, start, end)
+
+    def _iter_buffer_utterances(self, buffer: Union[str, bytes, bytearray, mmap.mmap], start_marker: Optional[str],
+                                end_marker: Optional[str], transcript_format: Optional[str] = None) -> Iterator[Utterance]:
+        """
+        Scans a string or byte buffer between the markers, without copying it.
+        Other formats than the bracketed one are handed to their parser line by line.
+        """
+        is_text = isinstance(buffer, str)
+        if transcript_format is None:
+            head = TranscriptParserRegistry.HEAD_SIZE
+            transcript_format = self.detect_format(buffer[:head] if is_text else bytes(buffer[:head]).decode("utf-8", errors="ignore"))
+        if transcript_format != TranscriptParserRegistry.DEFAULT_FORMAT:
+            if is_text:
+                lines = io.StringIO(buffer)
+            elif isinstance(buffer, mmap.mmap):
+                buffer.seek(0)
+                lines = iter(buffer.readline, b"")
+            else:
+                lines = io.BytesIO(buffer)
+            yield from self._iter_parsed_utterances(transcript_format, lines)
+            return
+
+        regex = self._text_regex if is_text else self._bytes_regex
+
+        def encode(marker: str):
+            return marker if is_text else marker.encode("utf-8")
+
+        def decode(value) -> str:
+            return value if is_text else bytes(value).decode("utf-8", errors="replace")
+
+        start, end = 0, len(buffer)
         if start_marker:
-            if not isinstance(start_marker, str):
-                raise ValueError("Start marker must be a string.")
-            start_idx = raw_text.find(start_marker)
+            start_idx = buffer.find(encode(start_marker))
             if start_idx == -1:
                 raise ValueError(f"Start marker '{start_marker}' not found.")
-            raw_text = raw_text[start_idx + len(start_marker):]
-        
+            start = start_idx + len(encode(start_marker))
         if end_marker:
-            if not isinstance(end_marker, str):
-                raise ValueError("End marker must be a string.")
-            end_idx = raw_text.find(end_marker)
+            end_idx = buffer.find(encode(end_marker), start)
             if end_idx == -1:
                 raise ValueError(f"End marker '{end_marker}' not found.")
-            raw_text = raw_text[:end_idx]
-        
-        matches = list(re.finditer(self._pattern, raw_text))
-        chunks = []
-
-        for i, match in enumerate(matches):
-            start = match.end()
-            end = matches[i + 1].start() if i + 1 < len(matches) else len(raw_text)
-            speaker = match.group(1).strip()
-            utterance = raw_text[start:end].strip().replace('\n', ' ')
-            chunk_text = f"{speaker}: {utterance}"
-
-            chunk = {
-                "id": i,
-                "order": i,
-                "content": chunk_text
-            }
-            chunks.append(chunk)
-        
-        return chunks
+            end = end_idx
+
+        # Each utterance ends where the next timestamp starts, so a match is only yielded once the next one is found
+        previous = None
+        for match in regex.finditer(buffer, start, end):
+            if previous is not None:
+                yield self._normalize(decode(previous.group(2)), decode(buffer[previous.end():match.start()]),
+                                      self._clock_seconds(decode(previous.group(1))))
+            previous = match
+        if previous is not None:
+            yield self._normalize(decode(previous.group(2)), decode(buffer[previous.end():end]),
+                                  self._clock_seconds(decode(previous.group(1))))
+
+    def _iter_file_utterances(self, file: IO, start_marker: Optional[str], end_marker: Optional[str],
+                              transcript_format: Optional[str] = None) -> Iterator[Utterance]:
+        """Memory-maps a file when it has a descriptor, otherwise parses it line by line."""
+        try:
+            fileno = file.fileno()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            fileno = None
+
+        if fileno is not None:
+            try:
+                mapped = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped
+                raise ValueError("Input text must be a non empty string.")
+            with mapped:
+                yield from self._iter_buffer_utterances(mapped, start_marker, end_marker, transcript_format)
+            return
+
+        lines = iter(file)
+        if transcript_format is None:
+            # Detect on the first lines, then parse them followed by the rest of the stream
+            head_lines, head_size = [], 0
+            for line in lines:
+                head_lines.append(line)
+                head_size += len(line)
+                if head_size >= TranscriptParserRegistry.HEAD_SIZE:
+                    break
+            if not head_size:
+                raise ValueError("Input text must be a non empty string.")
+            head = "".join(line.decode("utf-8", errors="ignore") if isinstance(line, bytes) else line for line in head_lines)
+            transcript_format = self.detect_format(head)
+            lines = chain(head_lines, lines)
+
+        if transcript_format != TranscriptParserRegistry.DEFAULT_FORMAT:
+            yield from self._iter_parsed_utterances(transcript_format, lines)
+            return
+        yield from self._iter_line_utterances(lines, start_marker, end_marker)
+
+    def _iter_line_utterances(self, lines: Iterable, start_marker: Optional[str],
+                              end_marker: Optional[str]) -> Iterator[Utterance]:
+        """
+        Streams the lines of a file object that cannot be memory-mapped. Speaker names must fit
+        on the line of their timestamp, which every supported transcript does.
+        """
+        started = not start_marker
+        ended = False
+        seen_input = False
+        speaker = time = None
+        parts: list[str] = []
+
+        for line in lines:
+            if isinstance(line, bytes):
+                line = line.decode("utf-8", errors="replace")
+            seen_input = seen_input or bool(line)
+            if not started:
+                position = line.find(start_marker)
+                if position == -1:
+                    continue
+                started = True
+                line = line[position + len(start_marker):]
+            if end_marker:
+                position = line.find(end_marker)
+                if position != -1:
+                    line = line[:position]
+                    ended = True
+
+            cursor = 0
+            for match in self._text_regex.finditer(line):
+                if speaker is not None:
+                    parts.append(line[cursor:match.start()])
+                    yield self._normalize(speaker, "".join(parts), self._clock_seconds(time))
+                time, speaker, parts, cursor = match.group(1), match.group(2), [], match.end()
+            if speaker is not None:
+                parts.append(line[cursor:])
+            if ended:
+                break
+
+        if not seen_input:
+            raise ValueError("Input text must be a non empty string.")
+        if not started:
+            raise ValueError(f"Start marker '{start_marker}' not found.")
+        if end_marker and not ended:
+            raise ValueError(f"End marker '{end_marker}' not found.")
+        if speaker is not None:
+            yield self._normalize(speaker, "".join(parts), self._clock_seconds(time))
 
 
 if __name__ == "__main__":
-    import os, sys
     from pprint import pprint
-    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
     filepath = "data/transcript.txt"
-    with open(filepath,'r') as file:
-        raw_text = file.read()
-
     parser = ChunkingService()
-    chunks = parser.transcript_to_chunks(raw_text, start_marker="TRANSCRIPT:", end_marker="[END TRANSCRIPT")
+    # The file is memory-mapped and parsed lazily, without being read into a string
+    with open(filepath, 'rb') as file:
+        chunks = parser.transcript_to_chunks(file, start_marker="TRANSCRIPT:", end_marker="[END TRANSCRIPT")
     pprint(chunks)
@@ -1,36 +1,38 @@
 import os, sys
 import re
 import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Any
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 from src.models.base_model import BaseAIModel
-import paths
+from src.utils.token_utils import estimate_tokens
+from src.utils.metrics import FALLBACKS
+from src.utils.tracing import propagate, span
+from src.utils.prompt_registry import PromptRegistry, get_prompt_registry
+from src.utils.prompt_encoding import encode_chunks, validate_encoding
+from src.utils.chunk_store import ChunkSlice, ChunkStore
 
 
 class ClusteringService:
-    def __init__(self):
-        self._prompt_template_filepath = paths.CLUSTERING_SERVICE_PROMPT
+    def __init__(self, prompt_registry: PromptRegistry = None, prompt_encoding: str = "json"):
+        validate_encoding(prompt_encoding)
+        self._prompts = prompt_registry or get_prompt_registry()
+        self.prompt_encoding = prompt_encoding
+        self._prompt_name = "clustering_compact" if prompt_encoding == "compact" else "clustering"
 
-    def _load_prompt_template(self, filepath: str) -> str:
-        """Loads the prompt template from a file."""
-        try:
-            with open(filepath, 'r') as file:
-                prompt = file.read()
-            if not prompt.strip():
-                raise ValueError("Prompt cannot be empty.")
-            return prompt
-        except Exception:
-            raise ValueError("Problem occurred while loading system prompt.")
+    def _prompt_chunks(self, chunks: list[dict]) -> list[dict]:
+        """
+        Drops the source_ids bookkeeping of compressed chunks, the model only needs id, order and content.
+        """
+        return [{key: value for key, value in chunk.items() if key != "source_ids"} for chunk in chunks]
 
     def _prep_prompt(self, chunks: list[dict]) -> str:
         """
-        Injects JSON-serialized chunks into the prompt template.
-
-        Replaces 'content' key with 'content' to match prompt expectations.
+        Injects the serialized chunks (JSON or compact lines, per prompt_encoding) into the prompt template.
         """
-        prompt_template = self._load_prompt_template(filepath=self._prompt_template_filepath)
-        return prompt_template.format(input_data=json.dumps(chunks, indent=2))
+        return self._prompts.format(self._prompt_name, input_data=encode_chunks(self._prompt_chunks(chunks), self.prompt_encoding))
 
     def _extract_json_from_text(self, text: str) -> Optional[dict]:
         """
@@ -51,19 +53,40 @@ class ClusteringService:
     def enrich_segments_with_chunks(
         self,
         segments: dict[str, list[dict[str, Any]]],
-        chunks: list[dict[str, Any]]
+        chunks: list[dict[str, Any]],
+        source_chunks: list[dict[str, Any]] = None
     ) -> list[dict[str, Any]]:
         """
         Matches chunks to their segments based on chunk_ids and returns enriched segments.
+
+        When the chunks were compressed (CompressionService), pass the original chunks as source_chunks:
+        each compressed chunk is then replaced by the original chunks listed in its source_ids.
+
+        When the chunks the segments end up with come from a ChunkStore (or a ChunkSlice of one), segments
+        hold a ChunkSlice view of them instead of a list of chunk dicts, so no chunk is copied into the segments.
         """
-        chunk_map = {chunk["id"]: chunk for chunk in chunks}
+        chunk_map = None if isinstance(chunks, (ChunkStore, ChunkSlice)) else {chunk["id"]: chunk for chunk in chunks}
+        source_map = None
+        if source_chunks is not None and not isinstance(source_chunks, (ChunkStore, ChunkSlice)):
+            source_map = {chunk["id"]: chunk for chunk in source_chunks}
 
         enriched_segments = []
 
         for segment in segments.get("segments", []):
-            matched_chunks = [
-                chunk_map[cid] for cid in segment.get("chunk_ids", []) if cid in chunk_map
-            ]
+            if chunk_map is None:
+                matched_chunks = chunks.view(cid for cid in segment.get("chunk_ids", []) if chunks.has_id(cid))
+            else:
+                matched_chunks = [chunk_map[cid] for cid in segment.get("chunk_ids", []) if cid in chunk_map]
+            if source_chunks is not None:
+                source_ids = [
+                    source_id
+                    for chunk in matched_chunks
+                    for source_id in chunk.get("source_ids", [chunk["id"]])
+                ]
+                if source_map is None:
+                    matched_chunks = source_chunks.view(source_id for source_id in source_ids if source_chunks.has_id(source_id))
+                else:
+                    matched_chunks = [source_map[source_id] for source_id in source_ids if source_id in source_map]
             enriched_segments.append({
                 "segment_id": segment["segment_id"],
                 "topic_summary": segment["topic_summary"],
@@ -72,22 +95,234 @@ class ClusteringService:
 
         return enriched_segments
 
-    def chunks_to_segments(self, chunks: list[dict], model: BaseAIModel) -> list[dict[str, Any]]:
+    def _parse_segments_response(self, response: str, chunks: list[dict], source_chunks: list[dict] = None) -> list[dict[str, Any]]:
         """
-        Sends chunks to the LLM to receive topic-based segments, and enriches them with chunk data.
+        Parses the clustering response and enriches the segments with chunk data.
+        """
+        json_response = self._extract_json_from_text(response)
+        if not json_response:
+            raise ValueError("Model returned invalid JSON format.")
+
+        return self.enrich_segments_with_chunks(json_response, chunks, source_chunks)
+
+    def _parse_window_response(self, response: str) -> list[dict[str, Any]]:
+        """
+        Parses a window's clustering response into raw segments (topic summary and chunk ids).
+        """
+        json_response = self._extract_json_from_text(response)
+        if not json_response or not isinstance(json_response.get("segments"), list):
+            raise ValueError("Model returned invalid JSON format.")
+
+        return [
+            {"topic_summary": segment.get("topic_summary", ""), "chunk_ids": list(segment.get("chunk_ids", []))}
+            for segment in json_response["segments"]
+            if isinstance(segment, dict)
+        ]
+
+    def _fallback_window_segments(self, window_chunks: list[dict], error: Exception) -> list[dict[str, Any]]:
+        """
+        Logs a window failure and keeps its chunks together in a single segment, so one bad window does not fail the run.
+        """
+        print(f"[ClusteringService] Window of chunks {window_chunks[0]['id']}-{window_chunks[-1]['id']} failed, kept as one segment: {error}")
+        FALLBACKS.inc(component="clustering", reason="window_unclustered")
+        return [{
+            "topic_summary": "Unclustered discussion",
+            "chunk_ids": [chunk["id"] for chunk in window_chunks],
+            "fallback": True
+        }]
+
+    def _build_windows(self, chunks: list[dict], token_budget: int, overlap: int) -> list[tuple[int, int]]:
+        """
+        Splits the chunk list into windows of consecutive chunks whose serialized size stays within the token budget.
+        Each window repeats the last `overlap` chunks of the previous one, so topics crossing a boundary are seen whole by one window.
+
+        Returns:
+            (start, end) chunk positions of each window, end exclusive
+        """
+        chunk_tokens = [estimate_tokens(encode_chunks(self._prompt_chunks([chunk]), self.prompt_encoding)) for chunk in chunks]
+        windows = []
+        start = 0
+
+        while start < len(chunks):
+            end = start
+            window_tokens = 0
+            # A chunk larger than the budget on its own still gets a window
+            while end < len(chunks) and (end == start or window_tokens + chunk_tokens[end] <= token_budget):
+                window_tokens += chunk_tokens[end]
+                end += 1
+            windows.append((start, end))
+            if end == len(chunks):
+                break
+            # Always move forward by at least one chunk, even when the window is smaller than the overlap
+            start = max(end - overlap, start + 1)
+
+        return windows
+
+    def _merge_window_segments(self, chunks: list[dict], windows: list[tuple[int, int]],
+                               window_segments: list[list[dict[str, Any]]]) -> dict[str, list[dict[str, Any]]]:
+        """
+        Merges the segments of overlapping windows into one consistent segmentation.
+
+        A chunk in an overlap is owned by the window it is closest to the center of, and two segments of adjacent
+        windows that put the same overlap chunk in them describe the same topic and are merged. The result has
+        sequential segment ids in chronological order, and each chunk id appears in at most one segment.
+        """
+        positions = {chunk["id"]: position for position, chunk in enumerate(chunks)}
+
+        # Core range of each window: the overlap with the next window is split at its midpoint
+        core_ranges = []
+        core_start = 0
+        for index, (start, end) in enumerate(windows):
+            core_end = (windows[index + 1][0] + end) // 2 if index + 1 < len(windows) else len(chunks)
+            core_ranges.append((core_start, core_end))
+            core_start = core_end
+
+        # Union-find over (window index, segment index)
+        parents = {}
+
+        def find(node):
+            while parents.setdefault(node, node) != node:
+                node = parents[node]
+            return node
+
+        for index in range(len(windows) - 1):
+            overlap_ids = {chunk["id"] for chunk in chunks[windows[index + 1][0]:windows[index][1]]}
+            for left_index, left in enumerate(window_segments[index]):
+                for right_index, right in enumerate(window_segments[index + 1]):
+                    if left.get("fallback") or right.get("fallback"):
+                        continue
+                    if overlap_ids & set(left["chunk_ids"]) & set(right["chunk_ids"]):
+                        parents[find((index + 1, right_index))] = find((index, left_index))
+
+        groups = {}
+        assigned_ids = set()
+        for index, segments in enumerate(window_segments):
+            core_start, core_end = core_ranges[index]
+            for segment_index, segment in enumerate(segments):
+                owned_ids = [
+                    chunk_id for chunk_id in segment["chunk_ids"]
+                    if chunk_id in positions and core_start <= positions[chunk_id] < core_end and chunk_id not in assigned_ids
+                ]
+                assigned_ids.update(owned_ids)
+                group = groups.setdefault(find((index, segment_index)), {"chunk_ids": [], "topic_summary": "", "summary_weight": -1})
+                group["chunk_ids"].extend(owned_ids)
+                # The member segment that owns the most chunks names the merged topic
+                if len(owned_ids) > group["summary_weight"]:
+                    group["topic_summary"] = segment["topic_summary"]
+                    group["summary_weight"] = len(owned_ids)
+
+        merged_groups = sorted(
+            (group for group in groups.values() if group["chunk_ids"]),
+            key=lambda group: min(positions[chunk_id] for chunk_id in group["chunk_ids"])
+        )
+        return {
+            "segments": [
+                {
+                    "segment_id": segment_id,
+                    "topic_summary": group["topic_summary"],
+                    "chunk_ids": sorted(group["chunk_ids"], key=positions.get)
+                }
+                for segment_id, group in enumerate(merged_groups, start=1)
+            ]
+        }
+
+    def _validate_window_options(self, window_token_budget: Optional[int], window_overlap: int) -> None:
+        if window_token_budget is not None and (not isinstance(window_token_budget, int) or window_token_budget <= 0):
+            raise ValueError("window_token_budget must be a positive integer.")
+        if not isinstance(window_overlap, int) or window_overlap < 0:
+            raise ValueError("window_overlap must be a non-negative integer.")
+
+    def _parse_or_invalidate(self, model: BaseAIModel, prompt: str, parse):
+        """
+        Runs parse() on a model response. A response that fails to parse is invalidated in the model's
+        response cache, so clustering the same chunks again asks the model instead of replaying it.
         """
         try:
-            prompt = self._prep_prompt(chunks=chunks)
-            response = model.process(prompt)
-            json_response = self._extract_json_from_text(response)
-            if not json_response:
-                raise ValueError("Model returned invalid JSON format.")
+            return parse()
+        except Exception:
+            model.invalidate(prompt)
+            raise
+
+    def _cluster_window(self, window_chunks: list[dict], model: BaseAIModel) -> list[dict[str, Any]]:
+        with span("clustering.window", first_chunk_id=window_chunks[0]["id"], chunks=len(window_chunks)) as window_span:
+            try:
+                prompt = self._prep_prompt(chunks=window_chunks)
+                response = model.process(prompt)
+                return self._parse_or_invalidate(model, prompt, lambda: self._parse_window_response(response))
+            except Exception as e:
+                window_span.record_error(e)
+                return self._fallback_window_segments(window_chunks, e)
+
+    async def _acluster_window(self, window_chunks: list[dict], model: BaseAIModel) -> list[dict[str, Any]]:
+        with span("clustering.window", first_chunk_id=window_chunks[0]["id"], chunks=len(window_chunks)) as window_span:
+            try:
+                prompt = self._prep_prompt(chunks=window_chunks)
+                response = await model.aprocess(prompt)
+                return self._parse_or_invalidate(model, prompt, lambda: self._parse_window_response(response))
+            except Exception as e:
+                window_span.record_error(e)
+                return self._fallback_window_segments(window_chunks, e)
+
+    def chunks_to_segments(self, chunks: list[dict], model: BaseAIModel, max_workers: int = 1,
+                           window_token_budget: int = None, window_overlap: int = 0,
+                           source_chunks: list[dict] = None) -> list[dict[str, Any]]:
+        """
+        Sends chunks to the LLM to receive topic-based segments, and enriches them with chunk data.
+
+        With a window_token_budget, the chunks are split into overlapping windows clustered in parallel
+        (up to max_workers prompts in flight) and merged, so latency stays roughly flat as meetings grow
+        and a window with a bad response only loses its own clustering.
+
+        Pass the original chunks as source_chunks when `chunks` are compressed, so the segments carry the originals.
+        """
+        if not isinstance(max_workers, int) or max_workers <= 0:
+            raise ValueError("max_workers must be a positive integer.")
+        self._validate_window_options(window_token_budget, window_overlap)
+        if window_token_budget is None:
+            try:
+                prompt = self._prep_prompt(chunks=chunks)
+                response = model.process(prompt)
+                return self._parse_or_invalidate(model, prompt, lambda: self._parse_segments_response(response, chunks, source_chunks))
+            except Exception as e:
+                raise Exception("Problem occurred while prompting the model.") from e
+
+        if not chunks:
+            return []
+        windows = self._build_windows(chunks, window_token_budget, window_overlap)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # map returns results in submission order, so window_segments lines up with windows
+            window_segments = list(executor.map(propagate(lambda window: self._cluster_window(chunks[window[0]:window[1]], model)), windows))
+        return self.enrich_segments_with_chunks(self._merge_window_segments(chunks, windows, window_segments), chunks, source_chunks)
+
+    async def achunks_to_segments(self, chunks: list[dict], model: BaseAIModel, max_concurrency: int = 1,
+                                  window_token_budget: int = None, window_overlap: int = 0,
+                                  source_chunks: list[dict] = None) -> list[dict[str, Any]]:
+        """
+        Async variant of chunks_to_segments.
+        """
+        if not isinstance(max_concurrency, int) or max_concurrency <= 0:
+            raise ValueError("max_concurrency must be a positive integer.")
+        self._validate_window_options(window_token_budget, window_overlap)
+        if window_token_budget is None:
+            try:
+                prompt = self._prep_prompt(chunks=chunks)
+                response = await model.aprocess(prompt)
+                return self._parse_or_invalidate(model, prompt, lambda: self._parse_segments_response(response, chunks, source_chunks))
+            except Exception as e:
+                raise Exception("Problem occurred while prompting the model.") from e
+
+        if not chunks:
+            return []
+        windows = self._build_windows(chunks, window_token_budget, window_overlap)
+        semaphore = asyncio.Semaphore(max_concurrency)
 
-            enriched = self.enrich_segments_with_chunks(json_response, chunks)
-            return enriched
-        except Exception as e:
-            raise Exception("Problem occurred while prompting the model.") from e
+        async def cluster(window: tuple[int, int]) -> list[dict[str, Any]]:
+            async with semaphore:
+                return await self._acluster_window(chunks[window[0]:window[1]], model)
 
+        # gather returns results in submission order, so window_segments lines up with windows
+        window_segments = await asyncio.gather(*(cluster(window) for window in windows))
+        return self.enrich_segments_with_chunks(self._merge_window_segments(chunks, windows, window_segments), chunks, source_chunks)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,127 @@
+import re
+from typing import Any, Iterable
+
+
+# Words that carry no content on their own
+FILLER_WORDS = {"um", "umm", "uh", "uhh", "uhm", "er", "erm", "ah", "eh", "hm", "hmm", "mm", "like", "so", "well"}
+
+# Whole phrases that only acknowledge the previous turn
+ACKNOWLEDGEMENTS = {
+    "ok", "okay", "sure", "sure thing", "yes", "yeah", "yep", "right", "alright", "all right", "great",
+    "perfect", "good", "cool", "nice", "got it", "sounds good", "makes sense", "agreed", "thanks", "thank you"
+}
+
+
+class CompressionService:
+    """
+    Shrinks the chunk list before clustering without losing the link to the original utterances.
+
+    Consecutive turns by the same speaker are merged, filler-only utterances are folded into the
+    previous chunk, and a run of acknowledgements by different speakers is collapsed into one chunk
+    that keeps every acknowledging speaker. Each output chunk lists the original chunk ids it stands
+    for in `source_ids`, which ClusteringService uses to return the original chunks in its segments.
+    """
+
+    def _split_content(self, content: str) -> tuple[str, str]:
+        speaker, separator, text = content.partition(": ")
+        if not separator:
+            return "", content
+        return speaker, text
+
+    def _classify(self, text: str) -> str:
+        """
+        Returns "filler" for utterances made only of filler words, "ack" for acknowledgements, "content" otherwise.
+        """
+        phrases = [
+            " ".join(re.findall(r"[a-z']+", phrase.lower()))
+            for phrase in re.split(r"[.,!?;:\-]+", text)
+        ]
+        phrases = [phrase for phrase in phrases if phrase]
+        if not phrases:
+            return "filler"
+
+        words = [word for phrase in phrases for word in phrase.split()]
+        if all(word in FILLER_WORDS for word in words):
+            return "filler"
+
+        # "Okay, sounds good." is still an acknowledgement, fillers around it do not change that
+        if all(phrase in ACKNOWLEDGEMENTS or all(word in FILLER_WORDS for word in phrase.split()) for phrase in phrases):
+            return "ack"
+        return "content"
+
+    def compress_chunks(self, chunks: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Compresses chunks from ChunkingService.
+
+        Args:
+            chunks: Chunks with 'id', 'order' and 'content' ("Speaker: text"), e.g. ChunkingService.iter_chunks
+                    (they are consumed in a single pass)
+
+        Returns:
+            Compressed chunks with sequential 'id'/'order', merged 'content' and the
+            original chunk ids they cover in 'source_ids' (every original id appears exactly once)
+        """
+        merged = []  # working entries: speakers, texts, kind, source_ids
+        leading_fillers = []
+
+        for chunk in chunks:
+            speaker, text = self._split_content(chunk["content"])
+            kind = self._classify(text)
+            previous = merged[-1] if merged else None
+
+            if kind == "filler":
+                # Dropped from the text, but still owned by a chunk so segments keep full fidelity
+                if previous is None:
+                    leading_fillers.append(chunk)
+                else:
+                    previous["source_ids"].append(chunk["id"])
+                continue
+
+            if previous is not None and previous["speakers"] == [speaker]:
+                previous["texts"].append(text)
+                previous["source_ids"].append(chunk["id"])
+                if kind == "content":
+                    previous["kind"] = "content"
+                continue
+
+            if previous is not None and kind == "ack" and previous["kind"] == "ack":
+                if speaker not in previous["speakers"]:
+                    previous["speakers"].append(speaker)
+                previous["source_ids"].append(chunk["id"])
+                continue
+
+            merged.append({"speakers": [speaker], "texts": [text], "kind": kind, "source_ids": [chunk["id"]]})
+
+        if not merged:
+            # Nothing but filler: keep the chunks as they are
+            return [{**chunk, "source_ids": [chunk["id"]]} for chunk in leading_fillers]
+        merged[0]["source_ids"][:0] = [chunk["id"] for chunk in leading_fillers]
+
+        compressed_chunks = []
+        for index, entry in enumerate(merged):
+            speakers = ", ".join(speaker for speaker in entry["speakers"] if speaker)
+            text = " ".join(entry["texts"])
+            compressed_chunks.append({
+                "id": index,
+                "order": index,
+                "content": f"{speakers}: {text}" if speakers else text,
+                "source_ids": entry["source_ids"]
+            })
+
+        return compressed_chunks
+
+
+if __name__ == "__main__":
+    from pprint import pprint
+
+    example_chunks = [
+        {"id": 0, "order": 0, "content": "Alice: Let's review the launch plan."},
+        {"id": 1, "order": 1, "content": "Alice: John, can you prepare the marketing materials by Friday?"},
+        {"id": 2, "order": 2, "content": "John: Sure thing."},
+        {"id": 3, "order": 3, "content": "Bob: Sounds good."},
+        {"id": 4, "order": 4, "content": "Charlie: Um, uh..."},
+        {"id": 5, "order": 5, "content": "Bob: Okay."},
+        {"id": 6, "order": 6, "content": "Charlie: The campaign draft will be ready by Wednesday."}
+    ]
+
+    pprint(CompressionService().compress_chunks(example_chunks))
@@ -1,17 +1,20 @@
 import os, sys
-from typing import Any
+from typing import Any, Optional
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
 from src.services.extraction.base_extractor import BaseExtractor
 from src.models.base_model import BaseAIModel
-import paths
+from src.utils.prompt_registry import PromptRegistry
 
 
 class AssigneesExtractor(BaseExtractor):
     """Handles extraction of assignees from segments."""
+
+    name = "assignees"
+    depends_on = ()
     
-    def __init__(self):
-        super().__init__(paths.EXTRACTION_ASSIGNEES_PROMPT)
+    def __init__(self, prompt_registry: PromptRegistry = None, prompt_encoding: str = "json"):
+        super().__init__("extraction_assignees", prompt_registry, prompt_encoding)
     
     def extract(self, segment: dict[str, Any], model: BaseAIModel, previous_data: dict = None, debug: bool = False) -> dict[str, Any]:
         """
@@ -20,25 +23,32 @@ class AssigneesExtractor(BaseExtractor):
         try:
             prompt = self._prep_prompt(segment)
             response = model.process(prompt)
-            json_response = self._extract_json_from_text(response, "ASSIGNEES" if debug else "")
-            
-            if not json_response:
-                if debug:
-                    print(f"WARNING: Failed to extract assignees JSON, using defaults")
-                return self.get_default_values()
-            
-            # Validate expected structure
-            if "assignees" not in json_response:
-                if debug:
-                    print(f"WARNING: Assignees response missing 'assignees' key, using defaults")
-                return self.get_default_values()
-            
-            return json_response
+            return self._validate_model_response(response, prompt, model, debug)
             
         except Exception as e:
             if debug:
                 print(f"ERROR in assignees extraction: {str(e)}")
-            return self.get_default_values()
+            return self._fallback_values()
+    
+    def _is_usable(self, json_response: Optional[dict]) -> bool:
+        return bool(json_response) and "assignees" in json_response
+
+    def validate_response(self, json_response: Optional[dict], debug: bool = False) -> dict[str, Any]:
+        """
+        Validates the assignees JSON returned by the model, falling back to defaults when unusable.
+        """
+        if not json_response:
+            if debug:
+                print(f"WARNING: Failed to extract assignees JSON, using defaults")
+            return self._fallback_values()
+        
+        # Validate expected structure
+        if "assignees" not in json_response:
+            if debug:
+                print(f"WARNING: Assignees response missing 'assignees' key, using defaults")
+            return self._fallback_values()
+        
+        return json_response
     
     def get_default_values(self) -> dict[str, Any]:
         """Return default values when assignees extraction fails."""
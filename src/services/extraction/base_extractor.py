@@ -6,39 +6,40 @@ import json
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
 from src.models.base_model import BaseAIModel
+from src.utils.metrics import FALLBACKS
+from src.utils.prompt_registry import PromptRegistry, get_prompt_registry
+from src.utils.prompt_encoding import encode_data, encode_segment, validate_encoding
 
 
 class BaseExtractor(ABC):
     """Base class for all extractors with common functionality."""
+
+    # Name under which the extractor's output is made available to later extractors
+    name: str = ""
+    # Names of earlier extractors whose output must be injected into this extractor's prompt
+    depends_on: tuple[str, ...] = ()
     
-    def __init__(self, prompt_filepath: str):
-        self.prompt_filepath = prompt_filepath
+    def __init__(self, prompt_name: str, prompt_registry: PromptRegistry = None, prompt_encoding: str = "json"):
+        validate_encoding(prompt_encoding)
+        self.prompt_name = prompt_name
+        self._prompts = prompt_registry or get_prompt_registry()
+        self.prompt_encoding = prompt_encoding
     
-    def _load_prompt_template(self, filepath: str) -> str:
-        """Loads the prompt template from a file."""
-        try:
-            with open(filepath, 'r') as file:
-                prompt = file.read()
-            if not prompt.strip():
-                raise ValueError("Prompt cannot be empty.")
-            return prompt
-        except Exception:
-            raise ValueError(f"Problem occurred while loading prompt from {filepath}.")
-
     def _prep_prompt(self, segment: dict[str, Any], extracted_data: dict = None) -> str:
         """
-        Injects JSON-serialized segment and previous extraction results into the prompt template.
+        Injects the serialized segment and previous extraction results (JSON or compact, per prompt_encoding)
+        into the prompt template. The extraction templates describe the segment in prose, so both encodings share them.
         """
-        prompt_template = self._load_prompt_template(filepath=self.prompt_filepath)
-        
+        segment_data = encode_segment(segment, self.prompt_encoding)
         # For first prompt, only inject segment data
         if extracted_data is None:
-            return prompt_template.format(segment_data=json.dumps(segment, indent=2))
+            return self._prompts.format(self.prompt_name, segment_data=segment_data)
         else:
             # For subsequent prompts, inject both segment and previous extraction results
-            return prompt_template.format(
-                segment_data=json.dumps(segment, indent=2),
-                extracted_data=json.dumps(extracted_data, indent=2)
+            return self._prompts.format(
+                self.prompt_name,
+                segment_data=segment_data,
+                extracted_data=encode_data(extracted_data, self.prompt_encoding)
             )
 
     def _extract_json_from_text(self, text: str, debug_step: str = "") -> Optional[dict]:
@@ -105,6 +106,46 @@ class BaseExtractor(ABC):
         """Abstract method that each extractor must implement."""
         pass
 
+    async def aextract(self, segment: dict[str, Any], model: BaseAIModel, previous_data: dict = None, debug: bool = False) -> dict[str, Any]:
+        """
+        Async variant of extract: same prompt and validation, awaiting the model's async client.
+        """
+        try:
+            prompt = self._prep_prompt(segment, previous_data)
+            response = await model.aprocess(prompt)
+            return self._validate_model_response(response, prompt, model, debug)
+            
+        except Exception as e:
+            if debug:
+                print(f"ERROR in {self.name} extraction: {str(e)}")
+            return self._fallback_values()
+
+    @abstractmethod
+    def validate_response(self, json_response: Optional[dict], debug: bool = False) -> dict[str, Any]:
+        """Abstract method to validate a parsed model response, falling back to default values."""
+        pass
+
+    def _is_usable(self, json_response: Optional[dict]) -> bool:
+        """Whether validate_response can use the parsed response instead of falling back to defaults."""
+        return bool(json_response)
+
+    def _validate_model_response(self, response: str, prompt: str, model: BaseAIModel, debug: bool = False) -> dict[str, Any]:
+        """
+        Parses and validates a model response. An unusable response is invalidated in the model's
+        response cache, so the same prompt reaches the model again instead of replaying it.
+        """
+        json_response = self._extract_json_from_text(response, self.name.upper() if debug else "")
+        if not self._is_usable(json_response):
+            model.invalidate(prompt)
+        return self.validate_response(json_response, debug)
+
+    def _fallback_values(self) -> dict[str, Any]:
+        """
+        Counts a fallback of this extractor (failed call or unusable answer) and returns its default values.
+        """
+        FALLBACKS.inc(component="extraction", reason=f"default_{self.name}")
+        return self.get_default_values()
+
     @abstractmethod
     def get_default_values(self) -> dict[str, Any]:
         """Abstract method to return default values when extraction fails."""
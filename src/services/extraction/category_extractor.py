@@ -1,16 +1,19 @@
 import os, sys
-from typing import Any
+from typing import Any, Optional
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
 from src.services.extraction.base_extractor import BaseExtractor
 from src.models.base_model import BaseAIModel
-import paths
+from src.utils.prompt_registry import PromptRegistry
 
 class CategoryExtractor(BaseExtractor):
     """Handles extraction of category from segments."""
+
+    name = "category"
+    depends_on = ("assignees", "deadlines", "priority")
     
-    def __init__(self):
-        super().__init__(paths.EXTRACTION_CATEGORY_PROMPT)
+    def __init__(self, prompt_registry: PromptRegistry = None, prompt_encoding: str = "json"):
+        super().__init__("extraction_category", prompt_registry, prompt_encoding)
         self.valid_categories = ["Bug Fix", "Feature Development", "Research", "Documentation", "Meeting", "Other"]
     
     def extract(self, segment: dict[str, Any], model: BaseAIModel, previous_data: dict = None, debug: bool = False) -> dict[str, Any]:
@@ -20,29 +23,33 @@ class CategoryExtractor(BaseExtractor):
         try:
             prompt = self._prep_prompt(segment, previous_data)
             response = model.process(prompt)
-            json_response = self._extract_json_from_text(response, "CATEGORY" if debug else "")
-            
-            if not json_response:
-                if debug:
-                    print(f"WARNING: Failed to extract category JSON, using defaults")
-                return self.get_default_values()
-            
-            # Validate expected structure and values
-            if "category" not in json_response or json_response["category"] not in self.valid_categories:
-                json_response["category"] = "Other"
-            
-            if "confidence" not in json_response or not isinstance(json_response["confidence"], int):
-                json_response["confidence"] = 50
-            
-            if "reasoning" not in json_response:
-                json_response["reasoning"] = "Category assessment completed"
-            
-            return json_response
+            return self._validate_model_response(response, prompt, model, debug)
             
         except Exception as e:
             if debug:
                 print(f"ERROR in category extraction: {str(e)}")
-            return self.get_default_values()
+            return self._fallback_values()
+    
+    def validate_response(self, json_response: Optional[dict], debug: bool = False) -> dict[str, Any]:
+        """
+        Validates the category JSON returned by the model, falling back to defaults when unusable.
+        """
+        if not json_response:
+            if debug:
+                print(f"WARNING: Failed to extract category JSON, using defaults")
+            return self._fallback_values()
+        
+        # Validate expected structure and values
+        if "category" not in json_response or json_response["category"] not in self.valid_categories:
+            json_response["category"] = "Other"
+        
+        if "confidence" not in json_response or not isinstance(json_response["confidence"], int):
+            json_response["confidence"] = 50
+        
+        if "reasoning" not in json_response:
+            json_response["reasoning"] = "Category assessment completed"
+        
+        return json_response
     
     def get_default_values(self) -> dict[str, Any]:
         """Return default values when category extraction fails."""
@@ -1,17 +1,20 @@
 import os, sys
-from typing import Any
+from typing import Any, Optional
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
 from src.services.extraction.base_extractor import BaseExtractor
 from src.models.base_model import BaseAIModel
-import paths
+from src.utils.prompt_registry import PromptRegistry
 
 
 class DeadlinesExtractor(BaseExtractor):
     """Handles extraction of deadlines from segments."""
+
+    name = "deadlines"
+    depends_on = ("assignees",)
     
-    def __init__(self):
-        super().__init__(paths.EXTRACTION_DEADLINES_PROMPT)
+    def __init__(self, prompt_registry: PromptRegistry = None, prompt_encoding: str = "json"):
+        super().__init__("extraction_deadlines", prompt_registry, prompt_encoding)
     
     def extract(self, segment: dict[str, Any], model: BaseAIModel, previous_data: dict = None, debug: bool = False) -> dict[str, Any]:
         """
@@ -20,25 +23,29 @@ class DeadlinesExtractor(BaseExtractor):
         try:
             prompt = self._prep_prompt(segment, previous_data)
             response = model.process(prompt)
-            json_response = self._extract_json_from_text(response, "DEADLINES" if debug else "")
-            
-            if not json_response:
-                if debug:
-                    print(f"WARNING: Failed to extract deadlines JSON, using defaults")
-                return self.get_default_values()
-            
-            # Validate expected structure
-            if "deadlines" not in json_response:
-                json_response["deadlines"] = []
-            if "urgent_flags" not in json_response:
-                json_response["urgent_flags"] = []
-            
-            return json_response
+            return self._validate_model_response(response, prompt, model, debug)
             
         except Exception as e:
             if debug:
                 print(f"ERROR in deadlines extraction: {str(e)}")
-            return self.get_default_values()
+            return self._fallback_values()
+    
+    def validate_response(self, json_response: Optional[dict], debug: bool = False) -> dict[str, Any]:
+        """
+        Validates the deadlines JSON returned by the model, falling back to defaults when unusable.
+        """
+        if not json_response:
+            if debug:
+                print(f"WARNING: Failed to extract deadlines JSON, using defaults")
+            return self._fallback_values()
+        
+        # Validate expected structure
+        if "deadlines" not in json_response:
+            json_response["deadlines"] = []
+        if "urgent_flags" not in json_response:
+            json_response["urgent_flags"] = []
+        
+        return json_response
     
     def get_default_values(self) -> dict[str, Any]:
         """Return default values when deadlines extraction fails."""
@@ -0,0 +1,69 @@
+import os, sys
+from typing import Any, Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+from src.services.extraction.base_extractor import BaseExtractor
+from src.models.base_model import BaseAIModel
+from src.utils.prompt_registry import PromptRegistry
+
+
+class FusedExtractor(BaseExtractor):
+    """
+    Handles extraction of every field from segments with a single prompt.
+    The response is split per field and validated by the matching field extractor.
+    """
+
+    name = "fused"
+    depends_on = ()
+    
+    def __init__(self, field_extractors: list[BaseExtractor], prompt_registry: PromptRegistry = None,
+                 prompt_encoding: str = "json"):
+        super().__init__("extraction_fused", prompt_registry, prompt_encoding)
+        self.field_extractors = field_extractors
+    
+    def extract(self, segment: dict[str, Any], model: BaseAIModel, previous_data: dict = None, debug: bool = False) -> dict[str, dict]:
+        """
+        Extract all fields from the segment in one model call.
+
+        Returns:
+            Dictionary mapping each field extractor name to its validated output
+        """
+        try:
+            prompt = self._prep_prompt(segment)
+            response = model.process(prompt)
+            return self._validate_model_response(response, prompt, model, debug)
+            
+        except Exception as e:
+            if debug:
+                print(f"ERROR in fused extraction: {str(e)}")
+            return self._fallback_values()
+    
+    def _is_usable(self, json_response: Optional[dict]) -> bool:
+        # Every field must be usable too, a partial answer would otherwise be replayed with its fallbacks
+        return bool(json_response) and all(
+            isinstance(json_response.get(extractor.name), dict) and extractor._is_usable(json_response[extractor.name])
+            for extractor in self.field_extractors
+        )
+
+    def validate_response(self, json_response: Optional[dict], debug: bool = False) -> dict[str, dict]:
+        """
+        Validates each field of the fused JSON with its field extractor, so a bad field
+        falls back to its own defaults without discarding the others.
+        """
+        if not json_response:
+            if debug:
+                print(f"WARNING: Failed to extract fused JSON, using defaults")
+            return self._fallback_values()
+        
+        results = {}
+        for extractor in self.field_extractors:
+            field_data = json_response.get(extractor.name)
+            if not isinstance(field_data, dict):
+                field_data = None
+            results[extractor.name] = extractor.validate_response(field_data, debug)
+        
+        return results
+    
+    def get_default_values(self) -> dict[str, dict]:
+        """Return default values of every field when fused extraction fails."""
+        return {extractor.name: extractor.get_default_values() for extractor in self.field_extractors}
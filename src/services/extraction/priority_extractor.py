@@ -1,16 +1,19 @@
 import os, sys
-from typing import Any
+from typing import Any, Optional
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
 from src.services.extraction.base_extractor import BaseExtractor
 from src.models.base_model import BaseAIModel
-import paths
+from src.utils.prompt_registry import PromptRegistry
 
 class PriorityExtractor(BaseExtractor):
     """Handles extraction of priority from segments."""
+
+    name = "priority"
+    depends_on = ("assignees", "deadlines")
     
-    def __init__(self):
-        super().__init__(paths.EXTRACTION_PRIORITY_PROMPT)
+    def __init__(self, prompt_registry: PromptRegistry = None, prompt_encoding: str = "json"):
+        super().__init__("extraction_priority", prompt_registry, prompt_encoding)
         self.valid_priorities = ["High", "Medium", "Low"]
     
     def extract(self, segment: dict[str, Any], model: BaseAIModel, previous_data: dict = None, debug: bool = False) -> dict[str, Any]:
@@ -20,29 +23,33 @@ class PriorityExtractor(BaseExtractor):
         try:
             prompt = self._prep_prompt(segment, previous_data)
             response = model.process(prompt)
-            json_response = self._extract_json_from_text(response, "PRIORITY" if debug else "")
-            
-            if not json_response:
-                if debug:
-                    print(f"WARNING: Failed to extract priority JSON, using defaults")
-                return self.get_default_values()
-            
-            # Validate expected structure and values
-            if "priority" not in json_response or json_response["priority"] not in self.valid_priorities:
-                json_response["priority"] = "Medium"
-            
-            if "confidence" not in json_response or not isinstance(json_response["confidence"], int):
-                json_response["confidence"] = 50
-            
-            if "reasoning" not in json_response:
-                json_response["reasoning"] = "Priority assessment completed"
-            
-            return json_response
+            return self._validate_model_response(response, prompt, model, debug)
             
         except Exception as e:
             if debug:
                 print(f"ERROR in priority extraction: {str(e)}")
-            return self.get_default_values()
+            return self._fallback_values()
+    
+    def validate_response(self, json_response: Optional[dict], debug: bool = False) -> dict[str, Any]:
+        """
+        Validates the priority JSON returned by the model, falling back to defaults when unusable.
+        """
+        if not json_response:
+            if debug:
+                print(f"WARNING: Failed to extract priority JSON, using defaults")
+            return self._fallback_values()
+        
+        # Validate expected structure and values
+        if "priority" not in json_response or json_response["priority"] not in self.valid_priorities:
+            json_response["priority"] = "Medium"
+        
+        if "confidence" not in json_response or not isinstance(json_response["confidence"], int):
+            json_response["confidence"] = 50
+        
+        if "reasoning" not in json_response:
+            json_response["reasoning"] = "Priority assessment completed"
+        
+        return json_response
     
     def get_default_values(self) -> dict[str, Any]:
         """Return default values when priority extraction fails."""
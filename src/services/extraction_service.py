@@ -1,4 +1,6 @@
 import os, sys
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
@@ -6,78 +8,220 @@ from src.services.extraction.assignee_extractor import AssigneesExtractor
 from src.services.extraction.deadlines_extractor import DeadlinesExtractor
 from src.services.extraction.priority_extractor import PriorityExtractor
 from src.services.extraction.category_extractor import CategoryExtractor
+from src.services.extraction.fused_extractor import FusedExtractor
+from src.services.extraction.base_extractor import BaseExtractor
 from src.models.base_model import BaseAIModel
-import paths
+from src.utils.prompt_registry import PromptRegistry
+from src.utils.metrics import FALLBACKS
+from src.utils.tracing import propagate, span
 
 
 class ExtractionService:
     """
     Orchestrates the extraction process using specialized extractors.
     Acts as a facade for the four extraction services.
+
+    Two extraction modes are supported:
+      - "chained": one prompt per field, following the extractors' dependencies
+      - "fused": a single prompt returning every field, validated per field
     """
+
+    EXTRACTION_MODES = ("chained", "fused")
     
-    def __init__(self):
-        self.assignees_extractor = AssigneesExtractor()
-        self.deadlines_extractor = DeadlinesExtractor()
-        self.priority_extractor = PriorityExtractor()
-        self.category_extractor = CategoryExtractor()
+    def __init__(self, prompt_registry: PromptRegistry = None, prompt_encoding: str = "json"):
+        self.assignees_extractor = AssigneesExtractor(prompt_registry, prompt_encoding)
+        self.deadlines_extractor = DeadlinesExtractor(prompt_registry, prompt_encoding)
+        self.priority_extractor = PriorityExtractor(prompt_registry, prompt_encoding)
+        self.category_extractor = CategoryExtractor(prompt_registry, prompt_encoding)
+        self.extractors = [
+            self.assignees_extractor,
+            self.deadlines_extractor,
+            self.priority_extractor,
+            self.category_extractor
+        ]
+        self._execution_levels = self._build_execution_levels(self.extractors)
+        self.fused_extractor = FusedExtractor(self.extractors, prompt_registry, prompt_encoding)
+
+    def validate_mode(self, mode: str) -> None:
+        if mode not in self.EXTRACTION_MODES:
+            raise ValueError(f"Unknown extraction mode: {mode}. Available: {list(self.EXTRACTION_MODES)}")
+
+    def _build_execution_levels(self, extractors: list[BaseExtractor]) -> list[list[BaseExtractor]]:
+        """
+        Orders the extractors into levels of a dependency graph built from their `depends_on` declarations.
+        Extractors in the same level do not depend on each other and can run at the same time.
+        """
+        known_names = {extractor.name for extractor in extractors}
+        for extractor in extractors:
+            missing = [name for name in extractor.depends_on if name not in known_names]
+            if missing:
+                raise ValueError(f"Extractor '{extractor.name}' depends on unknown extractors: {missing}")
+
+        levels = []
+        resolved = set()
+        remaining = list(extractors)
+        while remaining:
+            level = [extractor for extractor in remaining if set(extractor.depends_on) <= resolved]
+            if not level:
+                raise ValueError(f"Circular dependency between extractors: {[e.name for e in remaining]}")
+            levels.append(level)
+            resolved.update(extractor.name for extractor in level)
+            remaining = [extractor for extractor in remaining if extractor not in level]
+
+        return levels
+
+    def _run_extractor(self, extractor: BaseExtractor, segment: dict[str, Any], model: BaseAIModel,
+                       results: dict[str, dict], debug: bool = False) -> dict[str, Any]:
+        """
+        Runs one extractor, injecting only the output of the extractors it depends on.
+        """
+        with span(f"extractor.{extractor.name}"):
+            data = extractor.extract(segment, model, self._previous_data_for(extractor, results), debug=debug)
+        if debug:
+            print(f"{extractor.name.capitalize()}: {data}")
+        return data
+
+    def _previous_data_for(self, extractor: BaseExtractor, results: dict[str, dict]) -> dict:
+        """
+        Merges the output of the extractors the given extractor depends on (None when it has no dependency).
+        """
+        if not extractor.depends_on:
+            return None
+        previous_data = {}
+        for name in extractor.depends_on:
+            previous_data.update(results[name])
+        return previous_data
+
+    async def _arun_extractor(self, extractor: BaseExtractor, segment: dict[str, Any], model: BaseAIModel,
+                              results: dict[str, dict], debug: bool = False) -> dict[str, Any]:
+        """
+        Async variant of _run_extractor.
+        """
+        with span(f"extractor.{extractor.name}"):
+            data = await extractor.aextract(segment, model, self._previous_data_for(extractor, results), debug=debug)
+        if debug:
+            print(f"{extractor.name.capitalize()}: {data}")
+        return data
+
+    async def _arun_extraction_graph(self, segment: dict[str, Any], model: BaseAIModel, debug: bool = False) -> dict[str, dict]:
+        """
+        Async variant of _run_extraction_graph; extractors within a level are awaited together.
+        """
+        results = {}
+        for level in self._execution_levels:
+            level_results = await asyncio.gather(
+                *(self._arun_extractor(extractor, segment, model, results, debug) for extractor in level)
+            )
+            for extractor, data in zip(level, level_results):
+                results[extractor.name] = data
+
+        return results
+
+    def _run_extraction_graph(self, segment: dict[str, Any], model: BaseAIModel, debug: bool = False) -> dict[str, dict]:
+        """
+        Runs the extractors level by level; extractors within a level are prompted concurrently.
+        """
+        results = {}
+        for level in self._execution_levels:
+            if len(level) == 1:
+                extractor = level[0]
+                results[extractor.name] = self._run_extractor(extractor, segment, model, results, debug)
+                continue
+
+            with ThreadPoolExecutor(max_workers=len(level)) as executor:
+                futures = {
+                    extractor.name: executor.submit(propagate(self._run_extractor), extractor, segment, model, results, debug)
+                    for extractor in level
+                }
+                for name, future in futures.items():
+                    results[name] = future.result()
 
-    def extract_from_segment(self, segment: dict[str, Any], model: BaseAIModel, debug: bool = False) -> dict[str, Any]:
+        return results
+
+    def extract_from_segment(self, segment: dict[str, Any], model: BaseAIModel, debug: bool = False, mode: str = "chained") -> dict[str, Any]:
         """
         Performs chain of prompts extraction on a single segment.
         Each segment represents an action, so we extract assignees, deadlines, priority, and category.
+        Extractors that do not depend on each other are prompted concurrently.
+        In "fused" mode all four fields are extracted with a single prompt instead.
         
         Args:
             segment: A segment dictionary from FilteringService (represents an action)
             model: The AI model to use for extraction
             debug: Whether to enable debug output
+            mode: Extraction mode, "chained" or "fused"
             
         Returns:
             Clean, flat JSON with task, assignee, deadline, priority_level, and category
         """
-        try:
-            if debug:
-                print(f"\nProcessing segment {segment.get('segment_id', 'unknown')}")
-            
-            # Step 1: Extract Assignees
-            assignees_data = self.assignees_extractor.extract(segment, model, debug=debug)
-            if debug:
-                print(f"Assignees: {assignees_data}")
+        self.validate_mode(mode)
+        with span("extraction.segment", segment_id=segment.get("segment_id"), mode=mode):
+            try:
+                if debug:
+                    print(f"\nProcessing segment {segment.get('segment_id', 'unknown')} ({mode} mode)")
             
-            # Step 2: Extract Deadlines (using assignees context)
-            deadlines_data = self.deadlines_extractor.extract(segment, model, assignees_data, debug=debug)
-            if debug:
-                print(f"Deadlines: {deadlines_data}")
+                if mode == "fused":
+                    with span("extractor.fused"):
+                        results = self.fused_extractor.extract(segment, model, debug=debug)
+                    if debug:
+                        print(f"Fused: {results}")
+                else:
+                    # Assignees -> deadlines -> priority -> category, following each extractor's dependencies
+                    results = self._run_extraction_graph(segment, model, debug)
             
-            # Combine data for next step
-            combined_data = {**assignees_data, **deadlines_data}
+                return self._results_to_output(segment, results)
             
-            # Step 3: Extract Priority (using previous context)
-            priority_data = self.priority_extractor.extract(segment, model, combined_data, debug=debug)
-            if debug:
-                print(f"Priority: {priority_data}")
-            
-            # Update combined data
-            combined_data.update(priority_data)
+            except Exception as e:
+                return self._default_output(segment, e)
+
+    async def aextract_from_segment(self, segment: dict[str, Any], model: BaseAIModel, debug: bool = False, mode: str = "chained") -> dict[str, Any]:
+        """
+        Async variant of extract_from_segment.
+        """
+        self.validate_mode(mode)
+        with span("extraction.segment", segment_id=segment.get("segment_id"), mode=mode):
+            try:
+                if debug:
+                    print(f"\nProcessing segment {segment.get('segment_id', 'unknown')} ({mode} mode)")
             
-            # Step 4: Extract Category (using all previous context)
-            category_data = self.category_extractor.extract(segment, model, combined_data, debug=debug)
-            if debug:
-                print(f"Category: {category_data}")
+                if mode == "fused":
+                    with span("extractor.fused"):
+                        results = await self.fused_extractor.aextract(segment, model, debug=debug)
+                    if debug:
+                        print(f"Fused: {results}")
+                else:
+                    results = await self._arun_extraction_graph(segment, model, debug)
             
-            # Convert to clean, flat structure
-            return self._format_clean_output(segment, assignees_data, deadlines_data, priority_data, category_data)
+                return self._results_to_output(segment, results)
             
-        except Exception as e:
-            print(f"ERROR: Problem occurred while extracting from segment {segment.get('segment_id', 'unknown')}: {str(e)}")
-            # Return clean structure with default values
-            return self._format_clean_output(
-                segment, 
-                self.assignees_extractor.get_default_values(),
-                self.deadlines_extractor.get_default_values(),
-                self.priority_extractor.get_default_values(),
-                self.category_extractor.get_default_values()
-            )
+            except Exception as e:
+                return self._default_output(segment, e)
+
+    def _results_to_output(self, segment: dict[str, Any], results: dict[str, dict]) -> dict[str, Any]:
+        """
+        Converts the per-extractor results to the clean, flat structure.
+        """
+        return self._format_clean_output(
+            segment,
+            results["assignees"],
+            results["deadlines"],
+            results["priority"],
+            results["category"]
+        )
+
+    def _default_output(self, segment: dict[str, Any], error: Exception) -> dict[str, Any]:
+        """
+        Logs an extraction failure and returns the clean structure with default values.
+        """
+        print(f"ERROR: Problem occurred while extracting from segment {segment.get('segment_id', 'unknown')}: {str(error)}")
+        FALLBACKS.inc(component="extraction", reason="default_segment")
+        return self._format_clean_output(
+            segment, 
+            self.assignees_extractor.get_default_values(),
+            self.deadlines_extractor.get_default_values(),
+            self.priority_extractor.get_default_values(),
+            self.category_extractor.get_default_values()
+        )
 
     def _format_clean_output(self, segment: dict[str, Any], assignees_data: dict, deadlines_data: dict, 
                            priority_data: dict, category_data: dict) -> dict[str, Any]:
@@ -112,7 +256,8 @@ class ExtractionService:
             "category": category
         }
 
-    def extract_from_segments(self, segments: list[dict[str, Any]], model: BaseAIModel, debug: bool = False) -> list[dict[str, Any]]:
+    def extract_from_segments(self, segments: list[dict[str, Any]], model: BaseAIModel, debug: bool = False,
+                              max_workers: int = 1, mode: str = "chained") -> list[dict[str, Any]]:
         """
         Performs chain of prompts extraction on multiple segments.
         
@@ -120,19 +265,52 @@ class ExtractionService:
             segments: List of segment dictionaries from FilteringService
             model: The AI model to use for extraction
             debug: Whether to enable debug output
+            max_workers: Maximum number of segment chains running concurrently (1 runs them sequentially)
+            mode: Extraction mode, "chained" or "fused"
             
         Returns:
-            List of segments with extracted action information
+            List of segments with extracted action information, in the same order as the input
         """
-        extracted_segments = []
-        
-        for segment in segments:
-            extracted_segment = self.extract_from_segment(segment, model, debug)
-            extracted_segments.append(extracted_segment)
+        if not isinstance(max_workers, int) or max_workers <= 0:
+            raise ValueError("max_workers must be a positive integer.")
+        self.validate_mode(mode)
+
+        if max_workers == 1 or len(segments) <= 1:
+            return [self.extract_from_segment(segment, model, debug, mode) for segment in segments]
+
+        # executor.map yields results in submission order, so the output order matches the input
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(segments))) as executor:
+            return list(executor.map(propagate(lambda segment: self.extract_from_segment(segment, model, debug, mode)), segments))
+
+    async def aextract_from_segments(self, segments: list[dict[str, Any]], model: BaseAIModel, debug: bool = False,
+                                     max_concurrency: int = 1, mode: str = "chained") -> list[dict[str, Any]]:
+        """
+        Async variant of extract_from_segments.
         
-        return extracted_segments
+        Args:
+            segments: List of segment dictionaries from FilteringService
+            model: The AI model to use for extraction
+            debug: Whether to enable debug output
+            max_concurrency: Maximum number of segment chains running concurrently
+            mode: Extraction mode, "chained" or "fused"
+            
+        Returns:
+            List of segments with extracted action information, in the same order as the input
+        """
+        if not isinstance(max_concurrency, int) or max_concurrency <= 0:
+            raise ValueError("max_concurrency must be a positive integer.")
+        self.validate_mode(mode)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def extract(segment: dict[str, Any]) -> dict[str, Any]:
+            async with semaphore:
+                return await self.aextract_from_segment(segment, model, debug, mode)
 
-    def get_structured_action_summary(self, segments: list[dict[str, Any]], model: BaseAIModel, debug: bool = False) -> dict[str, Any]:
+        # gather returns results in submission order, so the output order matches the input
+        return list(await asyncio.gather(*(extract(segment) for segment in segments)))
+
+    def get_structured_action_summary(self, segments: list[dict[str, Any]], model: BaseAIModel, debug: bool = False,
+                                      max_workers: int = 1, mode: str = "chained") -> dict[str, Any]:
         """
         Extract actions from segments and return a structured summary with clean format.
         
@@ -140,12 +318,27 @@ class ExtractionService:
             segments: List of segment dictionaries from FilteringService
             model: The AI model to use for extraction
             debug: Whether to enable debug output
+            max_workers: Maximum number of segment chains running concurrently
+            mode: Extraction mode, "chained" or "fused"
             
         Returns:
             Structured summary with clean, flat action objects
         """
-        extracted_segments = self.extract_from_segments(segments, model, debug)
-        
+        extracted_segments = self.extract_from_segments(segments, model, debug, max_workers, mode)
+        return self.build_summary(extracted_segments)
+
+    async def aget_structured_action_summary(self, segments: list[dict[str, Any]], model: BaseAIModel, debug: bool = False,
+                                             max_concurrency: int = 1, mode: str = "chained") -> dict[str, Any]:
+        """
+        Async variant of get_structured_action_summary.
+        """
+        extracted_segments = await self.aextract_from_segments(segments, model, debug, max_concurrency, mode)
+        return self.build_summary(extracted_segments)
+
+    def build_summary(self, extracted_segments: list[dict[str, Any]]) -> dict[str, Any]:
+        """
+        Builds the structured summary from extracted segments, keeping only meaningful actions.
+        """
         summary = {
             "total_segments_processed": len(extracted_segments),
             "total_actions": len(extracted_segments),  # Each segment represents one action
@@ -155,14 +348,20 @@ class ExtractionService:
         for segment in extracted_segments:
             # Since we now return clean format directly, just add to actions list
             # Only include actions that have meaningful data (not all defaults)
-            if (segment.get("assignee") != "Unassigned" or 
-                segment.get("deadline") != "No deadline" or 
-                segment.get("priority_level") != "Medium" or
-                segment.get("category") != "Other"):
+            if self.is_meaningful_action(segment):
                 summary["actions"].append(segment)
         
         return summary
 
+    def is_meaningful_action(self, action: dict[str, Any]) -> bool:
+        """
+        Whether an extracted action carries any information beyond the default values.
+        """
+        return (action.get("assignee") != "Unassigned" or 
+                action.get("deadline") != "No deadline" or 
+                action.get("priority_level") != "Medium" or
+                action.get("category") != "Other")
+
 
 if __name__ == "__main__":
     import os, sys
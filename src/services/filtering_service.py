@@ -1,34 +1,43 @@
 import os, sys
 import re
 import json
-from typing import Optional, Any
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Optional, Any
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 from src.models.base_model import BaseAIModel
-import paths
+from src.utils.token_utils import estimate_tokens
+from src.utils.metrics import FALLBACKS, PREFILTER_DECISIONS
+from src.utils.tracing import propagate, span
+from src.utils.prompt_registry import PromptRegistry, get_prompt_registry
+from src.utils.prompt_encoding import encode_segment, encode_segments, validate_encoding
+from src.services.prefilter_service import PrefilterService
 
 
 class FilteringService:
-    def __init__(self):
-        self._prompt_template_filepath = paths.FILTERING_SERVICE_PROMPT
-
-    def _load_prompt_template(self, filepath: str) -> str:
-        """Loads the prompt template from a file."""
-        try:
-            with open(filepath, 'r') as file:
-                prompt = file.read()
-            if not prompt.strip():
-                raise ValueError("Prompt cannot be empty.")
-            return prompt
-        except Exception:
-            raise ValueError("Problem occurred while loading system prompt.")
+    def __init__(self, prompt_registry: PromptRegistry = None, prompt_encoding: str = "json",
+                 prefilter: Optional[PrefilterService] = None):
+        validate_encoding(prompt_encoding)
+        self._prompts = prompt_registry or get_prompt_registry()
+        self.prompt_encoding = prompt_encoding
+        # When set, segments the pre-filter decides confidently never reach the model
+        self.prefilter = prefilter
+        suffix = "_compact" if prompt_encoding == "compact" else ""
+        self._prompt_name = "filtering" + suffix
+        self._batch_prompt_name = "filtering_batch" + suffix
 
     def _prep_prompt(self, segment: dict[str, Any]) -> str:
         """
-        Injects JSON-serialized segment into the prompt template.
+        Injects the serialized segment (JSON or compact, per prompt_encoding) into the prompt template.
+        """
+        return self._prompts.format(self._prompt_name, input_data=encode_segment(segment, self.prompt_encoding))
+
+    def _prep_batch_prompt(self, segments: list[dict[str, Any]]) -> str:
+        """
+        Injects the serialized list of segments into the batch prompt template.
         """
-        prompt_template = self._load_prompt_template(filepath=self._prompt_template_filepath)
-        return prompt_template.format(input_data=json.dumps(segment, indent=2))
+        return self._prompts.format(self._batch_prompt_name, input_data=encode_segments(segments, self.prompt_encoding))
 
     def _extract_json_from_text(self, text: str) -> Optional[dict]:
         """
@@ -66,6 +75,71 @@ class FilteringService:
         
         return True
 
+    def _parse_segment_response(self, segment: dict[str, Any], response: str) -> dict[str, Any]:
+        """
+        Parses and validates the model response for a single segment, raising on invalid output.
+        """
+        json_response = self._extract_json_from_text(response)
+        
+        if not json_response:
+            raise ValueError("Model returned invalid JSON format.")
+        
+        if not self._validate_action_response(json_response):
+            raise ValueError("Model returned invalid action analysis structure.")
+        
+        return self._with_analysis(segment, json_response)
+
+    def _with_analysis(self, segment: dict[str, Any], analysis: dict[str, Any]) -> dict[str, Any]:
+        """
+        Returns the segment with its action analysis attached.
+        """
+        return {
+            "segment_id": segment["segment_id"],
+            "topic_summary": segment["topic_summary"],
+            "chunks": segment["chunks"],
+            "action_analysis": analysis
+        }
+
+    def _error_result(self, segment: dict[str, Any], error: Exception) -> dict[str, Any]:
+        """
+        Logs an analysis failure and returns the segment marked as not actionable.
+        """
+        # Log error but continue processing other segments
+        print(f"Error analyzing segment {segment.get('segment_id', 'unknown')}: {error}")
+        FALLBACKS.inc(component="filtering", reason="default_not_actionable")
+        # Add segment with error status
+        return {
+            "segment_id": segment.get("segment_id", "unknown"),
+            "topic_summary": segment.get("topic_summary", ""),
+            "chunks": segment.get("chunks", []),
+            "action_analysis": {
+                "action_segments_found": "no",
+                "confidence_percentage": 0,
+                "explanation": "Error occurred during analysis"
+            }
+        }
+
+    def _parse_or_invalidate(self, model: BaseAIModel, prompt: str, parse):
+        """
+        Runs parse() on a model response. A response that fails to parse or validate is invalidated in
+        the model's response cache, so retrying the same segment asks the model again instead of replaying it.
+        """
+        try:
+            return parse()
+        except Exception:
+            model.invalidate(prompt)
+            raise
+
+    def _parse_batch_or_invalidate(self, model: BaseAIModel, prompt: str, segments: list[dict[str, Any]],
+                                   response: str) -> dict[str, dict]:
+        """
+        Parses a batched response, invalidating it in the model's response cache when any segment is missing.
+        """
+        analyses = self._parse_or_invalidate(model, prompt, lambda: self._parse_batch_response(segments, response))
+        if len(analyses) < len(segments):
+            model.invalidate(prompt)
+        return analyses
+
     def analyze_segment_for_actions(self, segment: dict[str, Any], model: BaseAIModel) -> dict[str, Any]:
         """
         Analyzes a single segment to determine if it contains actionable content.
@@ -80,77 +154,350 @@ class FilteringService:
         try:
             prompt = self._prep_prompt(segment=segment)
             response = model.process(prompt)
-            json_response = self._extract_json_from_text(response)
-            
-            if not json_response:
-                raise ValueError("Model returned invalid JSON format.")
-            
-            if not self._validate_action_response(json_response):
-                raise ValueError("Model returned invalid action analysis structure.")
+            return self._parse_or_invalidate(model, prompt, lambda: self._parse_segment_response(segment, response))
             
-            # Return segment with action analysis
-            return {
-                "segment_id": segment["segment_id"],
-                "topic_summary": segment["topic_summary"],
-                "chunks": segment["chunks"],
-                "action_analysis": json_response
-            }
+        except Exception as e:
+            raise Exception(f"Problem occurred while analyzing segment {segment.get('segment_id', 'unknown')}: {str(e)}") from e
+
+    async def aanalyze_segment_for_actions(self, segment: dict[str, Any], model: BaseAIModel) -> dict[str, Any]:
+        """
+        Async variant of analyze_segment_for_actions.
+        """
+        try:
+            prompt = self._prep_prompt(segment=segment)
+            response = await model.aprocess(prompt)
+            return self._parse_or_invalidate(model, prompt, lambda: self._parse_segment_response(segment, response))
             
         except Exception as e:
             raise Exception(f"Problem occurred while analyzing segment {segment.get('segment_id', 'unknown')}: {str(e)}") from e
 
-    def filter_segments_for_actions(self, segments: list[dict[str, Any]], model: BaseAIModel) -> list[dict[str, Any]]:
+    def _build_batches(self, segments: list[dict[str, Any]], token_budget: int) -> list[list[dict[str, Any]]]:
         """
-        Analyzes multiple segments to identify which contain actionable content.
+        Greedily packs consecutive segments into batches whose serialized size stays within the token budget.
+        A segment larger than the budget on its own gets a batch of its own.
+        """
+        batches = []
+        current_batch = []
+        current_tokens = 0
+
+        for segment in segments:
+            segment_tokens = estimate_tokens(encode_segment(segment, self.prompt_encoding))
+            if current_batch and current_tokens + segment_tokens > token_budget:
+                batches.append(current_batch)
+                current_batch = []
+                current_tokens = 0
+            current_batch.append(segment)
+            current_tokens += segment_tokens
+
+        if current_batch:
+            batches.append(current_batch)
+
+        return batches
+
+    def _parse_batch_response(self, segments: list[dict[str, Any]], response: str) -> dict[str, dict]:
+        """
+        Parses a batched response, keeping only the items that pass validation.
+        """
+        json_response = self._extract_json_from_text(response)
+        if not json_response or not isinstance(json_response.get("results"), list):
+            raise ValueError("Model returned invalid JSON format.")
+        
+        expected_ids = {str(segment.get("segment_id")) for segment in segments}
+        analyses = {}
+        for item in json_response["results"]:
+            if not isinstance(item, dict):
+                continue
+            segment_id = str(item.pop("segment_id", None))
+            if segment_id in expected_ids and self._validate_action_response(item):
+                analyses[segment_id] = item
+        
+        return analyses
+
+    def analyze_segment_batch(self, segments: list[dict[str, Any]], model: BaseAIModel) -> dict[str, dict]:
+        """
+        Analyzes several segments with a single prompt.
         
         Args:
-            segments: List of segment dictionaries from ClusteringService
+            segments: Segment dictionaries with segment_id, topic_summary, and chunks
             model: The AI model to use for analysis
             
         Returns:
-            List of segments with action analysis results
+            Dictionary mapping str(segment_id) to its action analysis, for the items that passed validation only
         """
-        analyzed_segments = []
+        try:
+            prompt = self._prep_batch_prompt(segments=segments)
+            response = model.process(prompt)
+            return self._parse_batch_or_invalidate(model, prompt, segments, response)
         
-        for segment in segments:
+        except Exception as e:
+            segment_ids = [segment.get('segment_id', 'unknown') for segment in segments]
+            raise Exception(f"Problem occurred while analyzing segment batch {segment_ids}: {str(e)}") from e
+
+    async def aanalyze_segment_batch(self, segments: list[dict[str, Any]], model: BaseAIModel) -> dict[str, dict]:
+        """
+        Async variant of analyze_segment_batch.
+        """
+        try:
+            prompt = self._prep_batch_prompt(segments=segments)
+            response = await model.aprocess(prompt)
+            return self._parse_batch_or_invalidate(model, prompt, segments, response)
+        
+        except Exception as e:
+            segment_ids = [segment.get('segment_id', 'unknown') for segment in segments]
+            raise Exception(f"Problem occurred while analyzing segment batch {segment_ids}: {str(e)}") from e
+
+    def _analyze_segment_with_fallback(self, segment: dict[str, Any], model: BaseAIModel) -> dict[str, Any]:
+        """
+        Analyzes a single segment, returning a "no action" result instead of raising on failure.
+        """
+        with span("filtering.segment", segment_id=segment.get("segment_id")) as segment_span:
             try:
-                analyzed_segment = self.analyze_segment_for_actions(segment, model)
-                analyzed_segments.append(analyzed_segment)
+                return self.analyze_segment_for_actions(segment, model)
             except Exception as e:
-                # Log error but continue processing other segments
-                print(f"Error analyzing segment {segment.get('segment_id', 'unknown')}: {e}")
-                # Add segment with error status
-                analyzed_segments.append({
-                    "segment_id": segment.get("segment_id", "unknown"),
-                    "topic_summary": segment.get("topic_summary", ""),
-                    "chunks": segment.get("chunks", []),
-                    "action_analysis": {
-                        "action_segments_found": "no",
-                        "confidence_percentage": 0,
-                        "explanation": "Error occurred during analysis"
-                    }
-                })
-        
+                segment_span.record_error(e)
+                return self._error_result(segment, e)
+
+    async def _aanalyze_segment_with_fallback(self, segment: dict[str, Any], model: BaseAIModel) -> dict[str, Any]:
+        """
+        Async variant of _analyze_segment_with_fallback.
+        """
+        with span("filtering.segment", segment_id=segment.get("segment_id")) as segment_span:
+            try:
+                return await self.aanalyze_segment_for_actions(segment, model)
+            except Exception as e:
+                segment_span.record_error(e)
+                return self._error_result(segment, e)
+
+    def _analyze_batch_with_fallback(self, segments: list[dict[str, Any]], model: BaseAIModel) -> list[dict[str, Any]]:
+        """
+        Analyzes a batch with one prompt, re-analyzing individually every segment
+        whose batched result is missing or invalid.
+        """
+        if len(segments) == 1:
+            return [self._analyze_segment_with_fallback(segments[0], model)]
+
+        try:
+            with span("filtering.batch", segments=len(segments)):
+                analyses = self.analyze_segment_batch(segments, model)
+        except Exception as e:
+            print(f"Error analyzing batch, falling back to single-segment analysis: {e}")
+            analyses = {}
+
+        analyzed_segments = []
+        for segment in segments:
+            analysis = analyses.get(str(segment.get("segment_id")))
+            if analysis is None:
+                FALLBACKS.inc(component="filtering", reason="batch_to_single")
+                analyzed_segments.append(self._analyze_segment_with_fallback(segment, model))
+            else:
+                analyzed_segments.append(self._with_analysis(segment, analysis))
+
         return analyzed_segments
 
-    def get_actionable_segments_only(self, segments: list[dict[str, Any]], model: BaseAIModel) -> list[dict[str, Any]]:
+    async def _aanalyze_batch_with_fallback(self, segments: list[dict[str, Any]], model: BaseAIModel) -> list[dict[str, Any]]:
+        """
+        Async variant of _analyze_batch_with_fallback. The single-segment retries run one after another,
+        within the caller's concurrency slot, so a failed batch never puts more prompts in flight.
+        """
+        if len(segments) == 1:
+            return [await self._aanalyze_segment_with_fallback(segments[0], model)]
+
+        try:
+            with span("filtering.batch", segments=len(segments)):
+                analyses = await self.aanalyze_segment_batch(segments, model)
+        except Exception as e:
+            print(f"Error analyzing batch, falling back to single-segment analysis: {e}")
+            analyses = {}
+
+        analyzed_segments = []
+        for segment in segments:
+            analysis = analyses.get(str(segment.get("segment_id")))
+            if analysis is None:
+                FALLBACKS.inc(component="filtering", reason="batch_to_single")
+                analyzed_segments.append(await self._aanalyze_segment_with_fallback(segment, model))
+            else:
+                analyzed_segments.append(self._with_analysis(segment, analysis))
+
+        return analyzed_segments
+
+    def _prepare_batches(self, segments: list[dict[str, Any]], batch_token_budget: Optional[int]) -> list[list[dict[str, Any]]]:
+        """
+        Validates the batch budget and splits the segments into prompt batches.
+        """
+        if batch_token_budget is not None and (not isinstance(batch_token_budget, int) or batch_token_budget <= 0):
+            raise ValueError("batch_token_budget must be a positive integer.")
+
+        if batch_token_budget is None:
+            return [[segment] for segment in segments]
+        return self._build_batches(segments, batch_token_budget)
+
+    def _prefilter_segments(self, segments: list[dict[str, Any]]) -> tuple[dict[int, dict[str, Any]], list[int]]:
+        """
+        Runs the pre-filter, if any, over the segments.
+
+        Returns:
+            The segments it decided, analyzed, by index in the input, and the indices of the segments left to the model
+        """
+        if self.prefilter is None:
+            return {}, list(range(len(segments)))
+
+        decided, pending = {}, []
+        with span("filtering.prefilter", segments=len(segments)) as prefilter_span:
+            for index, segment in enumerate(segments):
+                analysis = self.prefilter.decide(segment)
+                if analysis is None:
+                    pending.append(index)
+                    PREFILTER_DECISIONS.inc(decision="llm")
+                else:
+                    decided[index] = self._with_analysis(segment, analysis)
+                    PREFILTER_DECISIONS.inc(decision="accept" if analysis["action_segments_found"] == "yes" else "reject")
+            prefilter_span.set_attribute("decided_locally", len(decided))
+        return decided, pending
+
+    def _merge_prefiltered(self, decided: dict[int, dict[str, Any]], pending: list[int],
+                           analyzed_pending: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Puts the pre-filter's verdicts and the model's back together, in the order of the input.
+        """
+        if not decided:
+            return analyzed_pending
+        merged = dict(decided)
+        merged.update(zip(pending, analyzed_pending))
+        return [merged[index] for index in range(len(merged))]
+
+    def filter_segments_for_actions(self, segments: list[dict[str, Any]], model: BaseAIModel, max_workers: int = 1,
+                                    batch_token_budget: int = None) -> list[dict[str, Any]]:
+        """
+        Analyzes multiple segments to identify which contain actionable content.
+        
+        Args:
+            segments: List of segment dictionaries from ClusteringService
+            model: The AI model to use for analysis
+            max_workers: Maximum number of prompts in flight concurrently (1 runs them sequentially)
+            batch_token_budget: When set, packs several segments per prompt, keeping each batch's
+                segment data within this many (estimated) tokens. None sends one prompt per segment.
+            
+        Returns:
+            List of segments with action analysis results, in the same order as the input
+        """
+        if not isinstance(max_workers, int) or max_workers <= 0:
+            raise ValueError("max_workers must be a positive integer.")
+        decided, pending = self._prefilter_segments(segments)
+        batches = self._prepare_batches([segments[index] for index in pending], batch_token_budget)
+
+        if max_workers == 1 or len(batches) <= 1:
+            results = [self._analyze_batch_with_fallback(batch, model) for batch in batches]
+        else:
+            # executor.map yields results in submission order, so the output order matches the input
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+                # propagate() keeps the worker threads' spans under the caller's span
+                results = list(executor.map(propagate(lambda batch: self._analyze_batch_with_fallback(batch, model)), batches))
+
+        analyzed_pending = [analyzed_segment for batch_result in results for analyzed_segment in batch_result]
+        return self._merge_prefiltered(decided, pending, analyzed_pending)
+
+    async def afilter_segments_for_actions(self, segments: list[dict[str, Any]], model: BaseAIModel, max_concurrency: int = 1,
+                                           batch_token_budget: int = None) -> list[dict[str, Any]]:
+        """
+        Async variant of filter_segments_for_actions.
+        
+        Args:
+            segments: List of segment dictionaries from ClusteringService
+            model: The AI model to use for analysis
+            max_concurrency: Maximum number of batches analyzed concurrently
+            batch_token_budget: Token budget per batched prompt, None for one prompt per segment
+            
+        Returns:
+            List of segments with action analysis results, in the same order as the input
+        """
+        if not isinstance(max_concurrency, int) or max_concurrency <= 0:
+            raise ValueError("max_concurrency must be a positive integer.")
+        decided, pending = self._prefilter_segments(segments)
+        batches = self._prepare_batches([segments[index] for index in pending], batch_token_budget)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def analyze(batch: list[dict[str, Any]]) -> list[dict[str, Any]]:
+            async with semaphore:
+                return await self._aanalyze_batch_with_fallback(batch, model)
+
+        # gather returns results in submission order, so the output order matches the input
+        results = await asyncio.gather(*(analyze(batch) for batch in batches))
+        analyzed_pending = [analyzed_segment for batch_result in results for analyzed_segment in batch_result]
+        return self._merge_prefiltered(decided, pending, analyzed_pending)
+
+    async def astream_segments_for_actions(self, segments: list[dict[str, Any]], model: BaseAIModel, max_concurrency: int = 1,
+                                           batch_token_budget: int = None) -> AsyncIterator[tuple[int, dict[str, Any]]]:
+        """
+        Analyzes segments like afilter_segments_for_actions, but yields each verdict as soon as its prompt completes.
+        Verdicts of the pre-filter, if any, come first. Closing the iterator early cancels the prompts still in flight.
+        
+        Args:
+            segments: List of segment dictionaries from ClusteringService
+            model: The AI model to use for analysis
+            max_concurrency: Maximum number of batches analyzed concurrently
+            batch_token_budget: Token budget per batched prompt, None for one prompt per segment
+            
+        Yields:
+            (index of the segment in the input, segment with action analysis results), in completion order
+        """
+        if not isinstance(max_concurrency, int) or max_concurrency <= 0:
+            raise ValueError("max_concurrency must be a positive integer.")
+        decided, pending = self._prefilter_segments(segments)
+        batches = self._prepare_batches([segments[index] for index in pending], batch_token_budget)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def analyze(offset: int, batch: list[dict[str, Any]]) -> list[tuple[int, dict[str, Any]]]:
+            async with semaphore:
+                analyzed_batch = await self._aanalyze_batch_with_fallback(batch, model)
+            return [(pending[offset + position], analyzed_segment) for position, analyzed_segment in enumerate(analyzed_batch)]
+
+        # Batches hold consecutive pending segments, so a batch's first position in `pending` is the running total
+        # of the previous batch sizes
+        tasks = []
+        offset = 0
+        for batch in batches:
+            tasks.append(asyncio.create_task(analyze(offset, batch)))
+            offset += len(batch)
+
+        try:
+            # The prompts are already in flight while the pre-filter's verdicts are consumed
+            for indexed_segment in decided.items():
+                yield indexed_segment
+            for next_batch in asyncio.as_completed(tasks):
+                for indexed_segment in await next_batch:
+                    yield indexed_segment
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def get_actionable_segments_only(self, segments: list[dict[str, Any]], model: BaseAIModel, max_workers: int = 1,
+                                     batch_token_budget: int = None) -> list[dict[str, Any]]:
         """
         Returns only segments that contain actionable content.
         
         Args:
             segments: List of segment dictionaries from ClusteringService
             model: The AI model to use for analysis
+            max_workers: Maximum number of prompts in flight concurrently
+            batch_token_budget: Token budget per batched prompt, None for one prompt per segment
             
         Returns:
             List of segments that were identified as containing actions
         """
-        analyzed_segments = self.filter_segments_for_actions(segments, model)
-        return [
-            segment for segment in analyzed_segments 
-            if segment["action_analysis"]["action_segments_found"] == "yes"
-        ]
+        analyzed_segments = self.filter_segments_for_actions(segments, model, max_workers, batch_token_budget)
+        return self._actionable_only(analyzed_segments)
 
-    def filter_for_actionable_segments(self, segments: list[dict[str, Any]], model: BaseAIModel) -> list[dict[str, Any]]:
+    def is_actionable(self, analyzed_segment: dict[str, Any]) -> bool:
+        """
+        Whether an analyzed segment was predicted as containing actions ("yes").
+        """
+        return analyzed_segment["action_analysis"]["action_segments_found"] == "yes"
+
+    def _actionable_only(self, analyzed_segments: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        return [segment for segment in analyzed_segments if self.is_actionable(segment)]
+
+    def filter_for_actionable_segments(self, segments: list[dict[str, Any]], model: BaseAIModel, max_workers: int = 1,
+                                       batch_token_budget: int = None) -> list[dict[str, Any]]:
         """
         Main filtering function that returns only segments predicted as containing actions ("yes").
         This is the primary function to use when you only want actionable segments in the final output.
@@ -158,12 +505,21 @@ class FilteringService:
         Args:
             segments: List of segment dictionaries from ClusteringService
             model: The AI model to use for analysis
+            max_workers: Maximum number of prompts in flight concurrently
+            batch_token_budget: Token budget per batched prompt, None for one prompt per segment
             
         Returns:
             List containing only segments where action_segments_found == "yes"
         """
-        return self.get_actionable_segments_only(segments, model)
+        return self.get_actionable_segments_only(segments, model, max_workers, batch_token_budget)
 
+    async def afilter_for_actionable_segments(self, segments: list[dict[str, Any]], model: BaseAIModel, max_concurrency: int = 1,
+                                              batch_token_budget: int = None) -> list[dict[str, Any]]:
+        """
+        Async variant of filter_for_actionable_segments.
+        """
+        analyzed_segments = await self.afilter_segments_for_actions(segments, model, max_concurrency, batch_token_budget)
+        return self._actionable_only(analyzed_segments)
 
 if __name__ == "__main__":
     import os, sys
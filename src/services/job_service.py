@@ -0,0 +1,152 @@
+import os, sys
+import asyncio
+import time
+import uuid
+from typing import Any, Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.services.pipeline_service import PipelineResources, arun_pipeline
+from src.utils.tracing import exported_trace_id, span
+
+
+class Job:
+    """A transcript submitted for background processing, with its status, per-stage progress and result."""
+
+    def __init__(self, transcript: str, extraction_mode: Optional[str] = None):
+        self.id = uuid.uuid4().hex
+        self.transcript = transcript
+        self.extraction_mode = extraction_mode
+        self.status = "queued"  # queued -> running -> succeeded | failed
+        self.progress: dict[str, dict] = {}
+        self.result: Optional[dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.trace_id: Optional[str] = None
+
+    def update_progress(self, stage: str, details: dict) -> None:
+        self.progress[stage] = {**self.progress.get(stage, {}), **details}
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "progress": self.progress,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "trace_id": self.trace_id
+        }
+
+
+class JobQueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+class JobManager:
+    """
+    Runs pipeline jobs on a bounded pool of asyncio workers draining an in-process queue.
+
+    The number of workers caps how many transcripts are processed at once, independently of how
+    many HTTP requests are in flight. Finished jobs are kept for result_ttl_seconds, then dropped.
+    """
+
+    def __init__(self, resources: PipelineResources, max_workers: int = 4, max_queue_size: int = 100,
+                 result_ttl_seconds: float = 3600):
+        if not isinstance(max_workers, int) or max_workers <= 0:
+            raise ValueError("max_workers must be a positive integer.")
+        if not isinstance(max_queue_size, int) or max_queue_size <= 0:
+            raise ValueError("max_queue_size must be a positive integer.")
+        if not (isinstance(result_ttl_seconds, (int, float)) and result_ttl_seconds > 0):
+            raise ValueError("result_ttl_seconds must be a positive number.")
+
+        self.resources = resources
+        self.max_workers = max_workers
+        self.result_ttl_seconds = result_ttl_seconds
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._jobs: dict[str, Job] = {}
+        self._workers: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Starts the worker tasks on the running event loop."""
+        if self._workers:
+            return
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_workers)]
+
+    async def stop(self) -> None:
+        """Cancels the worker tasks; queued and running jobs are abandoned."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, transcript: str, extraction_mode: Optional[str] = None) -> Job:
+        """
+        Queues a transcript for processing and returns its job right away.
+
+        Raises:
+            JobQueueFullError: If the queue is at capacity
+        """
+        self._purge_expired()
+        job = Job(transcript, extraction_mode)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise JobQueueFullError("Job queue is full, retry later.")
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Returns the job, or None if it is unknown or its result has expired."""
+        self._purge_expired()
+        return self._jobs.get(job_id)
+
+    def get_stats(self) -> dict[str, int]:
+        """Counts jobs by status, plus the current queue depth."""
+        stats = {"queued": 0, "running": 0, "succeeded": 0, "failed": 0}
+        for job in self._jobs.values():
+            stats[job.status] += 1
+        stats["queue_depth"] = self._queue.qsize()
+        return stats
+
+    def _purge_expired(self) -> None:
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and now - job.finished_at > self.result_ttl_seconds
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    async def _run_job(self, job: Job) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            with span("job", job_id=job.id) as job_span:
+                job.trace_id = exported_trace_id(job_span)
+                job.result = await arun_pipeline(
+                    job.transcript,
+                    extraction_mode=job.extraction_mode,
+                    resources=self.resources,
+                    on_progress=job.update_progress
+                )
+            job.status = "succeeded"
+        except Exception as e:
+            print(f"[JobManager] Job {job.id} failed: {e}")
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+            # The transcript is no longer needed once processed
+            job.transcript = None
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run_job(job)
+            finally:
+                self._queue.task_done()
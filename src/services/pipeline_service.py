@@ -1,71 +1,459 @@
 import os, sys
-from typing import Any
+import asyncio
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, BinaryIO, Callable, Optional, Union
 from pathlib import Path
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
 from src.services.chunking_service import ChunkingService
+from src.services.compression_service import CompressionService
 from src.services.clustering_service import ClusteringService
 from src.services.filtering_service import FilteringService
+from src.services.prefilter_service import PrefilterService
 from src.services.extraction_service import ExtractionService
+from src.models.base_model import BaseAIModel
+from src.models.limited_model import ConcurrencyLimitedAIModel
 from src.models.model_factory import AIModelFactory
+from src.utils.prompt_registry import PromptRegistry, get_prompt_registry
+from src.utils.chunk_store import ChunkStore
+from src.utils.metrics import PIPELINE_STAGE_DURATION
+from src.utils.tracing import exported_trace_id, span
 from config import get_config
 
-def run_pipeline(transcript_input: str, debug: bool = None) -> dict[str, Any]:
+
+class PipelineResources:
+    """
+    Model client and service objects shared across pipeline runs.
+    All of them are stateless between calls, so one instance can serve concurrent requests.
+    """
+
+    def __init__(self, model: BaseAIModel, prompt_registry: PromptRegistry, prompt_encoding: str = "json",
+                 prefilter: Optional[PrefilterService] = None):
+        self.model = model
+        self.prompt_registry = prompt_registry
+        self.prompt_encoding = prompt_encoding
+        self.prefilter = prefilter
+        self.chunker = ChunkingService()
+        self.compression_service = CompressionService()
+        self.clustering_service = ClusteringService(prompt_registry, prompt_encoding)
+        self.filtering_service = FilteringService(prompt_registry, prompt_encoding, prefilter)
+        self.extraction_service = ExtractionService(prompt_registry, prompt_encoding)
+
+
+def build_pipeline_resources(config=None) -> PipelineResources:
+    """
+    Creates the model client (with its response cache, if enabled) and the pipeline services.
+    """
+    config = config or get_config()
+    factory = AIModelFactory()
+    model = factory.create_model(
+        model_type=config.MODEL_TYPE,
+        config=config.get_model_config(),
+        cache_config=config.get_cache_config(),
+        metrics_config=config.get_metrics_config()
+    )
+    return PipelineResources(model, get_prompt_registry(), config.PROMPT_ENCODING, build_prefilter(config))
+
+
+def build_prefilter(config=None) -> Optional[PrefilterService]:
+    """
+    Creates the heuristic pre-filter of the filtering stage, or returns None when it is disabled.
+    """
+    config = config or get_config()
+    if not config.PREFILTER_ENABLED:
+        return None
+    return PrefilterService(config.PREFILTER_REJECT_THRESHOLD, config.PREFILTER_ACCEPT_THRESHOLD)
+
+
+async def warm_up_pipeline_resources(resources: PipelineResources, model_call: bool = True) -> None:
+    """
+    Pays first-call costs ahead of traffic: checks the prompt templates and, optionally,
+    sends a tiny prompt so the provider's async connection is established.
+    A failed warm-up call is logged but not fatal, the model is retried on the first real request.
+    """
+    resources.prompt_registry.reload_if_changed()
+    if not model_call:
+        return
+    try:
+        await resources.model.aprocess("Reply with the single word: ready")
+    except Exception as e:
+        print(f"[Pipeline] Warm-up model call failed: {e}")
+
+
+@contextmanager
+def _stage(name: str):
+    """Times a pipeline stage in the stage duration histogram and traces it as a span."""
+    with PIPELINE_STAGE_DURATION.time(stage=name), span(f"stage.{name}"):
+        yield
+
+
+def _chunk_transcript(chunker: ChunkingService, config, transcript_input: Union[str, BinaryIO]) -> ChunkStore:
+    """
+    Chunks the transcript text, the transcript file when the input is a .txt file path, or an open
+    binary file (how local callers pass .vtt/.srt exports; string inputs from the API only resolve .txt paths).
+    Files are memory-mapped and parsed in place, never read into one string.
+
+    The chunks are kept once, in a ChunkStore: the segments of every later stage refer to them
+    by id, so memory does not grow with the number of stages.
+    """
+    # The markers only apply to the bracketed format, other formats (VTT, SRT, Zoom, Teams) are detected and parsed whole
+    options = {
+        "start_marker": config.CHUNK_START_MARKER,
+        "end_marker": config.CHUNK_END_MARKER,
+        "transcript_format": None if config.TRANSCRIPT_FORMAT == "auto" else config.TRANSCRIPT_FORMAT
+    }
+    if not isinstance(transcript_input, str):
+        return chunker.transcript_to_store(transcript_input, **options)
+    # Use config's file validation logic
+    if config.is_valid_file_path(transcript_input):
+        with open(transcript_input, 'rb') as f:
+            return chunker.transcript_to_store(f, **options)
+    return chunker.transcript_to_store(transcript_input, **options)
+
+
+def run_pipeline(transcript_input: Union[str, BinaryIO], debug: bool = None, extraction_mode: str = None,
+                 resources: PipelineResources = None) -> dict[str, Any]:
     """
     Main pipeline function: takes raw transcript text and returns structured action items.
     Steps:
-      1. Chunk transcript
+      1. Chunk transcript (then merge/drop low-content turns if Config.COMPRESSION_ENABLED)
       2. Cluster chunks into segments
       3. Filter segments for actionable content
-      4. Extract structured action info from actionable segments
+      4. Extract structured action info from actionable segments ("chained" or "fused" mode)
+
+    The transcript is text, a .txt file path, or an open binary file in any supported format.
+    Pass `resources` to reuse a warm model client and services; otherwise they are built for this run.
+    """
+    with span("pipeline", entry_point="sync"):
+        # Get configuration
+        config = get_config()
+
+        # Reuse shared resources when provided, otherwise build them for this run
+        if resources is None:
+            resources = build_pipeline_resources(config)
+        model = resources.model
+
+        # Use config's debug mode if not explicitly provided
+        if debug is None:
+            debug = config.DEBUG_MODE
+
+        # Use config's extraction mode if not explicitly provided
+        if extraction_mode is None:
+            extraction_mode = config.EXTRACTION_MODE
+
+        # 1. Chunking
+        with _stage("chunking"):
+            chunks = _chunk_transcript(resources.chunker, config, transcript_input)
+        if debug:
+            print(f"Chunked {len(chunks)} utterances.")
+
+        # 1b. Optional compression, segments still carry the original chunks
+        cluster_chunks = chunks
+        if config.COMPRESSION_ENABLED:
+            with _stage("compression"):
+                cluster_chunks = resources.compression_service.compress_chunks(chunks)
+            if debug:
+                print(f"Compressed into {len(cluster_chunks)} chunks.")
+
+        # 2. Clustering
+        with _stage("clustering"):
+            clustered_segments = resources.clustering_service.chunks_to_segments(
+                cluster_chunks,
+                model,
+                max_workers=config.CLUSTERING_MAX_WORKERS,
+                window_token_budget=config.CLUSTERING_WINDOW_TOKEN_BUDGET if config.CLUSTERING_MODE == "windowed" else None,
+                window_overlap=config.CLUSTERING_WINDOW_OVERLAP,
+                source_chunks=chunks if config.COMPRESSION_ENABLED else None
+            )
+        if debug:
+            print(f"Clustered into {len(clustered_segments)} segments.")
+
+        # 3. Filtering for actionable segments
+        with _stage("filtering"):
+            actionable_segments = resources.filtering_service.filter_for_actionable_segments(
+                clustered_segments,
+                model,
+                max_workers=config.FILTERING_MAX_WORKERS,
+                batch_token_budget=config.FILTERING_BATCH_TOKEN_BUDGET if config.FILTERING_MODE == "batched" else None
+            )
+        if debug:
+            print(f"Found {len(actionable_segments)} actionable segments.")
+
+        # 4. Extraction of structured action info
+        with _stage("extraction"):
+            summary = resources.extraction_service.get_structured_action_summary(
+                actionable_segments,
+                model,
+                debug=debug,
+                max_workers=config.EXTRACTION_MAX_WORKERS,
+                mode=extraction_mode
+            )
+
+        return summary
+
+
+async def arun_pipeline(transcript_input: str, debug: bool = None, extraction_mode: str = None,
+                        resources: PipelineResources = None,
+                        on_progress: Optional[Callable[[str, dict], None]] = None) -> dict[str, Any]:
+    """
+    Async variant of run_pipeline: every LLM call goes through the model's async client,
+    so a single event loop can keep many transcripts in flight while they wait on I/O.
+
+    `on_progress(stage, details)` is called when each stage (chunking, clustering, filtering,
+    extraction) starts and completes, with the item counts known at that point.
+    """
+    with span("pipeline", entry_point="async"):
+        config = get_config()
+
+        def report(stage: str, **details) -> None:
+            if on_progress is not None:
+                on_progress(stage, details)
+
+        if resources is None:
+            resources = await asyncio.to_thread(build_pipeline_resources, config)
+        model = resources.model
+
+        if debug is None:
+            debug = config.DEBUG_MODE
+
+        if extraction_mode is None:
+            extraction_mode = config.EXTRACTION_MODE
+
+        # 1. Chunking (file I/O and CPU, kept off the event loop)
+        report("chunking", status="running")
+        with _stage("chunking"):
+            chunks = await asyncio.to_thread(_chunk_transcript, resources.chunker, config, transcript_input)
+        report("chunking", status="completed", chunks=len(chunks))
+        if debug:
+            print(f"Chunked {len(chunks)} utterances.")
+
+        # 1b. Optional compression (CPU only), segments still carry the original chunks
+        cluster_chunks = chunks
+        if config.COMPRESSION_ENABLED:
+            with _stage("compression"):
+                cluster_chunks = resources.compression_service.compress_chunks(chunks)
+            if debug:
+                print(f"Compressed into {len(cluster_chunks)} chunks.")
+
+        # 2. Clustering
+        report("clustering", status="running", chunks=len(cluster_chunks))
+        with _stage("clustering"):
+            clustered_segments = await resources.clustering_service.achunks_to_segments(
+                cluster_chunks,
+                model,
+                max_concurrency=config.CLUSTERING_MAX_WORKERS,
+                window_token_budget=config.CLUSTERING_WINDOW_TOKEN_BUDGET if config.CLUSTERING_MODE == "windowed" else None,
+                window_overlap=config.CLUSTERING_WINDOW_OVERLAP,
+                source_chunks=chunks if config.COMPRESSION_ENABLED else None
+            )
+        report("clustering", status="completed", segments=len(clustered_segments))
+        if debug:
+            print(f"Clustered into {len(clustered_segments)} segments.")
+
+        # 3. Filtering for actionable segments
+        report("filtering", status="running", segments=len(clustered_segments))
+        with _stage("filtering"):
+            actionable_segments = await resources.filtering_service.afilter_for_actionable_segments(
+                clustered_segments,
+                model,
+                max_concurrency=config.FILTERING_MAX_WORKERS,
+                batch_token_budget=config.FILTERING_BATCH_TOKEN_BUDGET if config.FILTERING_MODE == "batched" else None
+            )
+        report("filtering", status="completed", actionable_segments=len(actionable_segments))
+        if debug:
+            print(f"Found {len(actionable_segments)} actionable segments.")
+
+        # 4. Extraction of structured action info
+        report("extraction", status="running", segments=len(actionable_segments))
+        with _stage("extraction"):
+            summary = await resources.extraction_service.aget_structured_action_summary(
+                actionable_segments,
+                model,
+                debug=debug,
+                max_concurrency=config.EXTRACTION_MAX_WORKERS,
+                mode=extraction_mode
+            )
+        report("extraction", status="completed", actions=len(summary["actions"]))
+
+        return summary
+
+
+async def astream_pipeline(transcript_input: str, debug: bool = None, extraction_mode: str = None,
+                           resources: PipelineResources = None) -> AsyncIterator[dict[str, Any]]:
+    """
+    Streaming variant of arun_pipeline: yields events as the run progresses instead of one final result.
+
+    Extraction of a segment starts as soon as its filtering verdict is "yes", so the first actions
+    arrive before the remaining segments are filtered. Events, in order of occurrence:
+      {"event": "chunks", "count", "clustered_count"}          clustered_count is lower when compression is enabled
+      {"event": "segments", "count", "segments": [{"segment_id", "topic_summary"}]}
+      {"event": "verdict", "segment_id", "action_analysis"}     one per segment, in completion order
+      {"event": "action", "segment_id", "action"}               one per meaningful action, in completion order
+      {"event": "summary", "summary", "trace_id"}               same shape as get_structured_action_summary
+    Closing the iterator early (e.g. on client disconnect) cancels the LLM calls still in flight.
+    """
+    with span("pipeline", entry_point="stream") as pipeline_span:
+        config = get_config()
+
+        if resources is None:
+            resources = await asyncio.to_thread(build_pipeline_resources, config)
+        model = resources.model
+
+        if debug is None:
+            debug = config.DEBUG_MODE
+
+        if extraction_mode is None:
+            extraction_mode = config.EXTRACTION_MODE
+        resources.extraction_service.validate_mode(extraction_mode)
+
+        # 1. Chunking (file I/O and CPU, kept off the event loop)
+        with _stage("chunking"):
+            chunks = await asyncio.to_thread(_chunk_transcript, resources.chunker, config, transcript_input)
+        # Optional compression, segments still carry the original chunks
+        cluster_chunks = chunks
+        if config.COMPRESSION_ENABLED:
+            with _stage("compression"):
+                cluster_chunks = resources.compression_service.compress_chunks(chunks)
+        yield {"event": "chunks", "count": len(chunks), "clustered_count": len(cluster_chunks)}
+
+        # 2. Clustering
+        with _stage("clustering"):
+            clustered_segments = await resources.clustering_service.achunks_to_segments(
+                cluster_chunks,
+                model,
+                max_concurrency=config.CLUSTERING_MAX_WORKERS,
+                window_token_budget=config.CLUSTERING_WINDOW_TOKEN_BUDGET if config.CLUSTERING_MODE == "windowed" else None,
+                window_overlap=config.CLUSTERING_WINDOW_OVERLAP,
+                source_chunks=chunks if config.COMPRESSION_ENABLED else None
+            )
+        yield {
+            "event": "segments",
+            "count": len(clustered_segments),
+            "segments": [
+                {"segment_id": segment.get("segment_id"), "topic_summary": segment.get("topic_summary")}
+                for segment in clustered_segments
+            ]
+        }
+
+        # 3 + 4. Filtering and extraction run concurrently, both report to a single event queue
+        events: asyncio.Queue = asyncio.Queue()
+        extraction_semaphore = asyncio.Semaphore(config.EXTRACTION_MAX_WORKERS)
+        extraction_tasks: list[asyncio.Task] = []
+
+        async def extract(index: int, segment: dict[str, Any]) -> None:
+            try:
+                async with extraction_semaphore:
+                    action = await resources.extraction_service.aextract_from_segment(segment, model, debug, extraction_mode)
+                await events.put(("action", index, segment, action))
+            except Exception as e:
+                await events.put(("error", e))
+
+        async def filter_segments() -> None:
+            try:
+                async for index, analyzed_segment in resources.filtering_service.astream_segments_for_actions(
+                    clustered_segments,
+                    model,
+                    max_concurrency=config.FILTERING_MAX_WORKERS,
+                    batch_token_budget=config.FILTERING_BATCH_TOKEN_BUDGET if config.FILTERING_MODE == "batched" else None
+                ):
+                    await events.put(("verdict", index, analyzed_segment))
+                    if resources.filtering_service.is_actionable(analyzed_segment):
+                        extraction_tasks.append(asyncio.create_task(extract(index, analyzed_segment)))
+                await events.put(("filtered",))
+            except Exception as e:
+                await events.put(("error", e))
+
+        filtering_task = asyncio.create_task(filter_segments())
+        # Extracted actions keyed by segment index, so the summary keeps the segment order of run_pipeline
+        extracted: dict[int, dict[str, Any]] = {}
+        filtering_done = False
+        try:
+            while not filtering_done or len(extracted) < len(extraction_tasks):
+                kind, *payload = await events.get()
+                if kind == "error":
+                    raise payload[0]
+                if kind == "filtered":
+                    filtering_done = True
+                    if debug:
+                        print(f"Found {len(extraction_tasks)} actionable segments.")
+                elif kind == "verdict":
+                    _, analyzed_segment = payload
+                    yield {
+                        "event": "verdict",
+                        "segment_id": analyzed_segment.get("segment_id"),
+                        "action_analysis": analyzed_segment["action_analysis"]
+                    }
+                elif kind == "action":
+                    index, segment, action = payload
+                    extracted[index] = action
+                    if resources.extraction_service.is_meaningful_action(action):
+                        yield {"event": "action", "segment_id": segment.get("segment_id"), "action": action}
+        finally:
+            filtering_task.cancel()
+            for task in extraction_tasks:
+                task.cancel()
+
+        summary = resources.extraction_service.build_summary([extracted[index] for index in sorted(extracted)])
+        yield {"event": "summary", "summary": summary, "trace_id": exported_trace_id(pipeline_span)}
+
+
+async def arun_pipeline_batch(transcripts: dict[str, str], debug: bool = None, extraction_mode: str = None,
+                              resources: PipelineResources = None, max_concurrency: int = None) -> dict[str, dict[str, Any]]:
+    """
+    Runs the pipeline over many transcripts at once.
+
+    All transcripts go through one model wrapper with a global limit of `max_concurrency` in-flight
+    LLM calls (defaults to Config.BATCH_MAX_CONCURRENCY). Their clustering, filtering and extraction calls
+    therefore share a single first-come first-served queue, and one transcript's serial tail
+    does not leave the LLM budget idle.
+
+    Args:
+        transcripts: Transcript text (or file path) by caller-chosen transcript id
+
+    Returns:
+        Per transcript id, {"status": "succeeded", "result": summary} or {"status": "failed", "error": message}
     """
-    # Get configuration
     config = get_config()
-    
-    # Use config's debug mode if not explicitly provided
-    if debug is None:
-        debug = config.DEBUG_MODE
-    
-    # Use config's file validation logic
-    if config.is_valid_file_path(transcript_input):
-        with open(transcript_input, 'r') as f:
-            transcript = f.read()
-    else:
-        transcript = transcript_input
-
-    # 1. Chunking
-    chunker = ChunkingService()
-    chunks = chunker.transcript_to_chunks(
-        transcript,
-        start_marker=config.CHUNK_START_MARKER,
-        end_marker=config.CHUNK_END_MARKER
-    )
-    if debug:
-        print(f"Chunked {len(chunks)} utterances.")
 
-    # 2. Clustering
-    factory = AIModelFactory()
-    model = factory.create_model(
-        model_type=config.MODEL_TYPE,
-        config=config.get_model_config()
+    if max_concurrency is None:
+        max_concurrency = config.BATCH_MAX_CONCURRENCY
+    if len(transcripts) > config.BATCH_MAX_TRANSCRIPTS:
+        raise ValueError(f"Too many transcripts in batch: {len(transcripts)} (max {config.BATCH_MAX_TRANSCRIPTS}).")
+
+    if resources is None:
+        resources = await asyncio.to_thread(build_pipeline_resources, config)
+    batch_resources = PipelineResources(
+        ConcurrencyLimitedAIModel(resources.model, max_concurrency),
+        resources.prompt_registry,
+        resources.prompt_encoding,
+        resources.prefilter
     )
-    clustering_service = ClusteringService()
-    clustered_segments = clustering_service.chunks_to_segments(chunks, model)
-    if debug:
-        print(f"Clustered into {len(clustered_segments)} segments.")
 
-    # 3. Filtering for actionable segments
-    filtering_service = FilteringService()
-    actionable_segments = filtering_service.filter_for_actionable_segments(clustered_segments, model)
-    if debug:
-        print(f"Found {len(actionable_segments)} actionable segments.")
+    async def run_one(transcript_id: str, transcript_input: str) -> dict[str, Any]:
+        with span("batch.transcript", transcript_id=transcript_id) as transcript_span:
+            try:
+                summary = await arun_pipeline(transcript_input, debug, extraction_mode, resources=batch_resources)
+                return {"status": "succeeded", "result": summary}
+            except Exception as e:
+                # One failed transcript must not fail the rest of the batch
+                print(f"[Pipeline] Transcript {transcript_id} failed: {e}")
+                transcript_span.record_error(e)
+                return {"status": "failed", "error": str(e)}
 
-    # 4. Extraction of structured action info
-    extraction_service = ExtractionService()
-    summary = extraction_service.get_structured_action_summary(actionable_segments, model, debug=debug)
+    transcript_ids = list(transcripts)
+    with span("pipeline_batch", transcripts=len(transcript_ids), max_concurrency=max_concurrency):
+        results = await asyncio.gather(*(run_one(transcript_id, transcripts[transcript_id]) for transcript_id in transcript_ids))
+    return dict(zip(transcript_ids, results))
+
+
+def run_pipeline_batch(transcripts: dict[str, str], debug: bool = None, extraction_mode: str = None,
+                       resources: PipelineResources = None, max_concurrency: int = None) -> dict[str, dict[str, Any]]:
+    """
+    Synchronous entry point for arun_pipeline_batch, for scripts and callers without an event loop.
+    """
+    return asyncio.run(arun_pipeline_batch(transcripts, debug, extraction_mode, resources, max_concurrency))
 
-    return summary
 
 if __name__ == "__main__":
     import paths
@@ -76,8 +464,11 @@ if __name__ == "__main__":
     
     config = get_config()
     
-    summary = run_pipeline(
-        transcript_input=config.DEFAULT_TRANSCRIPT_FILE,
-        debug=config.DEBUG_MODE
-    )
+    # Any supported format (bracketed .txt, .vtt, .srt, Zoom or Teams text) can be given on the command line
+    transcript_path = sys.argv[1] if len(sys.argv) > 1 else config.DEFAULT_TRANSCRIPT_FILE
+    with open(transcript_path, 'rb') as transcript_file:
+        summary = run_pipeline(
+            transcript_input=transcript_file,
+            debug=config.DEBUG_MODE
+        )
     pprint(summary)
\ No newline at end of file
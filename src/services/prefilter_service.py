@@ -0,0 +1,138 @@
+import math
+import re
+from typing import Any, Optional
+
+
+# First-person commitments and offers: "I'll send it", "we will fix", "let me check"
+COMMITMENT_PATTERN = re.compile(
+    r"\b(I'll|I will|I can take|I can do|I'm going to|I am going to|we'll|we will|we're going to|let me|let's|I'll take)\b",
+    re.IGNORECASE
+)
+# Requests, obligations and explicit task wording
+REQUEST_PATTERN = re.compile(
+    r"\b(can you|could you|would you|will you|please|make sure|need to|needs to|have to|has to|should|must|"
+    r"don't forget|remember to|action items?|follow[- ]up|take care of|owner|assign(?:ed)?|to-?do)\b",
+    re.IGNORECASE
+)
+DATE_PATTERN = re.compile(
+    r"\b(today|tonight|tomorrow|EOD|EOW|ASAP|monday|tuesday|wednesday|thursday|friday|saturday|sunday|"
+    r"(?:next|this) (?:week|month|sprint|quarter)|end of (?:the )?(?:day|week|month|sprint|quarter)|"
+    r"(?:january|february|march|april|may|june|july|august|september|october|november|december) \d{1,2}(?:st|nd|rd|th)?|"
+    r"\d{1,2}/\d{1,2}(?:/\d{2,4})?|by \d{1,2}(?::\d{2})? ?(?:am|pm))\b",
+    re.IGNORECASE
+)
+# Recaps of what already happened, which read like actions but are not
+RECAP_PATTERN = re.compile(
+    r"\b(last (?:week|month|sprint)|already|finished|completed|was done|went (?:well|live)|shipped|improvement|numbers)\b",
+    re.IGNORECASE
+)
+
+# Weights of each feature in the score (logistic regression style, hand-tuned on sample meetings)
+FEATURE_WEIGHTS = {
+    "commitment": 2.0,
+    "request": 1.5,
+    "date": 1.25,
+    "name_mention": 0.75,
+    "question": 0.25,
+    "recap": -0.75,
+}
+# Score of a segment without any feature, before the logistic function
+BIAS = -2.25
+
+
+class PrefilterService:
+    """
+    Local heuristic classifier deciding obvious segments before the LLM filtering prompt.
+
+    Each segment gets a score between 0 and 1 from its commitment and request phrases, dates, mentions of
+    the other speakers by first name, questions and recaps. A score at or below reject_threshold is decided
+    "no" and at or above accept_threshold "yes", without any model call; everything in between is left to
+    the LLM. With the defaults, segments without any commitment, request, date or name mention are rejected,
+    and accepting takes a commitment or request together with a date and more.
+    """
+
+    def __init__(self, reject_threshold: float = 0.15, accept_threshold: float = 0.9):
+        if not (0 <= reject_threshold < accept_threshold <= 1):
+            raise ValueError("Thresholds must satisfy 0 <= reject_threshold < accept_threshold <= 1.")
+        self.reject_threshold = reject_threshold
+        self.accept_threshold = accept_threshold
+
+    def _utterances(self, segment: dict[str, Any]) -> list[tuple[str, str]]:
+        utterances = []
+        for chunk in segment.get("chunks", []):
+            speaker, separator, text = chunk["content"].partition(": ")
+            utterances.append((speaker, text) if separator else ("", chunk["content"]))
+        return utterances
+
+    def features(self, segment: dict[str, Any]) -> dict[str, float]:
+        """
+        The features of a segment: 1 when present (commitments count up to 2), 0 otherwise.
+        """
+        utterances = self._utterances(segment)
+        first_names = {speaker.split()[0] for speaker, _ in utterances if speaker.strip()}
+        commitments = sum(1 for _, text in utterances if COMMITMENT_PATTERN.search(text))
+        name_mention = any(
+            re.search(rf"\b{re.escape(name)}\b", text)
+            for speaker, text in utterances
+            for name in first_names
+            if not speaker.startswith(name)
+        )
+        return {
+            "commitment": min(commitments, 2),
+            "request": float(any(REQUEST_PATTERN.search(text) for _, text in utterances)),
+            "date": float(any(DATE_PATTERN.search(text) for _, text in utterances)),
+            "name_mention": float(name_mention),
+            "question": float(any("?" in text for _, text in utterances)),
+            "recap": float(any(RECAP_PATTERN.search(text) for _, text in utterances)),
+        }
+
+    def score(self, segment: dict[str, Any]) -> float:
+        """Likelihood-like score (0 to 1) that the segment contains an action."""
+        features = self.features(segment)
+        logit = BIAS + sum(FEATURE_WEIGHTS[name] * value for name, value in features.items())
+        return 1 / (1 + math.exp(-logit))
+
+    def decide(self, segment: dict[str, Any]) -> Optional[dict[str, Any]]:
+        """
+        Returns the segment's action analysis, in the format of the filtering prompt's answer,
+        when the score is confident enough, or None to leave the segment to the LLM.
+        """
+        score = self.score(segment)
+        if score <= self.reject_threshold:
+            verdict, confidence = "no", 1 - score
+            explanation = "Decided locally by the heuristic pre-filter: no commitment, request or deadline found."
+        elif score >= self.accept_threshold:
+            verdict, confidence = "yes", score
+            explanation = "Decided locally by the heuristic pre-filter: commitments or requests with deadlines found."
+        else:
+            return None
+        return {
+            "action_segments_found": verdict,
+            "confidence_percentage": int(round(confidence * 100)),
+            "explanation": explanation,
+            "decided_by": "prefilter"
+        }
+
+
+if __name__ == "__main__":
+    from pprint import pprint
+
+    example_segments = [
+        {"segment_id": 1, "topic_summary": "Small talk", "chunks": [
+            {"id": 0, "order": 0, "content": "Alice: Morning everyone, how was the weekend?"},
+            {"id": 1, "order": 1, "content": "Bob: Good, thanks."}
+        ]},
+        {"segment_id": 2, "topic_summary": "Launch materials", "chunks": [
+            {"id": 2, "order": 2, "content": "Alice: John, can you prepare the marketing materials by Friday?"},
+            {"id": 3, "order": 3, "content": "John: Sure, I'll send them over tomorrow."}
+        ]},
+        {"segment_id": 3, "topic_summary": "Metrics recap", "chunks": [
+            {"id": 4, "order": 4, "content": "Bob: The numbers from last week look better."},
+            {"id": 5, "order": 5, "content": "Alice: Should we look into the churn drop?"}
+        ]}
+    ]
+
+    prefilter = PrefilterService()
+    for segment in example_segments:
+        print(f"Segment {segment['segment_id']} ({segment['topic_summary']}): score {prefilter.score(segment):.2f}")
+        pprint(prefilter.decide(segment))
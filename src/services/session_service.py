@@ -0,0 +1,255 @@
+import os, sys
+import asyncio
+import time
+import uuid
+from typing import Any, Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.services.pipeline_service import PipelineResources
+from src.services.transcript_parsers import TranscriptParserRegistry
+from src.utils.chunk_store import ChunkStore
+from src.utils.tracing import span
+from config import get_config
+
+
+class SessionClosedError(Exception):
+    """Raised when utterances are appended to a closed session."""
+
+
+class SessionLimitError(Exception):
+    """Raised when a session is created while the maximum number of sessions are open."""
+
+
+class LiveSession:
+    """
+    A meeting processed incrementally while it is going on.
+
+    Every update parses only the appended text into the session's ChunkStore, then re-clusters the open tail:
+    the last `open_segments` segments, whose topic may still continue, plus the new chunks. Tail segments
+    that are followed by other segments become final and are never re-clustered again, and an open segment
+    reaching max_open_chunks is closed as well, so an update costs the same early and late in a meeting.
+    Filtering and extraction only run for segments whose chunks changed; a segment with the same chunks
+    as before keeps its verdict and action, even when the tail was re-clustered.
+    """
+
+    def __init__(self, resources: PipelineResources, transcript_format: Optional[str] = None,
+                 extraction_mode: Optional[str] = None, open_segments: int = 1, max_open_chunks: int = 60):
+        if not isinstance(open_segments, int) or open_segments <= 0:
+            raise ValueError("open_segments must be a positive integer.")
+        if not isinstance(max_open_chunks, int) or max_open_chunks <= 0:
+            raise ValueError("max_open_chunks must be a positive integer.")
+        if transcript_format is not None and transcript_format not in TranscriptParserRegistry.get_available_formats():
+            raise ValueError(f"Unknown transcript format: {transcript_format}. "
+                             f"Available: {TranscriptParserRegistry.get_available_formats()}")
+        if extraction_mode is not None:
+            resources.extraction_service.validate_mode(extraction_mode)
+
+        self.id = uuid.uuid4().hex
+        self.resources = resources
+        self.transcript_format = transcript_format  # detected from the first update when None
+        self.extraction_mode = extraction_mode
+        self.open_segments = open_segments
+        self.max_open_chunks = max_open_chunks
+        self.store = ChunkStore()
+        # Segments in transcript order, self.segments[self._first_open:] are the open tail
+        self.segments: list[dict[str, Any]] = []
+        self._first_open = 0
+        # First chunk after the final segments: everything from there on is re-clustered on the next update
+        self._tail_start = 0
+        # Verdict and action by the chunk ids of the segment they were computed for
+        self._results: dict[tuple, dict[str, Any]] = {}
+        self.closed = False
+        self.updates = 0
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self._lock = asyncio.Lock()
+
+    def _segment_key(self, segment: dict[str, Any]) -> tuple:
+        return tuple(segment["chunks"].chunk_ids)
+
+    async def append(self, text: str) -> dict[str, Any]:
+        """
+        Adds utterances to the meeting and updates the segments and actions they affect.
+
+        Returns:
+            What the update changed: the new chunks, how many chunks were re-clustered, and the segments
+            from `replaced_from_segment_id` on (they replace the previous ones from that id), with their
+            verdict and action and whether they are final
+
+        Raises:
+            SessionClosedError: If the session was closed
+            ValueError: If the text is empty or is not in the session's transcript format
+        """
+        async with self._lock:
+            if self.closed:
+                raise SessionClosedError(f"Session {self.id} is closed.")
+            config = get_config()
+            model = self.resources.model
+            with span("session.update", session_id=self.id) as update_span:
+                if self.transcript_format is None:
+                    self.transcript_format = self.resources.chunker.detect_format(text[:TranscriptParserRegistry.HEAD_SIZE])
+                new_ids = await asyncio.to_thread(
+                    self.resources.chunker.append_to_store, self.store, text, transcript_format=self.transcript_format
+                )
+                update_span.set_attribute("new_chunks", len(new_ids))
+                if not new_ids:
+                    raise ValueError(f"No utterance found in the text (session format: {self.transcript_format}).")
+
+                # Re-cluster the open segments together with the new chunks
+                replaced_from = self._first_open
+                tail = self.store[self._tail_start:]
+                tail_segments = []
+                if len(tail):
+                    cluster_chunks, source_chunks = tail, None
+                    if config.COMPRESSION_ENABLED:
+                        cluster_chunks, source_chunks = self.resources.compression_service.compress_chunks(tail), self.store
+                    tail_segments = await self.resources.clustering_service.achunks_to_segments(
+                        cluster_chunks, model, source_chunks=source_chunks
+                    )
+                    tail_segments = [segment for segment in tail_segments if len(segment["chunks"])]
+                update_span.set_attribute("reclustered_chunks", len(tail))
+
+                previous_keys = {self._segment_key(segment) for segment in self.segments[self._first_open:]}
+                for segment_id, segment in enumerate(tail_segments, start=self._first_open + 1):
+                    segment["segment_id"] = segment_id
+                self.segments[self._first_open:] = tail_segments
+                final_count = max(0, len(tail_segments) - self.open_segments)
+                if tail_segments and len(tail_segments[-1]["chunks"]) >= self.max_open_chunks:
+                    final_count = len(tail_segments)
+                if final_count:
+                    self._tail_start = max(max(segment["chunks"].chunk_ids) for segment in tail_segments[:final_count]) + 1
+                self._first_open += final_count
+
+                # Filtering and extraction only for segments whose chunks changed
+                changed = [segment for segment in tail_segments if self._segment_key(segment) not in self._results]
+                await self._analyze(changed, config)
+                current_keys = {self._segment_key(segment) for segment in tail_segments}
+                for key in previous_keys - current_keys:
+                    self._results.pop(key, None)
+                update_span.set_attribute("reanalyzed_segments", len(changed))
+
+            self.updates += 1
+            self.updated_at = time.time()
+            return {
+                "session_id": self.id,
+                "new_chunks": len(new_ids),
+                "reclustered_chunks": len(tail),
+                "reanalyzed_segments": len(changed),
+                "replaced_from_segment_id": replaced_from + 1,
+                "segments": [self._segment_state(index) for index in range(replaced_from, len(self.segments))]
+            }
+
+    async def _analyze(self, segments: list[dict[str, Any]], config) -> None:
+        if not segments:
+            return
+        model = self.resources.model
+        filtering_service = self.resources.filtering_service
+        analyzed_segments = await filtering_service.afilter_segments_for_actions(
+            segments, model, max_concurrency=config.FILTERING_MAX_WORKERS
+        )
+        actionable_segments = [segment for segment in analyzed_segments if filtering_service.is_actionable(segment)]
+        actions = await self.resources.extraction_service.aextract_from_segments(
+            actionable_segments,
+            model,
+            max_concurrency=config.EXTRACTION_MAX_WORKERS,
+            mode=self.extraction_mode or config.EXTRACTION_MODE
+        )
+        actions_by_key = {self._segment_key(segment): action for segment, action in zip(actionable_segments, actions)}
+        for segment in analyzed_segments:
+            key = self._segment_key(segment)
+            self._results[key] = {"action_analysis": segment["action_analysis"], "action": actions_by_key.get(key)}
+
+    def _segment_state(self, index: int) -> dict[str, Any]:
+        segment = self.segments[index]
+        result = self._results.get(self._segment_key(segment), {})
+        chunk_ids = segment["chunks"].chunk_ids
+        return {
+            "segment_id": segment["segment_id"],
+            "topic_summary": segment["topic_summary"],
+            "first_chunk_id": chunk_ids[0],
+            "last_chunk_id": chunk_ids[-1],
+            "final": index < self._first_open,
+            "action_analysis": result.get("action_analysis"),
+            "action": result.get("action")
+        }
+
+    def get_summary(self) -> dict[str, Any]:
+        """The actions of the meeting so far, in the format of run_pipeline's summary."""
+        actions = [
+            self._results[key]["action"]
+            for key in (self._segment_key(segment) for segment in self.segments)
+            if key in self._results and self._results[key]["action"] is not None
+        ]
+        return self.resources.extraction_service.build_summary(actions)
+
+    async def close(self) -> dict[str, Any]:
+        """Marks every segment as final and refuses further updates. Returns the final summary."""
+        async with self._lock:
+            self.closed = True
+            self._first_open = len(self.segments)
+            self.updated_at = time.time()
+            return self.get_summary()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "session_id": self.id,
+            "status": "closed" if self.closed else "open",
+            "transcript_format": self.transcript_format,
+            "chunks": len(self.store),
+            "updates": self.updates,
+            "segments": [self._segment_state(index) for index in range(len(self.segments))],
+            "summary": self.get_summary(),
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
+        }
+
+
+class SessionManager:
+    """
+    Keeps the live sessions of the process. Sessions without an update for idle_ttl_seconds are dropped,
+    closed or not, so abandoned meetings do not hold their transcript forever.
+    """
+
+    def __init__(self, resources: PipelineResources, max_sessions: int = 100, idle_ttl_seconds: float = 3600,
+                 open_segments: int = 1, max_open_chunks: int = 60):
+        if not isinstance(max_sessions, int) or max_sessions <= 0:
+            raise ValueError("max_sessions must be a positive integer.")
+        if not (isinstance(idle_ttl_seconds, (int, float)) and idle_ttl_seconds > 0):
+            raise ValueError("idle_ttl_seconds must be a positive number.")
+
+        self.resources = resources
+        self.max_sessions = max_sessions
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.open_segments = open_segments
+        self.max_open_chunks = max_open_chunks
+        self._sessions: dict[str, LiveSession] = {}
+
+    def create(self, transcript_format: Optional[str] = None, extraction_mode: Optional[str] = None) -> LiveSession:
+        """
+        Opens a session.
+
+        Raises:
+            SessionLimitError: If max_sessions sessions are already open
+            ValueError: On an unknown transcript format or extraction mode
+        """
+        self._purge_idle()
+        if len(self._sessions) >= self.max_sessions:
+            raise SessionLimitError("Too many live sessions, close one or retry later.")
+        session = LiveSession(self.resources, transcript_format, extraction_mode, self.open_segments, self.max_open_chunks)
+        self._sessions[session.id] = session
+        return session
+
+    def get(self, session_id: str) -> Optional[LiveSession]:
+        """Returns the session, or None if it is unknown or was dropped after being idle."""
+        self._purge_idle()
+        return self._sessions.get(session_id)
+
+    def get_stats(self) -> dict[str, int]:
+        sessions = list(self._sessions.values())
+        return {"open": sum(1 for session in sessions if not session.closed), "closed": sum(1 for session in sessions if session.closed)}
+
+    def _purge_idle(self) -> None:
+        now = time.time()
+        idle = [session_id for session_id, session in self._sessions.items() if now - session.updated_at > self.idle_ttl_seconds]
+        for session_id in idle:
+            del self._sessions[session_id]
@@ -0,0 +1,232 @@
+import re
+from typing import Iterable, Iterator, Optional
+
+
+# (speaker, text, start, end): start and end are seconds (from the start of the recording, or since
+# midnight for clock timestamps), None when the format does not give them
+Utterance = tuple[str, str, Optional[float], Optional[float]]
+
+UNKNOWN_SPEAKER = "Unknown"
+
+
+def parse_timestamp(value: str) -> float:
+    """
+    Converts `[H:]MM:SS[.mmm|,mmm]` (VTT, SRT, Zoom, Teams) to seconds.
+    Two fields are read as minutes and seconds, as in Teams' `0:03`.
+    """
+    fields = value.strip().replace(",", ".").split(":")
+    seconds = 0.0
+    for field in fields:
+        seconds = seconds * 60 + float(field)
+    return seconds
+
+
+class TranscriptParser:
+    """
+    Base class of the line-based transcript parsers. A parser reads its format in a single pass over
+    the lines (which may be streamed from a file) and yields one utterance per speaker turn.
+    """
+
+    name = ""
+    # Detected from a signature at the very start of the file, which nothing else can have
+    has_signature = False
+
+    def detect(self, head: str) -> bool:
+        """Whether the beginning of a transcript (a few KB) is in this format."""
+        raise NotImplementedError
+
+    def iter_utterances(self, lines: Iterable[str]) -> Iterator[Utterance]:
+        raise NotImplementedError
+
+
+class SubtitleParser(TranscriptParser):
+    """
+    Cue-based caption files (WebVTT, SRT): a timing line `start --> end` followed by the cue text.
+    The speaker comes from a WebVTT voice tag (`<v Jane Doe>`, Teams) or a `Name:` prefix (Zoom).
+    Captions split turns into cues of a few seconds, so consecutive cues of the same known
+    speaker are merged into one utterance spanning them.
+    """
+
+    _timing = re.compile(r"^\s*((?:\d+:)?\d{1,2}:\d{2}[.,]\d{1,3})\s*-->\s*((?:\d+:)?\d{1,2}:\d{2}[.,]\d{1,3})")
+    _voice = re.compile(r"<v(?:\.[^\s>]*)?\s+([^>]+)>")
+    _tag = re.compile(r"</?[^>]*>")
+    _name_prefix = re.compile(r"^([^:<>\[\]]{1,60}):\s+(.*)$")
+
+    def _split_speaker(self, text: str) -> tuple[str, str]:
+        if "<" in text:
+            voice = self._voice.search(text)
+            if voice:
+                return voice.group(1).strip(), self._tag.sub("", text).strip()
+            text = self._tag.sub("", text).strip()
+        prefix = self._name_prefix.match(text)
+        if prefix:
+            return prefix.group(1).strip(), prefix.group(2).strip()
+        return UNKNOWN_SPEAKER, text
+
+    def iter_utterances(self, lines: Iterable[str]) -> Iterator[Utterance]:
+        pending = None  # [speaker, text parts, start, end] of the turn being merged
+        cue_start = cue_end = None
+        cue_lines: list[str] = []
+
+        def close_cue():
+            nonlocal pending
+            if not cue_lines:
+                return None
+            speaker, text = self._split_speaker(" ".join(cue_lines))
+            if not text:
+                return None
+            if pending is not None and speaker == pending[0] and speaker != UNKNOWN_SPEAKER:
+                pending[1].append(text)
+                pending[3] = cue_end
+                return None
+            finished, pending = pending, [speaker, [text], cue_start, cue_end]
+            return finished
+
+        in_cue = False
+        for line in lines:
+            line = line.strip()
+            if in_cue:
+                if line:
+                    cue_lines.append(line)
+                    continue
+                finished = close_cue()
+                if finished is not None:
+                    yield finished[0], " ".join(finished[1]), finished[2], finished[3]
+                in_cue, cue_lines = False, []
+                continue
+            timing = self._timing.match(line) if "-->" in line else None
+            if timing:
+                # Headers, NOTE/STYLE blocks and cue identifiers are skipped: only timed cues are read
+                cue_start, cue_end = parse_timestamp(timing.group(1)), parse_timestamp(timing.group(2))
+                in_cue, cue_lines = True, []
+
+        finished = close_cue() if in_cue else None
+        if finished is not None:
+            yield finished[0], " ".join(finished[1]), finished[2], finished[3]
+        if pending is not None:
+            yield pending[0], " ".join(pending[1]), pending[2], pending[3]
+
+
+class WebVTTParser(SubtitleParser):
+    """WebVTT captions, as exported by Zoom (`Name: text` cues) and Teams (`<v Name>` voice tags)."""
+
+    name = "vtt"
+    has_signature = True
+
+    def detect(self, head: str) -> bool:
+        return head.lstrip("\ufeff \t\r\n").startswith("WEBVTT")
+
+
+class SRTParser(SubtitleParser):
+    """SubRip captions: numbered cues with `HH:MM:SS,mmm --> HH:MM:SS,mmm` timings."""
+
+    name = "srt"
+    has_signature = True
+    _detect = re.compile(r"^\s*\d+\s*\r?\n\s*\d{1,2}:\d{2}:\d{2},\d{1,3}\s*-->")
+
+    def detect(self, head: str) -> bool:
+        return bool(self._detect.match(head.lstrip("\ufeff")))
+
+
+class HeaderLineParser(TranscriptParser):
+    """
+    Transcripts where each turn starts with a header line holding the speaker and a timestamp,
+    followed by the text on the next lines (Zoom and Teams text exports).
+    """
+
+    _header: re.Pattern
+    # Whether a header must follow a blank line, for formats whose header could pass for a line of text
+    blank_line_before_header = False
+
+    def _iter_headers(self, lines: Iterable[str]) -> Iterator[tuple[Optional[re.Match], str]]:
+        """Pairs each line with its header match, if it is a header."""
+        previous_blank = True
+        for line in lines:
+            header = self._header.match(line) if previous_blank or not self.blank_line_before_header else None
+            previous_blank = not line.strip()
+            yield header, line
+
+    def detect(self, head: str) -> bool:
+        # Two headers make a coincidental match with a line of prose unlikely
+        return sum(1 for header, _ in self._iter_headers(head.splitlines()) if header) >= 2
+
+    def iter_utterances(self, lines: Iterable[str]) -> Iterator[Utterance]:
+        speaker = start = None
+        parts: list[str] = []
+        for header, line in self._iter_headers(lines):
+            if header:
+                if speaker is not None and parts:
+                    yield speaker, " ".join(parts), start, None
+                speaker, start, parts = header.group("speaker").strip(), parse_timestamp(header.group("time")), []
+                continue
+            line = line.strip()
+            if line and speaker is not None:
+                parts.append(line)
+        if speaker is not None and parts:
+            yield speaker, " ".join(parts), start, None
+
+
+class ZoomTextParser(HeaderLineParser):
+    """Zoom's saved live transcript: `[Jane Doe] 14:02:31` then the text."""
+
+    name = "zoom"
+    _header = re.compile(r"\[(?P<speaker>[^\]\r\n]+)\] (?P<time>\d{1,2}:\d{2}:\d{2})\s*$")
+
+
+class TeamsTextParser(HeaderLineParser):
+    """
+    Teams' transcript document saved as text: `Jane Doe   0:03` (or `1:02:03`) then the text,
+    turns separated by blank lines. A header must follow a blank line, so text ending in a time is not one.
+    """
+
+    name = "teams"
+    blank_line_before_header = True
+    _header = re.compile(r"(?P<speaker>[^\s\[\]<>:][^\r\n:]{0,80}?)[ \t]+(?P<time>\d{1,2}:\d{2}(?::\d{2})?)\s*$")
+
+
+class TranscriptParserRegistry:
+    """
+    Registry of the line-based transcript parsers, in detection order.
+    The `[H:MM AM] Speaker:` format is ChunkingService's own ("bracketed") and is used when no parser matches.
+    """
+
+    DEFAULT_FORMAT = "bracketed"
+    # Enough of the beginning of a transcript for every detector
+    HEAD_SIZE = 4096
+
+    _parsers: dict[str, TranscriptParser] = {
+        parser.name: parser for parser in (WebVTTParser(), SRTParser(), ZoomTextParser(), TeamsTextParser())
+    }
+
+    @classmethod
+    def register(cls, parser: TranscriptParser) -> None:
+        """Adds (or replaces) a parser, detected after the existing ones."""
+        cls._parsers[parser.name] = parser
+
+    @classmethod
+    def get_parser(cls, transcript_format: str) -> TranscriptParser:
+        key = transcript_format.strip().lower()
+        if key not in cls._parsers:
+            raise ValueError(f"Unknown transcript format: {transcript_format}. Available: {cls.get_available_formats()}")
+        return cls._parsers[key]
+
+    @classmethod
+    def get_available_formats(cls) -> list:
+        return [cls.DEFAULT_FORMAT, *cls._parsers]
+
+    @classmethod
+    def detect_format(cls, head: str, bracketed_pattern: Optional[re.Pattern] = None) -> str:
+        """
+        Returns the format of a transcript from its first HEAD_SIZE characters.
+        Formats with a file signature are checked first, then the bracketed pattern (when given),
+        so the prose header of a bracketed transcript is never misread as Teams text.
+        """
+        for name, parser in cls._parsers.items():
+            if parser.has_signature and parser.detect(head):
+                return name
+        if bracketed_pattern is not None and bracketed_pattern.search(head):
+            return cls.DEFAULT_FORMAT
+        for name, parser in cls._parsers.items():
+            if not parser.has_signature and parser.detect(head):
+                return name
+        return cls.DEFAULT_FORMAT
@@ -0,0 +1,158 @@
+import math
+from array import array
+from collections.abc import Sequence
+from typing import Any, Iterable, Iterator, Optional, Union
+
+
+class ChunkStore(Sequence):
+    """
+    Compact storage for the chunks of one transcript.
+
+    Speaker names are interned (each distinct name is stored once and referenced by a small integer id)
+    and only the normalized utterance text is kept per chunk. A chunk's id and order are its position,
+    so the `{"id", "order", "content"}` dict the services work with is built on access and never stored.
+    Start and end times (seconds, NaN when the transcript format has none) are kept alongside.
+    Segments refer to chunks through ChunkSlice views, so every stage shares this one copy.
+    """
+
+    def __init__(self):
+        self.speakers: list[str] = []
+        self._speaker_ids: dict[str, int] = {}
+        self._chunk_speakers = array('I')
+        self._texts: list[str] = []
+        self._starts = array('d')
+        self._ends = array('d')
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[dict[str, Any]]) -> "ChunkStore":
+        """Builds a store from chunk dicts in transcript order (ids must be 0, 1, 2...)."""
+        store = cls()
+        for chunk in chunks:
+            if chunk["id"] != len(store):
+                raise ValueError(f"Chunk ids must be consecutive from 0, got {chunk['id']} at position {len(store)}.")
+            speaker, _, text = chunk["content"].partition(": ")
+            store.append(speaker, text)
+        return store
+
+    def append(self, speaker: str, text: str, start: Optional[float] = None, end: Optional[float] = None) -> int:
+        """Adds a chunk and returns its id."""
+        speaker_id = self._speaker_ids.get(speaker)
+        if speaker_id is None:
+            speaker_id = self._speaker_ids[speaker] = len(self.speakers)
+            self.speakers.append(speaker)
+        self._chunk_speakers.append(speaker_id)
+        self._texts.append(text)
+        self._starts.append(math.nan if start is None else start)
+        self._ends.append(math.nan if end is None else end)
+        return len(self._texts) - 1
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[dict[str, Any], "ChunkSlice"]:
+        if isinstance(index, slice):
+            return ChunkSlice(self, range(len(self))[index])
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("chunk index out of range")
+        return {"id": index, "order": index, "content": self.content(index)}
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for index in range(len(self)):
+            yield {"id": index, "order": index, "content": self.content(index)}
+
+    def has_id(self, chunk_id: Any) -> bool:
+        return isinstance(chunk_id, int) and not isinstance(chunk_id, bool) and 0 <= chunk_id < len(self)
+
+    def speaker(self, chunk_id: int) -> str:
+        return self.speakers[self._chunk_speakers[chunk_id]]
+
+    def text(self, chunk_id: int) -> str:
+        return self._texts[chunk_id]
+
+    def start(self, chunk_id: int) -> Optional[float]:
+        """Start time of the chunk in seconds, None when unknown."""
+        value = self._starts[chunk_id]
+        return None if math.isnan(value) else value
+
+    def end(self, chunk_id: int) -> Optional[float]:
+        """End time of the chunk in seconds, None when unknown."""
+        value = self._ends[chunk_id]
+        return None if math.isnan(value) else value
+
+    def content(self, chunk_id: int) -> str:
+        """The chunk's `Speaker: text` content, as in the chunk dicts."""
+        return f"{self.speakers[self._chunk_speakers[chunk_id]]}: {self._texts[chunk_id]}"
+
+    def view(self, chunk_ids: Iterable[int]) -> "ChunkSlice":
+        """A view of the given chunks, in the given order."""
+        return ChunkSlice(self, array('I', chunk_ids))
+
+
+class ChunkSlice(Sequence):
+    """
+    Read-only view of some chunks of a ChunkStore, referenced by id.
+    It behaves like the list of chunk dicts it stands for, which are built on access;
+    use to_list() (or to_builtin on a whole segment) where a real list is needed, e.g. JSON.
+    """
+
+    __slots__ = ("store", "chunk_ids", "_id_set")
+
+    def __init__(self, store: ChunkStore, chunk_ids: Union[array, range]):
+        self.store = store
+        self.chunk_ids = chunk_ids
+        # Set of the ids of an array-backed view, built on the first has_id (a range checks its bounds)
+        self._id_set = None
+
+    def __len__(self) -> int:
+        return len(self.chunk_ids)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[dict[str, Any], "ChunkSlice"]:
+        if isinstance(index, slice):
+            return ChunkSlice(self.store, self.chunk_ids[index])
+        return self.store[self.chunk_ids[index]]
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        store = self.store
+        for chunk_id in self.chunk_ids:
+            yield {"id": chunk_id, "order": chunk_id, "content": store.content(chunk_id)}
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (ChunkSlice, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ChunkSlice({list(self.chunk_ids)!r})"
+
+    def has_id(self, chunk_id: Any) -> bool:
+        if not self.store.has_id(chunk_id):
+            return False
+        if isinstance(self.chunk_ids, range):
+            return chunk_id in self.chunk_ids
+        if self._id_set is None:
+            self._id_set = set(self.chunk_ids)
+        return chunk_id in self._id_set
+
+    def view(self, chunk_ids: Iterable[int]) -> "ChunkSlice":
+        """A view of the given chunks of the underlying store."""
+        return self.store.view(chunk_ids)
+
+    def to_list(self) -> list[dict[str, Any]]:
+        return list(self)
+
+
+def to_builtin(value: Any) -> Any:
+    """
+    Replaces chunk views by lists of chunk dicts, recursively through dicts and lists, so results
+    have the plain dict format at API and serialization boundaries. Plain data is returned as is.
+    Also usable as the `default` hook of json.dumps.
+    """
+    if isinstance(value, (ChunkSlice, ChunkStore)):
+        return list(value)
+    if isinstance(value, dict):
+        return {key: to_builtin(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [to_builtin(item) for item in value]
+    return value
@@ -0,0 +1,120 @@
+import json
+import os, sys
+from typing import Any
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.utils.token_utils import estimate_tokens
+from src.utils.chunk_store import to_builtin
+
+
+# "json" is the original indented JSON, "compact" writes one `id|speaker|text` line per utterance
+PROMPT_ENCODINGS = ("json", "compact")
+
+
+def validate_encoding(encoding: str) -> None:
+    if encoding not in PROMPT_ENCODINGS:
+        raise ValueError(f"Unknown prompt encoding: {encoding}. Available: {list(PROMPT_ENCODINGS)}")
+
+
+def encode_chunk_compact(chunk: dict[str, Any]) -> str:
+    """
+    Encodes a chunk as `id|speaker|text`. Everything after the second `|` is the text.
+    """
+    speaker, separator, text = chunk["content"].partition(": ")
+    if not separator:
+        speaker, text = "", chunk["content"]
+    return f"{chunk['id']}|{speaker}|{text}"
+
+
+def encode_chunks_compact(chunks: list[dict[str, Any]]) -> str:
+    """
+    Encodes chunks as one `id|speaker|text` line each, in transcript order.
+    """
+    return "\n".join(encode_chunk_compact(chunk) for chunk in chunks)
+
+
+def encode_segment_compact(segment: dict[str, Any]) -> str:
+    """
+    Encodes a segment as a short self-describing header followed by its utterance lines.
+    Analysis results attached by earlier stages (e.g. action_analysis) are left out, prompts never need them.
+    """
+    return (
+        f"segment_id: {segment.get('segment_id')}\n"
+        f"topic_summary: {segment.get('topic_summary', '')}\n"
+        f"chunks (id|speaker|text):\n"
+        f"{encode_chunks_compact(segment.get('chunks', []))}"
+    )
+
+
+def encode_segments_compact(segments: list[dict[str, Any]]) -> str:
+    """
+    Encodes several segments, separated by blank lines.
+    """
+    return "\n\n".join(encode_segment_compact(segment) for segment in segments)
+
+
+def encode_chunks(chunks: list[dict[str, Any]], encoding: str) -> str:
+    """Serializes chunks for a prompt in the given encoding. Chunk views (ChunkSlice) are serialized as chunk lists."""
+    return encode_chunks_compact(chunks) if encoding == "compact" else json.dumps(chunks, indent=2, default=to_builtin)
+
+
+def encode_segment(segment: dict[str, Any], encoding: str) -> str:
+    """Serializes a segment for a prompt in the given encoding."""
+    return encode_segment_compact(segment) if encoding == "compact" else json.dumps(segment, indent=2, default=to_builtin)
+
+
+def encode_segments(segments: list[dict[str, Any]], encoding: str) -> str:
+    """Serializes a list of segments for a prompt in the given encoding."""
+    return encode_segments_compact(segments) if encoding == "compact" else json.dumps(segments, indent=2, default=to_builtin)
+
+
+def encode_data(data: dict[str, Any], encoding: str) -> str:
+    """Serializes structured data (e.g. earlier extraction results) for a prompt in the given encoding."""
+    return json.dumps(data, separators=(",", ":")) if encoding == "compact" else json.dumps(data, indent=2)
+
+
+def encoding_token_report(chunks: list[dict[str, Any]], segments: list[dict[str, Any]]) -> dict[str, dict[str, int]]:
+    """
+    Compares the estimated input tokens of both encodings for what each stage serializes:
+    all chunks (clustering) and every segment (filtering and each extraction prompt).
+
+    Returns:
+        Per stage, the json and compact token estimates and the percentage saved
+    """
+    report = {
+        "clustering_input": {
+            "json": estimate_tokens(encode_chunks(chunks, "json")),
+            "compact": estimate_tokens(encode_chunks(chunks, "compact"))
+        },
+        "segment_inputs": {
+            "json": sum(estimate_tokens(encode_segment(segment, "json")) for segment in segments),
+            "compact": sum(estimate_tokens(encode_segment(segment, "compact")) for segment in segments)
+        }
+    }
+    for counts in report.values():
+        counts["saved_percentage"] = round(100 * (1 - counts["compact"] / counts["json"])) if counts["json"] else 0
+    return report
+
+
+if __name__ == "__main__":
+    from pprint import pprint
+    from src.services.chunking_service import ChunkingService
+    from config import get_config
+
+    config = get_config()
+    with open(config.DEFAULT_TRANSCRIPT_FILE, 'r') as f:
+        transcript = f.read()
+
+    chunks = ChunkingService().transcript_to_chunks(
+        transcript,
+        start_marker=config.CHUNK_START_MARKER,
+        end_marker=config.CHUNK_END_MARKER
+    )
+    # Without an LLM at hand, approximate the clustering output with segments of 5 consecutive chunks
+    segments = [
+        {"segment_id": index // 5 + 1, "topic_summary": f"Chunks {index} to {index + 4}", "chunks": chunks[index:index + 5]}
+        for index in range(0, len(chunks), 5)
+    ]
+
+    print(f"Estimated input tokens for {len(chunks)} chunks in {len(segments)} segments:")
+    pprint(encoding_token_report(chunks, segments))
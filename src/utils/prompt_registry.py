@@ -0,0 +1,162 @@
+import hashlib
+import os, sys
+import threading
+from pathlib import Path
+from string import Formatter
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+import paths
+
+
+# Placeholders each template must expose, by registry name
+PROMPT_PLACEHOLDERS = {
+    "clustering": {"input_data"},
+    "clustering_compact": {"input_data"},
+    "filtering": {"input_data"},
+    "filtering_compact": {"input_data"},
+    "filtering_batch": {"input_data"},
+    "filtering_batch_compact": {"input_data"},
+    "extraction_assignees": {"segment_data"},
+    "extraction_deadlines": {"segment_data", "extracted_data"},
+    "extraction_priority": {"segment_data", "extracted_data"},
+    "extraction_category": {"segment_data", "extracted_data"},
+    "extraction_fused": {"segment_data"},
+}
+
+
+class PromptTemplate:
+    """A prompt template loaded in memory, with its content hash and source file mtime."""
+
+    def __init__(self, name: str, filepath: Path, text: str, mtime: float):
+        self.name = name
+        self.filepath = filepath
+        self.text = text
+        self.mtime = mtime
+        self.sha256 = hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    @property
+    def version(self) -> str:
+        """Short content hash identifying this revision of the template."""
+        return self.sha256[:12]
+
+
+class PromptRegistry:
+    """
+    Loads every prompt template once and serves it from memory.
+
+    Templates are validated at load time: they must be non-empty and expose exactly the
+    expected placeholders. With auto_reload enabled, a template is re-read when its file mtime changes.
+    """
+
+    def __init__(self, templates: dict[str, Path] = None, placeholders: dict[str, set] = None, auto_reload: bool = False):
+        self._template_paths = dict(templates if templates is not None else paths.PROMPT_TEMPLATES)
+        self._placeholders = placeholders if placeholders is not None else PROMPT_PLACEHOLDERS
+        self.auto_reload = auto_reload
+        self._templates: dict[str, PromptTemplate] = {}
+        self._lock = threading.Lock()
+
+        for name in self._template_paths:
+            self._templates[name] = self._load(name)
+
+    def _load(self, name: str) -> PromptTemplate:
+        """Reads and validates a template from disk."""
+        filepath = Path(self._template_paths[name])
+        try:
+            with open(filepath, 'r') as file:
+                text = file.read()
+            mtime = os.path.getmtime(filepath)
+        except Exception as e:
+            raise ValueError(f"Problem occurred while loading prompt '{name}' from {filepath}.") from e
+
+        if not text.strip():
+            raise ValueError(f"Prompt '{name}' cannot be empty.")
+        self._validate_placeholders(name, text)
+        return PromptTemplate(name, filepath, text, mtime)
+
+    def _validate_placeholders(self, name: str, text: str) -> None:
+        """Checks that the template formats with exactly the expected named placeholders."""
+        try:
+            fields = {field for _, field, _, _ in Formatter().parse(text) if field is not None}
+        except ValueError as e:
+            raise ValueError(f"Prompt '{name}' is not a valid format string: {e}") from e
+
+        if any(not field.isidentifier() for field in fields):
+            raise ValueError(f"Prompt '{name}' has invalid placeholders: {sorted(fields)}. Escape literal braces as '{{{{' and '}}}}'.")
+
+        expected = self._placeholders.get(name)
+        if expected is not None and fields != set(expected):
+            raise ValueError(f"Prompt '{name}' placeholders {sorted(fields)} do not match expected {sorted(expected)}.")
+
+    def _get_template(self, name: str) -> PromptTemplate:
+        if name not in self._templates:
+            raise KeyError(f"Unknown prompt: {name}. Available: {self.names()}")
+        if self.auto_reload:
+            self.reload_if_changed(name)
+        return self._templates[name]
+
+    def names(self) -> list[str]:
+        """Get the names of all registered templates."""
+        return list(self._templates.keys())
+
+    def get(self, name: str) -> str:
+        """Get the raw text of a template."""
+        return self._get_template(name).text
+
+    def format(self, name: str, **kwargs) -> str:
+        """Render a template with the given placeholder values."""
+        return self._get_template(name).text.format(**kwargs)
+
+    def get_hash(self, name: str) -> str:
+        """Get the SHA-256 of a template's content."""
+        return self._get_template(name).sha256
+
+    def get_version(self, name: str) -> str:
+        """Get the short content hash of a template."""
+        return self._get_template(name).version
+
+    def get_versions(self) -> dict[str, str]:
+        """Get the short content hash of every template."""
+        return {name: template.version for name, template in self._templates.items()}
+
+    def reload_if_changed(self, name: str = None) -> list[str]:
+        """
+        Re-reads templates whose file mtime changed since they were loaded.
+
+        Args:
+            name: Template to check, or None to check them all
+
+        Returns:
+            Names of the templates that were reloaded
+        """
+        names = [name] if name is not None else self.names()
+        reloaded = []
+        for template_name in names:
+            template = self._templates[template_name]
+            try:
+                mtime = os.path.getmtime(template.filepath)
+            except OSError:
+                continue
+            if mtime == template.mtime:
+                continue
+
+            with self._lock:
+                # Another thread may have reloaded it while we waited for the lock
+                if self._templates[template_name].mtime != mtime:
+                    self._templates[template_name] = self._load(template_name)
+                    reloaded.append(template_name)
+        return reloaded
+
+
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+
+def get_prompt_registry() -> PromptRegistry:
+    """Get the process-wide prompt registry, loading every template on first use."""
+    global _default_registry
+    if _default_registry is None:
+        with _default_registry_lock:
+            if _default_registry is None:
+                from config import get_config
+                _default_registry = PromptRegistry(auto_reload=get_config().PROMPT_AUTO_RELOAD)
+    return _default_registry
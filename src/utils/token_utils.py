@@ -0,0 +1,14 @@
+import math
+
+# Rough average for English text with the Gemini/OpenAI tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates the number of tokens in a text without calling a provider tokenizer.
+    Good enough to size prompts against a budget; not an exact count.
+    """
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
@@ -0,0 +1,245 @@
+import json
+import os, sys
+import secrets
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+import paths
+
+
+class Span:
+    """A timed operation within a trace, with its parent, attributes and outcome."""
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str] = None, attributes: dict[str, Any] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = dict(attributes or {})
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns: Optional[int] = None
+        self.status = "ok"
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException) -> None:
+        self.status = "error"
+        self.error = f"{type(error).__name__}: {error}"
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_time_ns is None:
+            return None
+        return (self.end_time_ns - self.start_time_ns) / 1e6
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_time_ns": self.start_time_ns,
+            "end_time_ns": self.end_time_ns,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes
+        }
+
+
+class JsonlSpanExporter:
+    """Appends every finished span as one JSON line to a file."""
+
+    def __init__(self, path: Path = None):
+        self.path = Path(path or paths.TRACES_FILE)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            with open(self.path, 'a') as file:
+                file.write(line + "\n")
+
+
+class OtlpHttpSpanExporter:
+    """
+    Sends spans to an OpenTelemetry collector with OTLP/HTTP JSON (e.g. http://localhost:4318/v1/traces).
+
+    Spans are buffered and posted from a background thread when a root span ends or the buffer
+    fills up, so exporting never blocks the pipeline. Export failures are logged and dropped.
+    """
+
+    def __init__(self, endpoint: str, service_name: str = "transcript-pipeline", max_buffer: int = 512, timeout: float = 5.0):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.max_buffer = max_buffer
+        self.timeout = timeout
+        self._buffer: list[Span] = []
+        self._lock = threading.Lock()
+
+    def _attribute(self, key: str, value: Any) -> dict[str, Any]:
+        if isinstance(value, bool):
+            return {"key": key, "value": {"boolValue": value}}
+        if isinstance(value, int):
+            return {"key": key, "value": {"intValue": str(value)}}
+        if isinstance(value, float):
+            return {"key": key, "value": {"doubleValue": value}}
+        return {"key": key, "value": {"stringValue": str(value)}}
+
+    def _to_otlp(self, span: Span) -> dict[str, Any]:
+        otlp_span = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,  # internal
+            "startTimeUnixNano": str(span.start_time_ns),
+            "endTimeUnixNano": str(span.end_time_ns),
+            "attributes": [self._attribute(key, value) for key, value in span.attributes.items()],
+            "status": {"code": 2, "message": span.error} if span.status == "error" else {"code": 1}
+        }
+        if span.parent_id:
+            otlp_span["parentSpanId"] = span.parent_id
+        return otlp_span
+
+    def _post(self, spans: list[Span]) -> None:
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [self._attribute("service.name", self.service_name)]},
+                "scopeSpans": [{"scope": {"name": "src.utils.tracing"}, "spans": [self._to_otlp(span) for span in spans]}]
+            }]
+        }
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout):
+                pass
+        except Exception as e:
+            print(f"[Tracing] Failed to export {len(spans)} spans to {self.endpoint}: {e}")
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self._buffer.append(span)
+            if span.parent_id is not None and len(self._buffer) < self.max_buffer:
+                return
+            spans, self._buffer = self._buffer, []
+        threading.Thread(target=self._post, args=(spans,), daemon=True).start()
+
+
+class Tracer:
+    """Creates spans nested through a context variable and hands finished spans to the exporter."""
+
+    def __init__(self, exporter=None):
+        self.exporter = exporter
+        self._current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+    def current_span(self) -> Optional[Span]:
+        return self._current_span.get()
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Span]:
+        """
+        Opens a span as a child of the current one (or as the root of a new trace), and makes it current
+        for the with-block, including asyncio tasks started in it. An exception marks the span as failed.
+        """
+        parent = self._current_span.get()
+        trace_id = parent.trace_id if parent is not None else secrets.token_hex(16)
+        span = Span(name, trace_id, parent.span_id if parent is not None else None, attributes)
+        token = self._current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            span.end_time_ns = time.time_ns()
+            try:
+                self._current_span.reset(token)
+            except ValueError:
+                # An async generator closed from another context: the span still ends and is exported
+                pass
+            if self.exporter is not None:
+                try:
+                    self.exporter.export(span)
+                except Exception as e:
+                    print(f"[Tracing] Failed to export span {span.name}: {e}")
+
+    def exported_trace_id(self, span: Span) -> Optional[str]:
+        """The span's trace id when spans are exported, None otherwise (the id would point to nothing)."""
+        return span.trace_id if self.exporter is not None else None
+
+    def propagate(self, fn: Callable) -> Callable:
+        """
+        Binds fn to the current span, for functions run on ThreadPoolExecutor threads
+        (which, unlike asyncio tasks and asyncio.to_thread, do not inherit context variables).
+        """
+        parent = self._current_span.get()
+
+        @wraps(fn)
+        def run_with_parent(*args, **kwargs):
+            token = self._current_span.set(parent)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._current_span.reset(token)
+
+        return run_with_parent
+
+
+_default_tracer = None
+_default_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer, configured from Config on first use (spans are only exported when tracing is enabled)."""
+    global _default_tracer
+    if _default_tracer is None:
+        with _default_tracer_lock:
+            if _default_tracer is None:
+                from config import get_config
+                config = get_config()
+                exporter = None
+                if config.TRACING_ENABLED:
+                    if config.TRACING_EXPORTER == "otlp":
+                        exporter = OtlpHttpSpanExporter(config.TRACING_OTLP_ENDPOINT, config.TRACING_SERVICE_NAME)
+                    elif config.TRACING_EXPORTER == "jsonl":
+                        exporter = JsonlSpanExporter(config.TRACING_JSONL_PATH)
+                    else:
+                        raise ValueError(f"Unknown tracing exporter: {config.TRACING_EXPORTER}. Available: ['jsonl', 'otlp']")
+                _default_tracer = Tracer(exporter)
+    return _default_tracer
+
+
+def set_tracer(tracer: Tracer) -> None:
+    """Replaces the process-wide tracer, e.g. to collect spans in memory for a benchmark."""
+    global _default_tracer
+    with _default_tracer_lock:
+        _default_tracer = tracer
+
+
+def span(name: str, **attributes):
+    """Opens a span on the process-wide tracer, see Tracer.span."""
+    return get_tracer().span(name, **attributes)
+
+
+def exported_trace_id(span: Span) -> Optional[str]:
+    """The span's trace id on the process-wide tracer, see Tracer.exported_trace_id."""
+    return get_tracer().exported_trace_id(span)
+
+
+def propagate(fn: Callable) -> Callable:
+    """Binds fn to the current span of the process-wide tracer, see Tracer.propagate."""
+    return get_tracer().propagate(fn)